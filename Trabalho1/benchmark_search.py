@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de desempenho das buscas em labirintos sintéticos.
+
+Uso:
+    python benchmark_search.py          # roda todos os benchmarks
+    python benchmark_search.py bfs      # roda apenas os benchmarks escolhidos
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from src.binary_maze import load_binary_maze, write_binary_mazes
+from src.dstar_lite import DStarLite
+from src.hpa import AbstractGraph, hpa_star_search, load_or_build_abstract_graph
+from src.landmarks import LandmarkSet, a_star_search_alt, load_or_build_landmarks
+from src.maze import FlatGrid, Grid
+from src.search import a_star_search, bfs, bfs_level_synchronous, jump_point_search
+from src.search import bidirectional_a_star, bidirectional_bfs, ida_star_search, sma_star_search
+from src.search import METRICS_COUNTERS, METRICS_FULL, METRICS_MODES, METRICS_OFF
+
+
+def open_grid(size: int) -> Grid:
+    """Grade quadrada sem paredes, com S no canto superior esquerdo e G no oposto."""
+    grid = [['.'] * size for _ in range(size)]
+    grid[0][0] = 'S'
+    grid[size - 1][size - 1] = 'G'
+    return grid
+
+
+def corridor_maze(size: int, seed: int = 0, extra_openings: float = 0.05) -> Grid:
+    """
+    Labirinto de corredores de (2 * size + 1) células de lado, gerado por DFS
+    aleatória (labirinto perfeito) com uma fração de paredes extras abertas
+    para criar ciclos. S e G ficam em cantos opostos.
+    """
+    rng = random.Random(seed)
+    side = 2 * size + 1
+    grid = [['#'] * side for _ in range(side)]
+    grid[1][1] = '.'
+    visited = {(0, 0)}
+    stack = [(0, 0)]
+
+    while stack:
+        r, c = stack[-1]
+        options = [(r + dr, c + dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if 0 <= r + dr < size and 0 <= c + dc < size and (r + dr, c + dc) not in visited]
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = rng.choice(options)
+        visited.add((nr, nc))
+        grid[2 * nr + 1][2 * nc + 1] = '.'
+        grid[r + nr + 1][c + nc + 1] = '.'  # Derruba a parede entre as duas células
+        stack.append((nr, nc))
+
+    for _ in range(int(extra_openings * size * size)):
+        r, c = rng.randrange(1, side - 1), rng.randrange(1, side - 1)
+        if (r + c) % 2 == 1:
+            grid[r][c] = '.'
+
+    grid[1][1] = 'S'
+    grid[side - 2][side - 2] = 'G'
+    return grid
+
+
+def timed(fn: Callable, *args):
+    start_time = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start_time
+
+
+def benchmark_bfs():
+    """
+    Escalonamento da BFS em grades abertas: com a fila O(1) o tempo por
+    célula expandida deve ficar aproximadamente constante ao dobrar o lado.
+    """
+    print("=" * 80)
+    print("BFS em grades abertas (o objetivo é a última célula a ser alcançada)")
+    print("=" * 80)
+    print(f"{'Lado':<8} {'Células':<12} {'Algoritmo':<24} {'Tempo (s)':<12} {'ns/nó expandido':<16}")
+    print("-" * 80)
+
+    for size in (100, 200, 400, 800, 1600):
+        grid = FlatGrid.from_grid(open_grid(size))
+        for name, search_function in (("BFS (deque)", bfs), ("BFS síncrona por nível", bfs_level_synchronous)):
+            (_, metrics), elapsed = timed(search_function, grid)
+            per_node = elapsed / metrics['nodes_expanded'] * 1e9
+            print(f"{size:<8} {size * size:<12} {name:<24} {elapsed:<12.4f} {per_node:<16.1f}")
+    print()
+
+
+def benchmark_load():
+    """Carregamento de um mapa: texto (leitura + FlatGrid.from_grid) vs. binário (mmap)."""
+    from run_search import iter_mazes_from_file
+
+    print("=" * 72)
+    print("CARREGAMENTO: TEXTO vs. BINÁRIO (.lab)")
+    print("=" * 72)
+    print(f"{'Lado':<8} {'Células':<12} {'Texto (s)':<14} {'Binário (s)':<14} {'Aceleração':<10}")
+    print("-" * 72)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (250, 500, 1000, 2000):
+            text_file = os.path.join(tmp, f"mapa_{size}.txt")
+            binary_file = os.path.join(tmp, f"mapa_{size}.lab")
+            with open(text_file, 'w', encoding='utf-8') as f:
+                f.write("\n".join("".join(row) for row in open_grid(size)) + "\n")
+            write_binary_mazes(binary_file, [open_grid(size)])
+
+            _, text_time = timed(lambda: FlatGrid.from_grid(next(iter_mazes_from_file(text_file))))
+            _, binary_time = timed(load_binary_maze, binary_file)
+            print(f"{size:<8} {size * size:<12} {text_time:<14.4f} {binary_time:<14.6f} {text_time / binary_time:.0f}x")
+    print()
+
+
+def benchmark_alt():
+    """Nós expandidos e tempo: BFS vs. A* Manhattan vs. A* ALT em labirintos de corredores."""
+    print("=" * 96)
+    print("A* COM LANDMARKS (ALT) EM LABIRINTOS DE CORREDORES")
+    print("=" * 96)
+    print(f"{'Lado':<8} {'Algoritmo':<22} {'Nós Expandidos':<16} {'Busca (s)':<12} {'Pré-processamento (s)':<24}")
+    print("-" * 96)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (50, 150, 300):
+            grid = FlatGrid.from_grid(corridor_maze(size))
+            side = grid.W
+            landmark_file = os.path.join(tmp, f"corredores_{size}.lmk")
+
+            landmarks, build_time = timed(load_or_build_landmarks, grid, landmark_file)
+            _, load_time = timed(LandmarkSet.load, landmark_file, grid)
+
+            for name, search, setup in (
+                ("BFS", lambda: bfs(grid), "-"),
+                ("A* Manhattan", lambda: a_star_search(grid), "-"),
+                ("A* ALT (8 landmarks)", lambda: a_star_search_alt(grid, landmarks),
+                 f"{build_time:.3f} (do disco: {load_time:.4f})"),
+            ):
+                (_, metrics), elapsed = timed(search)
+                print(f"{side:<8} {name:<22} {metrics['nodes_expanded']:<16} {elapsed:<12.4f} {setup:<24}")
+            print("-" * 96)
+    print()
+
+
+def benchmark_jps():
+    """A* Manhattan vs. Jump Point Search em grades abertas e labirintos de corredores."""
+    print("=" * 92)
+    print("JUMP POINT SEARCH vs. A* (MANHATTAN)")
+    print("=" * 92)
+    print(f"{'Mapa':<22} {'Algoritmo':<14} {'Custo':<8} {'Nós Expandidos':<16} {'Memória Máx.':<14} {'Tempo (s)':<10}")
+    print("-" * 92)
+
+    maps = [(f"aberto {size}x{size}", open_grid(size)) for size in (200, 800)]
+    maps += [(f"corredores {2 * size + 1}x{2 * size + 1}", corridor_maze(size)) for size in (100, 300)]
+
+    for label, text_grid in maps:
+        grid = FlatGrid.from_grid(text_grid)
+        for name, search_function in (("A*", a_star_search), ("JPS", jump_point_search)):
+            (path, metrics), elapsed = timed(search_function, grid)
+            cost = len(path) - 1 if path else "N/A"
+            print(f"{label:<22} {name:<14} {cost:<8} {metrics['nodes_expanded']:<16} {metrics['max_memory_usage']:<14} {elapsed:<10.4f}")
+    print()
+
+
+def benchmark_bidirectional():
+    """Buscas unidirecionais vs. bidirecionais: nós expandidos e pico de memória."""
+    print("=" * 96)
+    print("BUSCA BIDIRECIONAL")
+    print("=" * 96)
+    print(f"{'Mapa':<22} {'Algoritmo':<20} {'Custo':<8} {'Nós Expandidos':<16} {'Memória Máx.':<14} {'Tempo (s)':<10}")
+    print("-" * 96)
+
+    maps = [(f"aberto {size}x{size}", open_grid(size)) for size in (200, 800)]
+    maps += [(f"corredores {2 * size + 1}x{2 * size + 1}", corridor_maze(size)) for size in (100, 300)]
+
+    for label, text_grid in maps:
+        grid = FlatGrid.from_grid(text_grid)
+        for name, search_function in (("BFS", bfs), ("BFS bidirecional", bidirectional_bfs),
+                                      ("A*", a_star_search), ("A* bidirecional", bidirectional_a_star)):
+            (path, metrics), elapsed = timed(search_function, grid)
+            cost = len(path) - 1 if path else "N/A"
+            print(f"{label:<22} {name:<20} {cost:<8} {metrics['nodes_expanded']:<16} {metrics['max_memory_usage']:<14} {elapsed:<10.4f}")
+        print("-" * 96)
+    print()
+
+
+def benchmark_memory_bounded():
+    """
+    A* vs. IDA* vs. SMA*: pico de memória e tempo. O SMA* roda com metade
+    do pico de memória do A* e, nos mapas pequenos, também com o menor
+    orçamento possível (custo ótimo + 1 nós). O IDA* só aparece nos mapas
+    pequenos: sem tabela de visitados, as expansões crescem
+    exponencialmente com os ciclos do mapa.
+    """
+    print("=" * 100)
+    print("BUSCAS LIMITADAS EM MEMÓRIA (IDA* e SMA*)")
+    print("=" * 100)
+    print(f"{'Mapa':<22} {'Algoritmo':<24} {'Custo':<8} {'Nós Expandidos':<16} {'Memória Máx.':<14} {'Tempo (s)':<10}")
+    print("-" * 100)
+
+    maps = [(f"aberto {size}x{size}", open_grid(size), True) for size in (200, 800)]
+    maps += [(f"perfeito {2 * size + 1}x{2 * size + 1}", corridor_maze(size, extra_openings=0), size <= 50)
+             for size in (50, 150)]
+    maps += [(f"corredores {2 * size + 1}x{2 * size + 1}", corridor_maze(size), size <= 25) for size in (25, 150)]
+
+    for label, text_grid, small in maps:
+        grid = FlatGrid.from_grid(text_grid)
+        (path, metrics), _ = timed(a_star_search, grid)
+        shortest = len(path)
+
+        runs = [("A*", lambda: a_star_search(grid))]
+        budgets = [max(shortest, metrics['max_memory_usage'] // 2)]
+        if small:
+            runs.append(("IDA*", lambda: ida_star_search(grid)))
+            budgets.append(shortest)
+        for budget in sorted(set(budgets), reverse=True):
+            runs.append((f"SMA* ({budget} nós)", lambda budget=budget: sma_star_search(grid, budget)))
+
+        for name, search in runs:
+            (path, metrics), elapsed = timed(search)
+            cost = len(path) - 1 if path else "N/A"
+            print(f"{label:<22} {name:<24} {cost:<8} {metrics['nodes_expanded']:<16} {metrics['max_memory_usage']:<14} {elapsed:<10.4f}")
+        print("-" * 100)
+    print()
+
+
+def benchmark_hpa(queries: int = 30):
+    """
+    Latência por consulta: A* Manhattan vs. HPA* (clusters 16x16) em
+    labirintos de corredores crescentes, com pares início/objetivo
+    aleatórios. O grafo abstrato é calculado uma vez por mapa e salvo em
+    disco; a coluna de custo mostra quanto o caminho do HPA* é mais longo.
+    """
+    print("=" * 104)
+    print(f"HPA* vs. A*: LATÊNCIA MÉDIA DE {queries} CONSULTAS ALEATÓRIAS")
+    print("=" * 104)
+    print(f"{'Lado':<8} {'Nós abstratos':<15} {'Grafo (s)':<22} {'A* (ms)':<10} {'HPA* (ms)':<11} "
+          f"{'Aceleração':<12} {'Custo extra':<12}")
+    print("-" * 104)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (50, 150, 300, 500):
+            grid = FlatGrid.from_grid(corridor_maze(size))
+            graph_file = os.path.join(tmp, f"corredores_{size}.hpa")
+            graph, build_time = timed(load_or_build_abstract_graph, grid, graph_file)
+            _, load_time = timed(AbstractGraph.load, graph_file, grid)
+
+            rng = random.Random(size)
+            open_cells = [grid.pos_of(cell) for cell in range(grid.H * grid.W) if grid.cells[cell]]
+            views = [grid.with_endpoints(rng.choice(open_cells), rng.choice(open_cells)) for _ in range(queries)]
+
+            a_star_results, a_star_time = timed(lambda: [a_star_search(view)[0] for view in views])
+            hpa_results, hpa_time = timed(lambda: [hpa_star_search(view, graph)[0] for view in views])
+
+            optimal = sum(len(path) - 1 for path in a_star_results)
+            extra = sum(len(path) - 1 for path in hpa_results) / optimal - 1 if optimal else 0.0
+            print(f"{grid.W:<8} {len(graph.nodes):<15} {f'{build_time:.3f} (disco: {load_time:.4f})':<22} "
+                  f"{a_star_time / queries * 1000:<10.2f} {hpa_time / queries * 1000:<11.2f} "
+                  f"{a_star_time / hpa_time:<12.1f} {extra:<12.2%}")
+    print()
+
+
+def benchmark_replan(rounds: int = 10):
+    """
+    Mapa que muda entre as consultas: a cada rodada, k células aleatórias
+    trocam de estado (parede <-> livre) e o caminho é recalculado pelo
+    D* Lite (reparando a busca anterior) e por um A* do zero no mesmo mapa.
+    """
+    print("=" * 96)
+    print(f"REPLANEJAMENTO: D* LITE vs. A* DO ZERO ({rounds} rodadas por taxa de mudança)")
+    print("=" * 96)
+    print(f"{'Mudanças/rodada':<17} {'D* Lite (ms)':<14} {'Nós D* Lite':<13} {'A* (ms)':<10} {'Nós A*':<10} {'Aceleração':<10}")
+    print("-" * 96)
+
+    text_grid = corridor_maze(150, extra_openings=0.3)
+    for rate in (1, 4, 16, 64, 256):
+        grid = FlatGrid.from_grid(text_grid)
+        planner = DStarLite(grid)
+        _, initial_time = timed(planner.plan)
+        rng = random.Random(rate)
+        candidates = [cell for cell in range(grid.H * grid.W) if cell not in (grid.start, grid.goal)]
+
+        replan_time = a_star_time = 0.0
+        replan_nodes = a_star_nodes = 0
+        for _ in range(rounds):
+            changes = []
+            for cell in rng.sample(candidates, rate):
+                changes.append((grid.pos_of(cell), not grid.cells[cell]))
+
+            (_, metrics), elapsed = timed(lambda: (planner.update_cells(changes), planner.plan())[1])
+            replan_time += elapsed
+            replan_nodes += metrics['nodes_expanded']
+            (_, metrics), elapsed = timed(a_star_search, grid)
+            a_star_time += elapsed
+            a_star_nodes += metrics['nodes_expanded']
+
+        print(f"{rate:<17} {replan_time / rounds * 1000:<14.2f} {replan_nodes // rounds:<13} "
+              f"{a_star_time / rounds * 1000:<10.2f} {a_star_nodes // rounds:<10} {a_star_time / replan_time:<10.1f}")
+    print(f"(corredores {grid.W}x{grid.W} com ciclos; o primeiro plano do D* Lite leva {initial_time:.3f}s)")
+    print()
+
+
+def benchmark_paths():
+    """
+    Memória do caminho devolvido pela busca: o PathHandle (vetor de ids,
+    4 bytes por célula) contra a lista de tuplas (r, c) que ele substitui,
+    e o tamanho da exportação compactada em movimentos (moves()).
+    """
+    print("=" * 88)
+    print("CAMINHOS: PATHHANDLE vs. LISTA DE TUPLAS")
+    print("=" * 88)
+    print(f"{'Lado':<8} {'Células no caminho':<20} {'Lista (KB)':<12} {'PathHandle (KB)':<17} {'Redução':<9} {'moves() (chars)':<15}")
+    print("-" * 88)
+
+    for size in (100, 250, 500):
+        grid = FlatGrid.from_grid(corridor_maze(size, extra_openings=0.0))
+        path, _ = a_star_search(grid)
+
+        tracemalloc.start()
+        as_list = list(path)
+        list_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del as_list
+        handle_bytes = sys.getsizeof(path.cells)
+
+        print(f"{grid.W:<8} {len(path):<20} {list_bytes / 1024:<12.1f} {handle_bytes / 1024:<17.1f} "
+              f"{list_bytes / handle_bytes:<9.1f} {len(path.moves()):<15}")
+    print()
+
+
+def benchmark_metrics(repeats: int = 5):
+    """
+    Custo da coleta de métricas: a mesma busca nos modos "off", "counters" e
+    "full" (src.search.METRICS_MODES); o melhor de algumas rodadas.
+    """
+    print("=" * 80)
+    print("MODOS DE MÉTRICAS: OFF vs. COUNTERS vs. FULL")
+    print("=" * 80)
+    print(f"{'Mapa':<22} {'Algoritmo':<8} {'off (s)':<12} {'counters (s)':<14} {'full (s)':<12} {'full/off':<8}")
+    print("-" * 80)
+
+    cases = (
+        ("aberto 800x800", FlatGrid.from_grid(open_grid(800))),
+        ("corredores 601x601", FlatGrid.from_grid(corridor_maze(300))),
+    )
+    for label, grid in cases:
+        for name, search_function in (("BFS", bfs), ("A*", a_star_search)):
+            search_function(grid, METRICS_OFF)  # Aloca o workspace do mapa fora da medição
+            times = {mode: float('inf') for mode in METRICS_MODES}
+            for _ in range(repeats):
+                for mode in METRICS_MODES:  # Modos alternados: variações da máquina afetam todos igualmente
+                    times[mode] = min(times[mode], timed(search_function, grid, mode)[1])
+            print(f"{label:<22} {name:<8} {times[METRICS_OFF]:<12.4f} {times[METRICS_COUNTERS]:<14.4f} "
+                  f"{times[METRICS_FULL]:<12.4f} {times[METRICS_FULL] / times[METRICS_OFF]:<8.2f}")
+    print()
+
+
+BENCHMARKS = {
+    "bfs": benchmark_bfs,
+    "load": benchmark_load,
+    "alt": benchmark_alt,
+    "jps": benchmark_jps,
+    "bidir": benchmark_bidirectional,
+    "memory": benchmark_memory_bounded,
+    "hpa": benchmark_hpa,
+    "replan": benchmark_replan,
+    "paths": benchmark_paths,
+    "metrics": benchmark_metrics,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Benchmark desconhecido: {name}. Opções: {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Converte arquivos de labirinto em texto para o formato binário (.lab),
+que é carregado por mmap sem cópia (ver src/binary_maze.py).
+
+Uso:
+    python convert_mazes.py                          # data/labirinto*.txt -> data/labirinto*.lab
+    python convert_mazes.py entrada.txt saida.lab    # converte um único arquivo
+"""
+
+import glob
+import os
+import sys
+
+from src.binary_maze import write_binary_mazes
+from src.maze import FlatGrid
+from run_search import iter_mazes_from_file
+
+
+def valid_mazes(text_file: str, skipped: list):
+    """
+    Lê os labirintos um por vez (como linhas de bytes). Um labirinto inválido
+    vira None (um marcador no .lab, para não deslocar a numeração dos
+    seguintes) e o seu número é acrescentado a skipped.
+    """
+    for i, grid in enumerate(iter_mazes_from_file(text_file, as_bytes=True), 1):
+        try:
+            yield FlatGrid.from_grid(grid)
+        except ValueError as e:
+            print(f"  Labirinto {i} de {text_file} ignorado: {e}")
+            skipped.append(i)
+            yield None
+
+
+def convert(text_file: str, binary_file: str):
+    """
+    Converte um arquivo; o .lab só é criado (ou substituído) se ao menos um
+    labirinto for convertido.
+    """
+    skipped = []
+    temporary = binary_file + ".tmp"
+    count = write_binary_mazes(temporary, valid_mazes(text_file, skipped))
+    if not count:
+        os.remove(temporary)
+        if os.path.exists(binary_file):
+            os.remove(binary_file)  # Não deixa um .lab antigo no lugar do arquivo que falhou
+        print(f"{text_file}: nenhum labirinto convertido; {binary_file} não foi criado")
+        return
+    os.replace(temporary, binary_file)
+    note = f" ({len(skipped)} ignorado(s): {', '.join(map(str, skipped))})" if skipped else ""
+    print(f"{text_file} -> {binary_file}: {count} labirinto(s){note}")
+
+
+def main():
+    if len(sys.argv) == 3:
+        convert(sys.argv[1], sys.argv[2])
+        return
+    if len(sys.argv) != 1:
+        print(__doc__)
+        return
+
+    for text_file in sorted(glob.glob('data/labirinto*.txt')):
+        convert(text_file, os.path.splitext(text_file)[0] + '.lab')
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,22 @@ Script para testar todos os algoritmos de busca em múltiplos labirintos
 """
 
 import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional
+import argparse
 import os
 import glob
+import shutil
+import tempfile
 import matplotlib.pyplot as plt
 
-from src.search import a_star_search, dfs, bfs, greedy_search, a_star_search_euclidean, greedy_search_euclidean
-from src.maze import Maze, Grid
+from src.search import a_star_search, dfs, bfs, greedy_search, a_star_search_euclidean, greedy_search_euclidean, jump_point_search
+from src.search import bidirectional_bfs, bidirectional_a_star, dijkstra_search, path_cost
+from src.maze import Maze, FlatGrid, Grid
+from src.binary_maze import iter_binary_mazes, load_binary_maze
+from src.path_cache import PathCache
 
 ALGORITHMS_TO_RUN = {
     "Depth-First Search (DFS)": dfs,
@@ -20,31 +28,59 @@ ALGORITHMS_TO_RUN = {
     "A* Search Euclidiana": a_star_search_euclidean,
     "Greedy Search Manhattan": greedy_search,
     "Greedy Search Euclidiana": greedy_search_euclidean,
+    "Jump Point Search (JPS)": jump_point_search,
+    "Bidirectional BFS": bidirectional_bfs,
+    "Bidirectional A*": bidirectional_a_star,
+    "Dijkstra (Custo Uniforme)": dijkstra_search,
 }
 
+# Métricas extras que as buscas devolvem no modo "full" (ver src.search.METRICS_MODES):
+# (chave, rótulo no relatório, cabeçalho na tabela de médias)
+DETAILED_METRICS = (
+    ("peak_frontier", "Pico da Fronteira", "Pico Fronteira"),
+    ("peak_visited", "Pico de Visitados", "Pico Visitados"),
+    ("heap_pushes", "Inserções no Heap", "Inserções Heap"),
+    ("stale_pops", "Entradas Descartadas do Heap", "Descartadas"),
+    ("reexpansions", "Reexpansões", "Reexpansões"),
+)
 
-def read_mazes_from_file(input_file: str) -> List[Grid]:
-    """Lê labirintos de um arquivo"""
-    mazes = []
-    current_maze = []
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                stripped_line = line.rstrip('\n')
-                if not stripped_line:
-                    if current_maze:
-                        mazes.append(current_maze)
-                        current_maze = []
-                else:
-                    current_maze.append(list(stripped_line))
 
-            # Adiciona o último labirinto se não terminou com linha em branco
-            if current_maze:
-                mazes.append(current_maze)
-        return mazes
+def iter_mazes_from_file(input_file: str, as_bytes: bool = False) -> Iterator[Grid]:
+    """
+    Lê labirintos de um arquivo sob demanda, um por vez.
+
+    Só o labirinto atual fica em memória, então arquivos com dezenas de
+    milhares de mapas podem ser percorridos sem carregá-los inteiros. Com
+    as_bytes=True cada linha é entregue como bytes em vez de uma lista de
+    caracteres (mais compacto e mais barato de enviar a outro processo;
+    FlatGrid.from_grid aceita os dois formatos).
+    """
+    try:
+        f = open(input_file, 'rb' if as_bytes else 'r', **({} if as_bytes else {'encoding': 'utf-8'}))
     except FileNotFoundError:
         print(f"Erro: O arquivo de entrada '{input_file}' não foi encontrado.")
-        return []
+        return
+
+    newline = b'\r\n' if as_bytes else '\n'
+    current_maze = []
+    with f:
+        for line in f:
+            stripped_line = line.rstrip(newline)
+            if not stripped_line:
+                if current_maze:
+                    yield current_maze
+                    current_maze = []
+            else:
+                current_maze.append(stripped_line if as_bytes else list(stripped_line))
+
+    # Entrega o último labirinto se não terminou com linha em branco
+    if current_maze:
+        yield current_maze
+
+
+def read_mazes_from_file(input_file: str) -> List[Grid]:
+    """Lê labirintos de um arquivo"""
+    return list(iter_mazes_from_file(input_file))
 
 
 def generate_and_save_graphs(results_for_maze: List[dict], maze_number: int, output_dir: str):
@@ -61,7 +97,7 @@ def generate_and_save_graphs(results_for_maze: List[dict], maze_number: int, out
     def create_bar_chart(data, title, ylabel, filename):
         try:
             plt.figure(figsize=(10, 6))  # Define o tamanho da imagem
-            bars = plt.bar(algorithms, data, color=['blue', 'green', 'red', 'orange', 'purple', 'brown'])
+            bars = plt.bar(algorithms, data, color=['blue', 'green', 'red', 'orange', 'purple', 'brown', 'teal', 'olive', 'gray', 'navy'])
 
             # Adiciona os valores numéricos no topo de cada barra
             plt.bar_label(bars, fmt='%.6f' if min(data) > 0 and min(data) < 0.01 else '%.2f')
@@ -87,7 +123,7 @@ def generate_and_save_graphs(results_for_maze: List[dict], maze_number: int, out
     # Gráfico de Custo do Caminho
     create_bar_chart(costs,
                      f'Mapa {maze_number}: Comparativo de Custo do Caminho',
-                     'Custo (Nº de Passos)',
+                     'Custo (soma dos custos dos passos)',
                      f'mapa_{maze_number}_02_custo.png')
 
     # Gráfico de Nós Expandidos
@@ -103,214 +139,468 @@ def generate_and_save_graphs(results_for_maze: List[dict], maze_number: int, out
                      f'mapa_{maze_number}_04_memoria.png')
 
 
+def _empty_stats() -> dict:
+    return {
+        'total_time': 0,
+        'total_nodes': 0,
+        'total_memory': 0,
+        'solutions_found': 0,
+        'total_cost': 0,
+        'mazes_tested': 0,
+        'detailed': {}  # chave -> [soma, quantidade], só das métricas presentes
+    }
+
+
+def _add_to_stats(stats: dict, result: dict):
+    stats['mazes_tested'] += 1
+    stats['total_time'] += result['time']
+    stats['total_nodes'] += result['metrics']['nodes_expanded']
+    stats['total_memory'] += result['metrics']['max_memory_usage']
+    for key, _, _ in DETAILED_METRICS:
+        if key in result['metrics']:
+            total = stats['detailed'].setdefault(key, [0, 0])
+            total[0] += result['metrics'][key]
+            total[1] += 1
+
+    if result['solution_found']:
+        stats['solutions_found'] += 1
+        stats['total_cost'] += result['cost']
+
+
+class ReportWriter:
+    """
+    Monta o relatório à medida que os labirintos terminam.
+
+    As estatísticas gerais e por heurística são somas acumuladas, e a análise
+    de cada labirinto vai direto para um arquivo temporário; ao final o
+    cabeçalho e os resumos são escritos e a análise é copiada em seguida.
+    Assim a memória não cresce com o número de labirintos.
+    """
+
+    def __init__(self, output_file: str):
+        self.output_file = output_file
+        self.output_dir = os.path.dirname(output_file)  # Pega o diretório do arquivo de saída
+        self.mazes_tested = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.algorithm_stats = {name: _empty_stats() for name in ALGORITHMS_TO_RUN}
+        self.heuristic_stats = {
+            "Manhattan": {'A*': _empty_stats(), 'Greedy': _empty_stats()},
+            "Euclidiana": {'A*': _empty_stats(), 'Greedy': _empty_stats()},
+        }
+        self.details = tempfile.TemporaryFile('w+', encoding='utf-8')
+
+    def add(self, maze_number: int, source_file: str, results_for_maze: List[dict]):
+        self.mazes_tested += 1
+
+        for result in results_for_maze:
+            alg_name = result['algorithm']
+            _add_to_stats(self.algorithm_stats[alg_name], result)
+            if 'cache_hit' in result:
+                if result['cache_hit']:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+            for heuristic_name in self.heuristic_stats:
+                if heuristic_name in alg_name:
+                    alg_type = 'A*' if 'A*' in alg_name else 'Greedy'
+                    _add_to_stats(self.heuristic_stats[heuristic_name][alg_type], result)
+                    break
+
+        file = self.details
+        file.write("=" * 20 + f" ANÁLISE DO LABIRINTO {maze_number} " + "=" * 20 + "\n\n")
+        file.write(f"Gráficos de resultados salvos em: {self.output_dir}/mapa_{maze_number}_*.png\n\n")
+        file.write(f"Arquivo de origem: {os.path.basename(source_file)}\n\n")
+
+        for result in results_for_maze:
+            file.write('-' * 50 + "\n")
+            file.write(f"Algoritmo: {result['algorithm']}\n")
+            file.write("-" * 50 + "\n")
+
+            if result['solution_found']:
+                file.write("Solução Encontrada: Sim\n")
+                file.write(f"Custo do Caminho: {result['cost']}\n")
+            else:
+                file.write("Solução Encontrada: Não\n")
+
+            file.write(f"Tempo de Execução (s): {result['time']:.6f}\n")
+            file.write(f"Nós Expandidos: {result['metrics']['nodes_expanded']}\n")
+            file.write(f"Uso Máximo de Memória: {result['metrics']['max_memory_usage']}\n")
+            for key, label, _ in DETAILED_METRICS:
+                if key in result['metrics']:
+                    file.write(f"{label}: {result['metrics'][key]}\n")
+            if 'cache_hit' in result:
+                file.write(f"Cache de Caminhos: {'acerto' if result['cache_hit'] else 'falha'}\n")
+            file.write("\n")
+
+    def _write_detailed_metrics(self, file):
+        """Médias das métricas de DETAILED_METRICS, para os algoritmos que as informaram."""
+        measured = {name: stats for name, stats in self.algorithm_stats.items() if stats['detailed']}
+        if not measured:
+            return
+        file.write("=" * 32 + " MÉTRICAS DETALHADAS " + "=" * 32 + "\n\n")
+        file.write(f"{'Algoritmo':<30}" + "".join(f" {header:>15}" for _, _, header in DETAILED_METRICS) + "\n")
+        file.write("-" * 110 + "\n")
+        for alg_name, stats in measured.items():
+            columns = []
+            for key, _, _ in DETAILED_METRICS:
+                total = stats['detailed'].get(key)
+                columns.append(f" {total[0] / total[1]:>15.1f}" if total else f" {'-':>15}")
+            file.write(f"{alg_name:<30}" + "".join(columns) + "\n")
+        file.write("\n" + "=" * 80 + "\n\n")
+
+    def close(self):
+        """Escreve o relatório final e descarta o arquivo temporário."""
+        try:
+            with open(self.output_file, 'w', encoding='utf-8') as file:
+                file.write("=" * 80 + "\n")
+                file.write("        RELATÓRIO COMPARATIVO DOS ALGORITMOS DE BUSCA\n")
+                file.write("=" * 80 + "\n\n")
+                file.write(f"Data da Execução: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+                file.write(f"Total de Labirintos Testados: {self.mazes_tested}\n")
+                lookups = self.cache_hits + self.cache_misses
+                if lookups:
+                    file.write(f"Cache de Caminhos: {self.cache_hits} acertos, {self.cache_misses} falhas "
+                               f"({self.cache_hits / lookups:.1%} de acertos)\n")
+                file.write("\n")
+
+                # Resumo geral
+                file.write("=" * 34 + " RESUMO GERAL " + "=" * 34 + "\n\n")
+                file.write(f"{'Algoritmo':<30} {'Sucessos':<10} {'Tempo Médio':<15} {'Nós Médios':<12} {'Memória Média':<15} {'Custo Médio':<12}\n")
+                file.write("-" * 100 + "\n")
+
+                for alg_name, stats in self.algorithm_stats.items():
+                    if stats['mazes_tested'] > 0:
+                        success_rate, avg_time, avg_nodes, avg_memory, avg_cost = _averages(stats)
+                        file.write(f"{alg_name:<30} {success_rate:>6.1f}% {avg_time:>12.6f}s {avg_nodes:>10.1f} {avg_memory:>13.1f} {avg_cost:>10.1f}\n")
+
+                file.write("\n" + "=" * 80 + "\n\n")
+
+                self._write_detailed_metrics(file)
+
+                # Comparação de Heurísticas
+                file.write("=" * 30 + " COMPARAÇÃO DE HEURÍSTICAS " + "=" * 30 + "\n\n")
+                file.write(f"{'Heurística':<15} {'Algoritmo':<15} {'Sucessos':<10} {'Tempo Médio':<15} {'Nós Médios':<12} {'Memória Média':<15} {'Custo Médio':<12}\n")
+                file.write("-" * 100 + "\n")
+
+                for heuristic_name, stats_by_type in self.heuristic_stats.items():
+                    for alg_type, stats in stats_by_type.items():
+                        if stats['mazes_tested'] > 0:
+                            success_rate, avg_time, avg_nodes, avg_memory, avg_cost = _averages(stats)
+                            file.write(f"{heuristic_name:<15} {alg_type:<15} {success_rate:>6.1f}% {avg_time:>12.6f}s {avg_nodes:>10.1f} {avg_memory:>13.1f} {avg_cost:>10.1f}\n")
+
+                file.write("\n" + "=" * 80 + "\n\n")
+
+                # Detalhes por labirinto
+                self.details.seek(0)
+                shutil.copyfileobj(self.details, file)
+
+            print(f"Resultados salvos com sucesso em '{self.output_file}'")
+        except Exception as e:
+            print(f"Erro ao salvar resultados: {e}")
+        finally:
+            self.details.close()
+
+
+def _averages(stats: dict):
+    success_rate = (stats['solutions_found'] / stats['mazes_tested']) * 100
+    avg_time = stats['total_time'] / stats['mazes_tested']
+    avg_nodes = stats['total_nodes'] / stats['mazes_tested']
+    avg_memory = stats['total_memory'] / stats['mazes_tested']
+    avg_cost = stats['total_cost'] / stats['solutions_found'] if stats['solutions_found'] > 0 else 0
+    return success_rate, avg_time, avg_nodes, avg_memory, avg_cost
+
+
 def save_results(all_experiments_data, output_file):
     """Salva os resultados em um arquivo de relatório"""
-    try:
-        output_dir = os.path.dirname(output_file)  # Pega o diretório do arquivo de saída
-
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.write("=" * 80 + "\n")
-            file.write("        RELATÓRIO COMPARATIVO DOS ALGORITMOS DE BUSCA\n")
-            file.write("=" * 80 + "\n\n")
-            file.write(f"Data da Execução: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-
-            total_mazes_tested = len(all_experiments_data)
-            file.write(f"Total de Labirintos Testados: {total_mazes_tested}\n\n")
-
-            # Resumo geral
-            file.write("=" * 34 + " RESUMO GERAL " + "=" * 34 + "\n\n")
-
-            # Coleta estatísticas gerais
-            algorithm_stats = {}
-            for algorithm_name in ALGORITHMS_TO_RUN.keys():
-                algorithm_stats[algorithm_name] = {
-                    'total_time': 0,
-                    'total_nodes': 0,
-                    'total_memory': 0,
-                    'solutions_found': 0,
-                    'total_cost': 0,
-                    'mazes_tested': 0
-                }
-
-            # Itera uma vez para coletar estatísticas
-            for maze_number, source_file,results_for_maze in all_experiments_data:
-                for result in results_for_maze:
-                    alg_name = result['algorithm']
-                    algorithm_stats[alg_name]['mazes_tested'] += 1
-                    algorithm_stats[alg_name]['total_time'] += result['time']
-                    algorithm_stats[alg_name]['total_nodes'] += result['metrics']['nodes_expanded']
-                    algorithm_stats[alg_name]['total_memory'] += result['metrics']['max_memory_usage']
-
-                    if result['solution_found']:
-                        algorithm_stats[alg_name]['solutions_found'] += 1
-                        algorithm_stats[alg_name]['total_cost'] += result['cost']
-
-            # Escreve estatísticas gerais
-            file.write(f"{'Algoritmo':<30} {'Sucessos':<10} {'Tempo Médio':<15} {'Nós Médios':<12} {'Memória Média':<15} {'Custo Médio':<12}\n")
-            file.write("-" * 100 + "\n")
-
-            for alg_name, stats in algorithm_stats.items():
-                if stats['mazes_tested'] > 0:
-                    success_rate = (stats['solutions_found'] / stats['mazes_tested']) * 100
-                    avg_time = stats['total_time'] / stats['mazes_tested']
-                    avg_nodes = stats['total_nodes'] / stats['mazes_tested']
-                    avg_memory = stats['total_memory'] / stats['mazes_tested']
-                    avg_cost = stats['total_cost'] / stats['solutions_found'] if stats['solutions_found'] > 0 else 0
-
-                    file.write(f"{alg_name:<30} {success_rate:>6.1f}% {avg_time:>12.6f}s {avg_nodes:>10.1f} {avg_memory:>13.1f} {avg_cost:>10.1f}\n")
-
-            file.write("\n" + "=" * 80 + "\n\n")
-
-            # Comparação de Heurísticas
-            file.write("=" * 30 + " COMPARAÇÃO DE HEURÍSTICAS " + "=" * 30 + "\n\n")
-            
-            # Coleta estatísticas por heurística
-            manhattan_stats = {'A*': [], 'Greedy': []}
-            euclidean_stats = {'A*': [], 'Greedy': []}
-            
-            for maze_number, source_file, results_for_maze in all_experiments_data:
-                for result in results_for_maze:
-                    alg_name = result['algorithm']
-                    if 'Manhattan' in alg_name:
-                        if 'A*' in alg_name:
-                            manhattan_stats['A*'].append(result)
-                        else:
-                            manhattan_stats['Greedy'].append(result)
-                    elif 'Euclidiana' in alg_name:
-                        if 'A*' in alg_name:
-                            euclidean_stats['A*'].append(result)
-                        else:
-                            euclidean_stats['Greedy'].append(result)
-            
-            file.write(f"{'Heurística':<15} {'Algoritmo':<15} {'Sucessos':<10} {'Tempo Médio':<15} {'Nós Médios':<12} {'Memória Média':<15} {'Custo Médio':<12}\n")
-            file.write("-" * 100 + "\n")
-            
-            for heuristic_name, stats in [("Manhattan", manhattan_stats), ("Euclidiana", euclidean_stats)]:
-                for alg_type, results in stats.items():
-                    if results:
-                        success_rate = sum(1 for r in results if r['solution_found']) / len(results) * 100
-                        avg_time = sum(r['time'] for r in results) / len(results)
-                        avg_nodes = sum(r['metrics']['nodes_expanded'] for r in results) / len(results)
-                        avg_memory = sum(r['metrics']['max_memory_usage'] for r in results) / len(results)
-                        successful_results = [r for r in results if r['solution_found']]
-                        avg_cost = sum(r['cost'] for r in successful_results) / len(successful_results) if successful_results else 0
-                        
-                        file.write(f"{heuristic_name:<15} {alg_type:<15} {success_rate:>6.1f}% {avg_time:>12.6f}s {avg_nodes:>10.1f} {avg_memory:>13.1f} {avg_cost:>10.1f}\n")
-            
-            file.write("\n" + "=" * 80 + "\n\n")
-
-            # Detalhes por labirinto
-            for maze_number, source_file, results_for_maze in all_experiments_data:
-                file.write("=" * 20 + f" ANÁLISE DO LABIRINTO {maze_number} " + "=" * 20 + "\n\n")
-                file.write(f"Gráficos de resultados salvos em: {output_dir}/mapa_{maze_number}_*.png\n\n")
-                file.write(f"Arquivo de origem: {os.path.basename(source_file)}\n\n")
-
-                for result in results_for_maze:
-                    file.write('-' * 50 + "\n")
-                    file.write(f"Algoritmo: {result['algorithm']}\n")
-                    file.write("-" * 50 + "\n")
-
-                    if result['solution_found']:
-                        file.write("Solução Encontrada: Sim\n")
-                        file.write(f"Custo do Caminho: {result['cost']}\n")
-                    else:
-                        file.write("Solução Encontrada: Não\n")
-
-                    file.write(f"Tempo de Execução (s): {result['time']:.6f}\n")
-                    file.write(f"Nós Expandidos: {result['metrics']['nodes_expanded']}\n")
-                    file.write(f"Uso Máximo de Memória: {result['metrics']['max_memory_usage']}\n")
-                    file.write("\n")
-
-        print(f"Resultados salvos com sucesso em '{output_file}'")
-    except Exception as e:
-        print(f"Erro ao salvar resultados: {e}")
-
-
-def main():
-    """Função principal que testa todos os labirintos"""
+    report = ReportWriter(output_file)
+    for maze_number, source_file, results_for_maze in all_experiments_data:
+        report.add(maze_number, source_file, results_for_maze)
+    report.close()
 
-    # Define os caminhos de entrada e saída
-    output_dir = 'data'
-    
-    # Garante que o diretório de saída exista
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-        print(f"Diretório '{output_dir}' criado.")
 
-    # Encontra todos os arquivos de labirinto
-    maze_files = glob.glob('data/labirinto*.txt')
-    maze_files.sort()  # Ordena para garantir ordem consistente
+def run_algorithm(maze, name: str, cache: Optional[PathCache] = None) -> dict:
+    """
+    Executa um algoritmo de ALGORITHMS_TO_RUN em um labirinto e mede o tempo.
+    Com cache, um acerto devolve o caminho e as métricas da busca original
+    (o tempo medido é o da consulta ao cache) e o resultado traz cache_hit.
+    """
+    search_function = ALGORITHMS_TO_RUN[name]
+    hits = cache.hits if cache is not None else 0
+    start_time = time.perf_counter()
+    if cache is None:
+        path, metrics = search_function(maze)
+    else:
+        path, metrics = cache.search(maze, search_function, name)
+    end_time = time.perf_counter()
+
+    result = {
+        "algorithm": name,
+        "solution_found": path is not None,
+        "cost": path_cost(maze, path),
+        "time": end_time - start_time,
+        "metrics": metrics
+    }
+    if cache is not None:
+        result["cache_hit"] = cache.hits > hits
+    return result
+
+
+# Labirinto mais recente montado por este processo trabalhador: os jobs de um
+# mesmo labirinto costumam cair em sequência no mesmo processo
+_worker_maze = None
+
+
+def _run_job(job):
+    """
+    Executa um job (labirinto, algoritmo) em um processo trabalhador.
+    Retorna (número do labirinto, resultado, erro).
+    """
+    global _worker_maze
+    maze_number, grid, name = job
 
-    if not maze_files:
-        print("Nenhum arquivo de labirinto encontrado em 'data/'. Encerrando.")
-        return
+    if _worker_maze is None or _worker_maze[0] != maze_number:
+        try:
+            # (arquivo, offset) referencia um labirinto no formato binário,
+            # mapeado em memória e compartilhado entre os processos
+            if isinstance(grid, tuple):
+                _worker_maze = (maze_number, load_binary_maze(*grid))
+            else:
+                _worker_maze = (maze_number, FlatGrid.from_grid(grid))
+        except Exception as e:
+            _worker_maze = (maze_number, e)
 
-    print(f"Encontrados {len(maze_files)} arquivos de labirinto:")
-    for file in maze_files:
-        print(f"  - {file}")
+    maze = _worker_maze[1]
+    if isinstance(maze, Exception):
+        return maze_number, None, str(maze)
+    return maze_number, run_algorithm(maze, name), None
 
-    all_experiments_results = []
+
+def run_experiments_sequential(maze_entries, output_dir: str, verbose: bool = False,
+                               cache: Optional[PathCache] = None):
+    """
+    Executa todos os algoritmos labirinto a labirinto no processo atual,
+    entregando (número, arquivo, resultados) assim que cada um termina.
+    Com cache, os caminhos já calculados para o mesmo mapa são reaproveitados.
+    """
+    for maze_number, maze_file, grid in maze_entries:
+        print(f"\n  -> Processando Labirinto {maze_number}...")
+
+        try:
+            maze_problem = Maze.from_flat(grid) if isinstance(grid, FlatGrid) else Maze(grid, verbose=verbose)
+            stats = maze_problem.flat.wall_stats()
+            print(f"     Dimensões: {maze_problem.H}x{maze_problem.W}")
+            print(f"     Paredes: {stats['walls']} de {stats['cells']} células ({stats['wall_ratio']:.1%})")
+            print(f"     Start: {maze_problem.start}, Goal: {maze_problem.goal}")
+        except Exception as e:
+            print(f"     Erro ao criar o labirinto: {e}")
+            continue
+
+        # Armazena os resultados para o labirinto atual
+        current_maze_results = []
+
+        for name in ALGORITHMS_TO_RUN:
+            print(f"     -> Executando {name}...")
+            current_maze_results.append(run_algorithm(maze_problem, name, cache))
+
+        print(f"  -> Gerando gráficos para o Mapa {maze_number}...")
+        generate_and_save_graphs(current_maze_results, maze_number, output_dir)
+
+        yield maze_number, maze_file, current_maze_results
+
+
+def run_experiments_parallel(maze_entries, output_dir: str, workers: int):
+    """
+    Distribui os jobs (labirinto, algoritmo) entre um pool de processos.
+
+    Cada job é cronometrado dentro do seu processo trabalhador, e os
+    resultados são entregues na ordem de submissão à medida que ficam
+    prontos. Os labirintos são lidos do iterador só conforme há espaço: no
+    máximo 2 jobs por processo ficam pendentes (executor.map consumiria a
+    entrada inteira de uma vez). Os gráficos de um labirinto são enviados a
+    um processo separado assim que todos os seus algoritmos terminam, sem
+    bloquear os trabalhadores.
+    """
+    max_pending = 2 * workers
+    jobs = (((maze_number, grid, name), maze_file)
+            for maze_number, maze_file, grid in maze_entries
+            for name in ALGORITHMS_TO_RUN)
+
+    pending = deque()
+    chart_jobs = deque()
+    current_maze_results = []
+
+    def collect(limit: int):
+        # Consome os jobs mais antigos até restarem no máximo `limit` pendentes,
+        # entregando cada labirinto assim que todos os seus algoritmos terminam
+        nonlocal current_maze_results
+        while len(pending) > limit:
+            future, maze_file = pending.popleft()
+            maze_number, result, error = future.result()
+            current_maze_results.append(result if error is None else error)
+            if len(current_maze_results) < len(ALGORITHMS_TO_RUN):
+                continue
+
+            maze_results, current_maze_results = current_maze_results, []
+            if isinstance(maze_results[0], str):
+                print(f"  -> Labirinto {maze_number}: erro ao criar o labirinto: {maze_results[0]}")
+                continue
+
+            print(f"  -> Labirinto {maze_number} concluído; gerando gráficos em segundo plano...")
+            chart_jobs.append(chart_pool.submit(generate_and_save_graphs, maze_results, maze_number, output_dir))
+            # Os gráficos pendentes também são limitados (cada um guarda os resultados do labirinto)
+            while len(chart_jobs) > max_pending or (chart_jobs and chart_jobs[0].done()):
+                chart_jobs.popleft().result()
+
+            yield maze_number, maze_file, maze_results
+
+    with ProcessPoolExecutor(max_workers=workers) as search_pool, \
+            ProcessPoolExecutor(max_workers=1) as chart_pool:
+
+        for job, maze_file in jobs:
+            pending.append((search_pool.submit(_run_job, job), maze_file))
+            yield from collect(max_pending - 1)
+
+        yield from collect(0)
+
+        for chart_job in chart_jobs:
+            chart_job.result()
+
+
+def binary_maze_files(pattern: str = 'data/labirinto*') -> List[str]:
+    """
+    Arquivos .lab de pattern, na ordem dos arquivos de texto. Um arquivo de
+    texto sem .lab (nenhum labirinto dele foi convertido) continua na lista,
+    para que iter_maze_entries o conte e a numeração dos labirintos seguintes
+    seja a mesma da execução com os arquivos de texto.
+    """
+    stems = sorted({os.path.splitext(f)[0] for f in glob.glob(pattern + '.txt') + glob.glob(pattern + '.lab')})
+    return [stem + '.lab' if os.path.exists(stem + '.lab') else stem + '.txt' for stem in stems]
+
+
+def iter_maze_entries(maze_files: List[str], compact: bool = False, binary: bool = False):
+    """
+    Percorre os arquivos entregando (número, arquivo, grid) um labirinto por vez.
+
+    Arquivos .lab (formato binário) entregam um FlatGrid mapeado em memória.
+    Com compact=True o grid vem no formato mais barato de enviar a outro
+    processo: linhas em bytes para os arquivos de texto, e a referência
+    (arquivo, offset) para os binários.
+
+    O número de cada labirinto é a sua posição entre os labirintos dos
+    arquivos de texto. Labirintos que não foram convertidos (marcadores no
+    .lab ou, com binary=True, arquivos de texto sem .lab) não são entregues,
+    mas contam na numeração e são informados.
+    """
     total_mazes = 0
 
-    # Processa cada arquivo de labirinto
     for maze_file in maze_files:
         print(f"\n--- Processando {maze_file} ---")
 
-        list_of_grids = read_mazes_from_file(maze_file)
-        if not list_of_grids:
+        mazes_in_file = 0
+        skipped = 0
+        if maze_file.endswith('.lab'):
+            grids = (None if flat is None else (maze_file, offset) if compact else flat
+                     for offset, flat in iter_binary_mazes(maze_file, include_skipped=True))
+        elif binary:
+            grids = (None for _ in iter_mazes_from_file(maze_file, as_bytes=True))
+        else:
+            grids = iter_mazes_from_file(maze_file, as_bytes=compact)
+
+        for grid in grids:
+            mazes_in_file += 1
+            if grid is None:
+                skipped += 1
+                print(f"  -> Labirinto {total_mazes + mazes_in_file}: não foi convertido para .lab; pulando")
+                continue
+            yield total_mazes + mazes_in_file, maze_file, grid
+
+        if not mazes_in_file:
             print(f"Nenhum labirinto encontrado em {maze_file}. Pulando.")
             continue
 
-        print(f"{len(list_of_grids)} labirinto(s) carregado(s) de '{maze_file}'.")
-
-        # Processa cada labirinto do arquivo
-        for i, grid in enumerate(list_of_grids):
-            maze_number = total_mazes + i + 1
-            print(f"\n  -> Processando Labirinto {maze_number}...")
+        print(f"{mazes_in_file - skipped} labirinto(s) carregado(s) de '{maze_file}'."
+              + (f" {skipped} não convertido(s)." if skipped else ""))
+        total_mazes += mazes_in_file
 
-            try:
-                maze_problem = Maze(grid)
-                print(f"     Dimensões: {maze_problem.H}x{maze_problem.W}")
-                print(f"     Start: {maze_problem.start}, Goal: {maze_problem.goal}")
-            except Exception as e:
-                print(f"     Erro ao criar o labirinto: {e}")
-                continue
 
-            # Armazena os resultados para o labirinto atual
-            current_maze_results = []
+def main(workers: int = 1, binary: bool = False, verbose: bool = False,
+         use_cache: bool = False, cache_file: Optional[str] = None):
+    """Função principal que testa todos os labirintos"""
 
-            for name, search_function in ALGORITHMS_TO_RUN.items():
-                print(f"     -> Executando {name}...")
-                start_time = time.time()
-                path, metrics = search_function(maze_problem)
-                end_time = time.time()
+    # Define os caminhos de entrada e saída
+    output_dir = 'data'
+    
+    # Garante que o diretório de saída exista
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"Diretório '{output_dir}' criado.")
 
-                result_data = {
-                    "algorithm": name,
-                    "solution_found": path is not None,
-                    "cost": len(path) - 1 if path else "N/A",
-                    "time": end_time - start_time,
-                    "metrics": metrics
-                }
-                current_maze_results.append(result_data)
+    # Encontra todos os arquivos de labirinto
+    if binary:
+        maze_files = binary_maze_files()
+    else:
+        maze_files = glob.glob('data/labirinto*.txt')
+        maze_files.sort()  # Ordena para garantir ordem consistente
 
-            all_experiments_results.append((maze_number, maze_file, current_maze_results))
+    if not maze_files:
+        print("Nenhum arquivo de labirinto encontrado em 'data/'. Encerrando.")
+        return
 
-            # --- NOVA CHAMADA PARA GERAR GRÁFICOS ---
-            print(f"  -> Gerando gráficos para o Mapa {maze_number}...")
-            generate_and_save_graphs(current_maze_results, maze_number, output_dir)
-        
-        total_mazes += len(list_of_grids)
+    print(f"Encontrados {len(maze_files)} arquivos de labirinto:")
+    for file in maze_files:
+        print(f"  - {file}")
 
+    # Os labirintos são lidos, buscados, registrados no relatório e
+    # descartados um a um: a memória não cresce com o tamanho do corpus
+    output_file = os.path.join(output_dir, 'relatorio_completo.txt')
+    report = ReportWriter(output_file)
+    cache = PathCache(path=cache_file) if use_cache or cache_file else None
+    if cache is not None and len(cache):
+        print(f"Cache de caminhos: {len(cache)} entrada(s) carregada(s) de '{cache_file}'")
+
+    if workers > 1:
+        print(f"\nExecutando com {workers} processos...")
+        maze_entries = iter_maze_entries(maze_files, compact=True, binary=binary)
+        experiments = run_experiments_parallel(maze_entries, output_dir, workers)
+    else:
+        maze_entries = iter_maze_entries(maze_files, binary=binary)
+        experiments = run_experiments_sequential(maze_entries, output_dir, verbose, cache)
+
+    for maze_number, maze_file, results_for_maze in experiments:
+        report.add(maze_number, maze_file, results_for_maze)
+
+    total_mazes = report.mazes_tested
     print(f"\n=== TESTE CONCLUÍDO ===")
     print(f"Total de labirintos processados: {total_mazes}")
     print(f"Total de algoritmos testados: {len(ALGORITHMS_TO_RUN)}")
     print(f"Total de experimentos: {total_mazes * len(ALGORITHMS_TO_RUN)}")
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Cache de caminhos: {stats['hits']} acertos, {stats['misses']} falhas, "
+              f"{stats['entries']} entradas ({stats['bytes']} bytes), {stats['evictions']} descartes")
+        if cache_file:
+            cache.save()
 
     # Salva os resultados
-    output_file = os.path.join(output_dir, 'relatorio_completo.txt')
-    save_results(all_experiments_results, output_file)
+    report.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Compara os algoritmos de busca em todos os labirintos de 'data/'.")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="número de processos para as buscas (0 = todos os núcleos; padrão: 1)")
+    parser.add_argument("--binary", action="store_true",
+                        help="lê os labirintos convertidos 'data/labirinto*.lab' (ver convert_mazes.py)")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="imprime cada mapa ao carregá-lo (depuração; só na execução sequencial)")
+    parser.add_argument("--cache", action="store_true",
+                        help="reaproveita caminhos já calculados para o mesmo mapa, algoritmo, início e objetivo")
+    parser.add_argument("--cache-file", metavar="ARQUIVO",
+                        help="como --cache, carregando e salvando o cache neste arquivo entre execuções")
+    args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else os.cpu_count()
+    if (args.cache or args.cache_file) and workers > 1:
+        parser.error("--cache e --cache-file só estão disponíveis na execução sequencial (-j 1)")
+    main(workers=workers, binary=args.binary, verbose=args.verbose,
+         use_cache=args.cache, cache_file=args.cache_file)
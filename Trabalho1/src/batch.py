@@ -0,0 +1,241 @@
+#Busca em lote: várias consultas (início, objetivo) sobre o mesmo labirinto
+
+import time
+from array import array
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.landmarks import UNREACHABLE, bfs_distances
+from src.maze import Maze, Pos, as_flat
+from src.path_cache import PathCache
+from src.path_handle import PathHandle
+from src.search import PRIORITY_F, a_star_search, best_first_search, path_cost
+
+Query = Tuple[Pos, Pos]
+
+
+def batch_search(
+    maze: Maze,
+    queries: Sequence[Query],
+    search_function: Callable = a_star_search,
+    group_by_goal: bool = False,
+    goal_tables: bool = False,
+    cache: Optional[PathCache] = None
+):
+    """
+    Responde uma lista de consultas (início, objetivo) sobre o mesmo labirinto.
+
+    O mapa é convertido para FlatGrid uma única vez; cada consulta recebe
+    apenas uma visão com outro início/objetivo, reaproveitando as células, a
+    tabela de vizinhos e o SearchWorkspace (pais, custos e marcas de
+    visitado). Com group_by_goal=True as consultas que compartilham o
+    objetivo são respondidas por uma única busca reversa a partir dele
+    (BFS), cuja árvore de predecessores dá o caminho mínimo de cada início;
+    nesse modo search_function é ignorada, e o mapa precisa ter custo
+    uniforme (a BFS conta passos).
+
+    Com goal_tables=True cada consulta roda um A* cuja heurística é a
+    distância exata até o objetivo, lida de uma tabela calculada uma única
+    vez por objetivo (BFS reversa) e reaproveitada por todas as consultas
+    com o mesmo objetivo; em mapas de custo uniforme o A* então expande
+    apenas o caminho (em terreno com custo a tabela, em passos, é escalada
+    pelo menor custo de passo e continua admissível). Também aqui
+    search_function é ignorada, e o tempo das tabelas entra no total do
+    lote (table_time no resumo), não no de cada consulta.
+
+    Com cache (apenas no modo normal), consultas repetidas sobre o mesmo
+    mapa devolvem o caminho guardado sem nova busca; o resumo traz então
+    cache_hits e cache_misses deste lote.
+
+    Retorna (resultados, resumo): um dicionário por consulta, na ordem de
+    entrada, e um resumo com o tempo total e a vazão (consultas/s).
+    """
+    grid = as_flat(maze)
+    if group_by_goal and grid.costs is not None:
+        raise ValueError("group_by_goal supports only uniform step costs")
+    use_cache = cache is not None and not group_by_goal and not goal_tables
+    if use_cache:
+        grid.fingerprint()  # Calculado uma vez: as visões herdam o valor guardado
+        hits, misses = cache.hits, cache.misses
+    results: List[Optional[dict]] = [None] * len(queries)
+    total_nodes = 0
+    tables: Dict[int, array] = {}
+    table_time = 0.0
+
+    batch_start_time = time.perf_counter()
+
+    if group_by_goal:
+        groups: Dict[Pos, List[int]] = {}
+        for i, (_, goal) in enumerate(queries):
+            groups.setdefault(goal, []).append(i)
+        for goal, indices in groups.items():
+            total_nodes += _answer_goal_group(grid, goal, indices, queries, results)
+    elif goal_tables:
+        for i, (start, goal) in enumerate(queries):
+            results[i], elapsed = _run_table_query(grid, start, goal, tables)
+            table_time += elapsed
+            total_nodes += results[i]['metrics'].get('nodes_expanded', 0)
+    else:
+        for i, (start, goal) in enumerate(queries):
+            results[i] = _run_query(grid, start, goal, search_function, cache if use_cache else None)
+            total_nodes += results[i]['metrics'].get('nodes_expanded', 0)
+
+    total_time = time.perf_counter() - batch_start_time
+
+    solved = sum(1 for r in results if r['solution_found'])
+    summary = {
+        "queries": len(queries),
+        "solved": solved,
+        "total_time": total_time,
+        "avg_time": total_time / len(queries) if queries else 0.0,
+        "queries_per_second": len(queries) / total_time if total_time > 0 else float('inf'),
+        "total_nodes_expanded": total_nodes,
+        "groups": len(groups) if group_by_goal else len(queries),
+    }
+    if goal_tables and not group_by_goal:
+        summary["tables"] = len(tables)
+        summary["table_time"] = table_time
+    if use_cache:
+        summary["cache_hits"] = cache.hits - hits
+        summary["cache_misses"] = cache.misses - misses
+    return results, summary
+
+
+def _query_result(grid, start: Pos, goal: Pos, path, elapsed: float, metrics: dict, error: Optional[str] = None) -> dict:
+    result = {
+        "start": start,
+        "goal": goal,
+        "solution_found": path is not None,
+        "cost": path_cost(grid, path),
+        "time": elapsed,
+        "metrics": metrics,
+        "path": path,
+    }
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+def _run_query(grid, start: Pos, goal: Pos, search_function: Callable, cache: Optional[PathCache] = None) -> dict:
+    try:
+        view = grid.with_endpoints(start, goal)
+    except ValueError as e:
+        return _query_result(grid, start, goal, None, 0.0, {}, str(e))
+
+    start_time = time.perf_counter()
+    if cache is None:
+        path, metrics = search_function(view)
+    else:
+        path, metrics = cache.search(view, search_function)
+    return _query_result(grid, start, goal, path, time.perf_counter() - start_time, metrics)
+
+
+def _run_table_query(grid, start: Pos, goal: Pos, tables: Dict[int, array]) -> Tuple[dict, float]:
+    """
+    A* com a tabela de distâncias do objetivo como heurística (calculada na
+    primeira consulta com esse objetivo). Retorna (resultado, tempo gasto
+    construindo a tabela).
+    """
+    try:
+        view = grid.with_endpoints(start, goal)
+    except ValueError as e:
+        return _query_result(grid, start, goal, None, 0.0, {}, str(e)), 0.0
+
+    table_time = 0.0
+    distances = tables.get(view.goal)
+    if distances is None:
+        table_start_time = time.perf_counter()
+        distances = tables[view.goal] = bfs_distances(view, view.goal)
+        table_time = time.perf_counter() - table_start_time
+
+    start_time = time.perf_counter()
+    if distances[view.start] == UNREACHABLE:
+        # A tabela já responde: o início não alcança o objetivo
+        return _query_result(grid, start, goal, None, time.perf_counter() - start_time, {"nodes_expanded": 0}), table_time
+
+    W = view.W
+    path, metrics = best_first_search(view, PRIORITY_F, lambda pos, goal_pos: distances[pos[0] * W + pos[1]])
+    return _query_result(grid, start, goal, path, time.perf_counter() - start_time, metrics), table_time
+
+
+def _answer_goal_group(grid, goal: Pos, indices: List[int], queries: Sequence[Query], results: list) -> int:
+    """
+    BFS reversa a partir do objetivo, parando assim que todos os inícios do
+    grupo foram alcançados. Retorna o número de nós expandidos.
+    """
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+
+    try:
+        grid.with_endpoints(goal, goal)
+    except ValueError as e:
+        for i in indices:
+            results[i] = _query_result(grid, queries[i][0], goal, None, 0.0, {}, str(e))
+        return 0
+
+    pending = set()
+    for i in indices:
+        start = queries[i][0]
+        try:
+            grid.with_endpoints(start, goal)
+            pending.add(grid.cell_id(start))
+        except ValueError as e:
+            results[i] = _query_result(grid, start, goal, None, 0.0, {}, str(e))
+
+    sweep_start_time = time.perf_counter()
+
+    goal_node = grid.cell_id(goal)
+    parent: Dict[int, Optional[int]] = {goal_node: None}
+    frontier = deque([goal_node])
+    pending.discard(goal_node)
+    nodes_expanded = 0
+
+    while frontier and pending:
+        current_node = frontier.popleft()
+        nodes_expanded += 1
+        for offset in neighbor_offsets[cells[current_node]]:
+            neighbor_node = current_node + offset
+            if neighbor_node not in parent:
+                parent[neighbor_node] = current_node
+                pending.discard(neighbor_node)
+                frontier.append(neighbor_node)
+
+    # O tempo da varredura é dividido igualmente entre as consultas que ela respondeu
+    answered = [i for i in indices if results[i] is None]
+    shared_time = (time.perf_counter() - sweep_start_time) / len(answered) if answered else 0.0
+    metrics = {"nodes_expanded": nodes_expanded, "group_size": len(indices)}
+
+    for i in answered:
+        start = queries[i][0]
+        extraction_start_time = time.perf_counter()
+        current = grid.cell_id(start)
+        if current in parent:
+            # A árvore é reversa: seguir os pais já percorre do início ao objetivo
+            path = array('I')
+            while current is not None:
+                path.append(current)
+                current = parent[current]
+            path = PathHandle.on(grid, path)
+        else:
+            path = None
+        elapsed = shared_time + time.perf_counter() - extraction_start_time
+        results[i] = _query_result(grid, start, goal, path, elapsed, metrics)
+
+    return nodes_expanded
+
+
+def print_batch_report(results: List[dict], summary: dict):
+    """Imprime o resultado de cada consulta e a vazão agregada do lote."""
+    print(f"{'#':<6} {'Início':<14} {'Objetivo':<14} {'Custo':<8} {'Tempo (s)':<12} {'Nós Expandidos':<14}")
+    print("-" * 72)
+    for i, r in enumerate(results):
+        print(f"{i:<6} {str(r['start']):<14} {str(r['goal']):<14} {str(r['cost']):<8} "
+              f"{r['time']:<12.6f} {r['metrics'].get('nodes_expanded', 0):<14}")
+    print("-" * 72)
+    print(f"Consultas: {summary['queries']} ({summary['solved']} com solução, {summary['groups']} busca(s))")
+    print(f"Tempo total: {summary['total_time']:.6f}s | Tempo médio: {summary['avg_time']:.6f}s")
+    print(f"Vazão: {summary['queries_per_second']:.1f} consultas/s | Nós expandidos: {summary['total_nodes_expanded']}")
+    if "tables" in summary:
+        print(f"Tabelas de distância: {summary['tables']} ({summary['table_time']:.6f}s, reaproveitadas entre as consultas)")
+    if "cache_hits" in summary:
+        print(f"Cache de caminhos: {summary['cache_hits']} acertos, {summary['cache_misses']} falhas")
@@ -0,0 +1,121 @@
+#Formato binário de labirintos, carregado por mmap sem cópia
+#
+# Um arquivo .lab é uma sequência de registros, um por labirinto:
+#   cabeçalho (24 bytes, little-endian): magic b'LABB', versão (u16),
+#   flags (u16), H, W, início, objetivo (u32 cada; início/objetivo
+#   são ids de célula r * W + c)
+#   corpo: H * W bytes, exatamente o vetor de células do FlatGrid (bit OPEN
+#   e bits das direções transitáveis de cada célula), seguidos, com a flag
+#   HAS_COSTS, de mais H * W bytes com o custo de entrar em cada célula
+#
+# Um labirinto que não pôde ser convertido vira um marcador: cabeçalho com a
+# flag SKIPPED, H = W = 0 e sem corpo. Ele mantém a posição dos demais, de
+# modo que o n-ésimo registro é sempre o n-ésimo labirinto do arquivo de
+# texto de origem.
+#
+# A versão 1 (sem flags, campo reservado sempre 0) continua sendo lida.
+
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+from src.maze import FlatGrid, Grid, Maze, as_flat
+
+MAGIC = b'LABB'
+VERSION = 2
+_SUPPORTED_VERSIONS = (1, 2)
+
+HAS_COSTS = 1  # Flag: o registro traz o plano de custos depois das células
+SKIPPED = 2    # Flag: marcador de um labirinto que não foi convertido (sem corpo)
+
+_HEADER = struct.Struct('<4sHHIIII')
+
+
+def write_binary_mazes(path: str, mazes: Iterable[Optional[Union[Grid, Maze, FlatGrid]]]) -> int:
+    """
+    Grava os labirintos em `path` no formato binário e retorna quantos foram
+    gravados. Aceita grids de texto (listas de caracteres, str ou bytes),
+    Maze ou FlatGrid; os grids são consumidos um por vez. Um item None grava
+    um marcador SKIPPED no lugar do labirinto (não entra na contagem).
+    """
+    count = 0
+    with open(path, 'wb') as f:
+        for maze in mazes:
+            if maze is None:
+                f.write(_HEADER.pack(MAGIC, VERSION, SKIPPED, 0, 0, 0, 0))
+                continue
+            grid = as_flat(maze) if isinstance(maze, (Maze, FlatGrid)) else FlatGrid.from_grid(maze)
+            flags = HAS_COSTS if grid.costs is not None else 0
+            f.write(_HEADER.pack(MAGIC, VERSION, flags, grid.H, grid.W, grid.start, grid.goal))
+            f.write(grid.cells)
+            if grid.costs is not None:
+                f.write(grid.costs)
+            count += 1
+    return count
+
+
+def _records(buffer) -> Iterator[Tuple[int, int, int, int, int, bool, bool]]:
+    """Percorre os cabeçalhos: (offset do corpo, H, W, início, objetivo, tem custos, é marcador)."""
+    offset = 0
+    size = len(buffer)
+    while offset < size:
+        if size - offset < _HEADER.size:
+            raise ValueError(f"Truncated header at byte {offset}")
+        magic, version, flags, H, W, start, goal = _HEADER.unpack_from(buffer, offset)
+        if magic != MAGIC:
+            raise ValueError(f"Invalid maze record at byte {offset}")
+        if version not in _SUPPORTED_VERSIONS:
+            raise ValueError(f"Unsupported maze format version {version}")
+
+        weighted = version >= 2 and bool(flags & HAS_COSTS)
+        skipped = version >= 2 and bool(flags & SKIPPED)
+        body = offset + _HEADER.size
+        end = body if skipped else body + H * W * (2 if weighted else 1)
+        if end > size:
+            raise ValueError(f"Truncated maze record at byte {offset}")
+        yield body, H, W, start, goal, weighted, skipped
+        offset = end
+
+
+def _map_file(path: str):
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''  # mmap não aceita arquivos vazios
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def iter_binary_mazes(path: str, include_skipped: bool = False) -> Iterator[Tuple[int, Optional[FlatGrid]]]:
+    """
+    Carrega os labirintos de um arquivo .lab, entregando (offset, FlatGrid).
+
+    O arquivo é mapeado em memória (somente leitura) e as células de cada
+    FlatGrid são uma fatia desse mapeamento: nada é copiado nem decodificado,
+    o custo de abrir independe do tamanho do mapa e processos que abrem o
+    mesmo arquivo compartilham as mesmas páginas. O offset identifica o
+    registro para load_binary_maze. Marcadores SKIPPED são pulados, ou
+    entregues como (offset, None) com include_skipped=True, para quem
+    numera os labirintos pela posição no arquivo de origem.
+    """
+    mapped = memoryview(_map_file(path))
+    for record in _records(mapped):
+        if record[-1]:
+            if include_skipped:
+                yield record[0] - _HEADER.size, None
+            continue
+        yield record[0] - _HEADER.size, _flat_grid(mapped, *record[:-1])
+
+
+def load_binary_maze(path: str, offset: int = 0) -> FlatGrid:
+    """Carrega um único labirinto, a partir do offset do seu registro."""
+    mapped = memoryview(_map_file(path))
+    body, H, W, start, goal, weighted, skipped = next(_records(mapped[offset:]))
+    if skipped:
+        raise ValueError(f"The maze at byte {offset} of {path} was skipped during conversion")
+    return _flat_grid(mapped, body + offset, H, W, start, goal, weighted)
+
+
+def _flat_grid(mapped, body: int, H: int, W: int, start: int, goal: int, weighted: bool) -> FlatGrid:
+    size = H * W
+    costs = mapped[body + size:body + 2 * size] if weighted else None
+    return FlatGrid(H, W, mapped[body:body + size], start, goal, costs)
@@ -0,0 +1,120 @@
+#Campo de distâncias até o objetivo calculado com NumPy (BFS por frentes de onda)
+
+from typing import List, Optional
+
+from src.maze import DIRECTIONS, Maze, Pos, as_flat
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: só este módulo depende dele
+    np = None
+
+UNREACHABLE = -1
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("NumPy é necessário para o campo de distâncias (pip install numpy)")
+
+
+def passable_array(maze: Maze):
+    """Retorna o labirinto como um array booleano H x W (True = transitável)."""
+    _require_numpy()
+    grid = as_flat(maze)
+    cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.H, grid.W)
+    return cells != 0
+
+
+class DistanceField:
+    """
+    Distâncias (em passos) de todas as células até um mesmo objetivo.
+    Células inalcançáveis (ou paredes) valem UNREACHABLE.
+    """
+
+    def __init__(self, distances, goal: Pos):
+        self.distances = distances
+        self.goal = goal
+
+    def distance(self, start: Pos) -> Optional[int]:
+        d = int(self.distances[start])
+        return None if d == UNREACHABLE else d
+
+    def path(self, start: Pos) -> Optional[List[Pos]]:
+        """Extrai um caminho mínimo descendo o gradiente do campo a partir de start."""
+        distances = self.distances
+        H, W = distances.shape
+        d = int(distances[start])
+        if d == UNREACHABLE:
+            return None
+
+        r, c = start
+        path = [(r, c)]
+        while d > 0:
+            for _, _, dr, dc in DIRECTIONS:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < H and 0 <= nc < W and distances[nr, nc] == d - 1:
+                    r, c = nr, nc
+                    break
+            d -= 1
+            path.append((r, c))
+        return path
+
+
+def goal_distance_field(maze: Maze, goal: Optional[Pos] = None) -> DistanceField:
+    """
+    Calcula a distância até o objetivo para todas as células de uma vez.
+
+    Cada camada da BFS é obtida deslocando a frente de onda atual nas quatro
+    direções com operações de array. O trabalho fica restrito à caixa
+    envolvente da frente (expandida em uma célula a cada camada), o que evita
+    varrer a grade inteira enquanto a onda ainda é pequena.
+    """
+    _require_numpy()
+    grid = as_flat(maze)
+    H, W = grid.H, grid.W
+    if goal is None:
+        goal = grid.pos_of(grid.goal)
+
+    open_cells = passable_array(grid)
+    distances = np.full((H, W), UNREACHABLE, dtype=np.int32)
+    if not open_cells[goal]:
+        return DistanceField(distances, goal)
+
+    visited = ~open_cells
+    frontier = np.zeros((H, W), dtype=bool)
+    frontier[goal] = True
+    visited[goal] = True
+    distances[goal] = 0
+
+    r0, r1 = goal[0], goal[0] + 1
+    c0, c1 = goal[1], goal[1] + 1
+    layer = 0
+
+    while True:
+        # Janela = caixa da frente atual expandida em uma célula
+        r0, r1 = max(r0 - 1, 0), min(r1 + 1, H)
+        c0, c1 = max(c0 - 1, 0), min(c1 + 1, W)
+        window = frontier[r0:r1, c0:c1]
+
+        grow = np.zeros_like(window)
+        grow[1:, :] |= window[:-1, :]
+        grow[:-1, :] |= window[1:, :]
+        grow[:, 1:] |= window[:, :-1]
+        grow[:, :-1] |= window[:, 1:]
+        grow &= ~visited[r0:r1, c0:c1]
+
+        if not grow.any():
+            break
+
+        layer += 1
+        distances[r0:r1, c0:c1][grow] = layer
+        visited[r0:r1, c0:c1] |= grow
+        frontier[r0:r1, c0:c1] = grow
+
+        # Encolhe a caixa para a extensão real da nova frente
+        rows = np.flatnonzero(grow.any(axis=1))
+        cols = np.flatnonzero(grow.any(axis=0))
+        r0, r1 = r0 + rows[0], r0 + rows[-1] + 1
+        c0, c1 = c0 + cols[0], c0 + cols[-1] + 1
+
+    return DistanceField(distances, goal)
@@ -0,0 +1,218 @@
+#Replanejamento incremental com D* Lite
+#
+# A busca parte do objetivo em direção ao início. Para cada célula guarda-se
+# g (custo até o objetivo conhecido) e rhs (a melhor estimativa pelos
+# vizinhos: min c(s, s') + g(s')); só as células em que os dois diferem
+# (inconsistentes) entram na fila de prioridade. Quando células do mapa
+# abrem ou fecham, apenas elas e os seus vizinhos têm o rhs recalculado, e a
+# nova busca repara a árvore anterior a partir desses pontos, em vez de
+# refazer o A* do zero. km acumula o quanto o início andou, para que as
+# chaves antigas da fila continuem válidas sem reordenar o heap.
+
+import heapq
+from typing import Iterable, Optional, Tuple
+
+from src.heuristics import manhattan_distance
+from src.maze import FlatGrid, Maze, Pos, as_flat
+from src.path_handle import PathHandle
+from src.search import METRICS_FULL, MetricsMode, metrics_mode, search_metrics
+
+INF = float('inf')
+
+CellChange = Tuple[Pos, bool]  # (posição, transitável depois da mudança)
+
+
+class DStarLite:
+    """
+    Planejador D* Lite sobre um labirinto que muda entre as consultas.
+
+        planner = DStarLite(maze)
+        path, metrics = planner.plan()
+        planner.update_cells([((3, 4), False), ((7, 1), True)])
+        path, metrics = planner.plan()   # repara a busca anterior
+
+    As mudanças são aplicadas no próprio mapa (set_passable). O custo de
+    um passo é o custo de entrada da célula de destino, e a heurística
+    (em passos) é escalada pelo menor custo de passo do mapa; se esse
+    mínimo mudar, o planejador recomeça do zero.
+    """
+
+    def __init__(self, maze: Maze, heuristic=manhattan_distance):
+        self.maze = maze
+        self.grid = as_flat(maze)
+        self.heuristic = heuristic
+        self.start = self.grid.start
+        self._start_pos = self.grid.pos_of(self.start)
+        self._pushes = 0  # Inserções na fila desde o último plan() (heap_pushes)
+        self._reset()
+
+    def _reset(self):
+        grid = self.grid
+        self.goal = grid.goal
+        self._scale = grid.min_cost
+        self.km = 0
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self._queued = {}
+        self._queue = []
+        self._push(self.goal, self._key(self.goal))
+
+    def _key(self, cell: int) -> Tuple[float, float]:
+        # A busca é reversa: h estima a distância da célula até o início
+        best = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        h = self.heuristic(divmod(cell, self.grid.W), self._start_pos) * self._scale
+        return (best + h + self.km, best)
+
+    def _push(self, cell: int, key: Tuple[float, float]):
+        # Remoção preguiçosa: só vale a entrada cuja chave é a registrada em _queued
+        self._queued[cell] = key
+        heapq.heappush(self._queue, (key[0], key[1], cell))
+        self._pushes += 1
+
+    def _update_vertex(self, cell: int):
+        grid = self.grid
+        if cell != self.goal:
+            g = self.g
+            costs = grid.costs
+            best = INF
+            for offset in grid.neighbor_offsets[grid.cells[cell]]:
+                neighbor = cell + offset
+                candidate = g.get(neighbor, INF) + (costs[neighbor] if costs is not None else 1)
+                if candidate < best:
+                    best = candidate
+            self.rhs[cell] = best
+        self._queued.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self._push(cell, self._key(cell))
+
+    def _compute_shortest_path(self, measure_peak: bool = True) -> Tuple[int, int, int]:
+        """
+        Processa as células inconsistentes até o início ficar consistente.
+        Retorna (expandidos, pico da fila, entradas desatualizadas
+        descartadas); sem measure_peak o pico é 0.
+        """
+        grid = self.grid
+        cells = grid.cells
+        neighbor_offsets = grid.neighbor_offsets
+        queue, queued, g, rhs = self._queue, self._queued, self.g, self.rhs
+        start = self.start
+        expanded = 0
+        stale = 0
+        peak = len(queue) if measure_peak else 0
+        start_key = self._key(start)
+
+        while queue:
+            k1, k2, cell = queue[0]
+            if queued.get(cell) != (k1, k2):
+                heapq.heappop(queue)  # Entrada desatualizada
+                stale += 1
+                continue
+            if (k1, k2) >= start_key and rhs.get(start, INF) == g.get(start, INF):
+                break
+
+            heapq.heappop(queue)
+            new_key = self._key(cell)
+            if (k1, k2) < new_key:
+                self._push(cell, new_key)  # A chave subiu com km: volta à fila
+                continue
+
+            del queued[cell]
+            expanded += 1
+            neighbors = [cell + offset for offset in neighbor_offsets[cells[cell]]]
+            if g.get(cell, INF) > rhs[cell]:
+                g[cell] = rhs[cell]  # Sobreconsistente: o custo melhorou
+            else:
+                g[cell] = INF  # Subconsistente: o custo piorou, reavalia a célula também
+                neighbors.append(cell)
+            for neighbor in neighbors:
+                self._update_vertex(neighbor)
+            if cell == start or start in neighbors:
+                start_key = self._key(start)
+
+            if measure_peak and len(queue) > peak:
+                peak = len(queue)
+
+        return expanded, peak, stale
+
+    def plan(self, collect_metrics: MetricsMode = METRICS_FULL):
+        """
+        Calcula (ou repara) o caminho do início ao objetivo e o retorna como
+        (caminho, métricas), com caminho = None se o objetivo não for
+        alcançável. O caminho segue, a partir do início, o vizinho de menor
+        custo de passo + g. collect_metrics segue src.search.METRICS_MODES;
+        heap_pushes conta as inserções na fila desde o plan() anterior
+        (incluindo as de update_cells), e peak_visited as células com g.
+        """
+        mode = metrics_mode(collect_metrics)
+        if self.grid.min_cost != self._scale:
+            self._reset()  # A heurística escalada deixaria de ser admissível
+        expanded, peak, stale = self._compute_shortest_path(mode == METRICS_FULL)
+
+        metrics = search_metrics(mode, expanded, peak + len(self.g), peak, len(self.g),
+                                 heap_pushes=self._pushes, stale_pops=stale)
+        self._pushes = 0
+
+        g = self.g
+        if g.get(self.start, INF) == INF:
+            return None, metrics
+
+        grid = self.grid
+        cells, costs = grid.cells, grid.costs
+        path = [self.start]
+        cell = self.start
+        while cell != self.goal:
+            cell = min(
+                (cell + offset for offset in grid.neighbor_offsets[cells[cell]]),
+                key=lambda n: g.get(n, INF) + (costs[n] if costs is not None else 1),
+            )
+            path.append(cell)
+        return PathHandle.on(grid, path, g[self.start]), metrics
+
+    def update_cells(self, changes: Iterable[CellChange]) -> int:
+        """
+        Aplica mudanças (posição, transitável) ao mapa e marca as células
+        afetadas (a própria célula e os vizinhos) para o próximo plan().
+        Retorna quantas células realmente mudaram.
+        """
+        grid = self.grid
+        changed = 0
+        touched = set()
+        for pos, passable in changes:
+            cell = grid.cell_id(pos)
+            if isinstance(self.maze, Maze):
+                updated = self.maze.set_passable(pos, passable)
+            else:
+                updated = grid.set_passable(cell, passable)
+            if not updated:
+                continue
+            changed += 1
+            touched.add(cell)
+            r, c = pos
+            for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                if 0 <= nr < grid.H and 0 <= nc < grid.W:
+                    touched.add(nr * grid.W + nc)
+
+        # Paredes saem da árvore antes de os vizinhos recalcularem o rhs sem elas
+        for cell in touched:
+            if not grid.cells[cell]:
+                self.g.pop(cell, None)
+                self.rhs.pop(cell, None)
+                self._queued.pop(cell, None)
+        for cell in touched:
+            if grid.cells[cell]:
+                self._update_vertex(cell)
+        return changed
+
+    def move_to(self, pos: Pos):
+        """Move o início (o agente andou pelo caminho); as chaves antigas valem com km."""
+        cell = self.grid.cell_id(pos)
+        if not self.grid.cells[cell]:
+            raise ValueError(f"Position {pos} is not a free cell")
+        self.km += self.heuristic(self._start_pos, pos) * self._scale
+        self.start = cell
+        self._start_pos = pos
+
+
+def d_star_lite_search(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """Busca única com D* Lite (equivale a um A* reverso); para replanejar, use DStarLite."""
+    return DStarLite(maze).plan(collect_metrics)
@@ -0,0 +1,392 @@
+#Busca hierárquica HPA* (Hierarchical Path-Finding A*)
+#
+# O mapa é dividido em clusters quadrados. Em cada fronteira entre dois
+# clusters vizinhos, cada trecho contínuo de passagens vira uma entrada (ou
+# duas, nas pontas, se o trecho for longo), formada por um par de células
+# vizinhas, uma de cada lado. O grafo abstrato tem essas células como nós,
+# arestas de custo 1 entre os dois lados de cada entrada e, dentro de cada
+# cluster, arestas com a distância exata entre as entradas (BFS restrita ao
+# cluster). Uma consulta liga início e objetivo às entradas do próprio
+# cluster, faz A* no grafo abstrato (pequeno) e refina cada aresta em células
+# com outra BFS restrita ao cluster. O caminho é quase ótimo: passa sempre
+# pelas células de entrada escolhidas. Só vale para mapas de custo uniforme.
+
+import heapq
+import itertools
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from src.maze import DIR_L, DIR_S, FlatGrid, Maze, as_flat
+from src.path_handle import PathHandle
+from src.search import METRICS_FULL, MetricsMode, metrics_mode, search_metrics
+
+DEFAULT_CLUSTER_SIZE = 16
+LONG_ENTRANCE = 6  # Trechos com pelo menos esse tamanho viram duas entradas
+
+START = -1  # Nós temporários do início e do objetivo na busca abstrata
+GOAL = -2
+
+# Arquivo do grafo abstrato: cabeçalho (magic, versão, tamanho do cluster,
+# H, W, fingerprint do mapa, quantidade de nós e de arestas), ids das células
+# dos nós (u32) e as arestas em formato CSR: início das arestas de cada nó
+# (nós + 1 valores), destino e custo de cada aresta (u32)
+MAGIC = b'HPA1'
+VERSION = 1
+_HEADER = struct.Struct('<4sHHII16sII')
+
+Bounds = Tuple[int, int, int, int]
+
+
+def _cluster_bfs(grid: FlatGrid, source: int, bounds: Bounds, targets=()):
+    """
+    BFS a partir de source sem sair do retângulo bounds (r0, r1, c0, c1,
+    fins exclusivos). Para assim que todas as células de targets forem
+    alcançadas (ou varre o cluster inteiro, se targets for vazio).
+    Retorna (distâncias, pais), ambos dicionários indexados pela célula.
+    """
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+    W = grid.W
+    r0, r1, c0, c1 = bounds
+
+    distances = {source: 0}
+    came_from = {source: None}
+    remaining = len(targets) - (source in targets)
+    frontier = [source]
+    layer = 0
+
+    while frontier and (remaining > 0 or not targets):
+        layer += 1
+        next_frontier = []
+        push = next_frontier.append
+        for cell in frontier:
+            for offset in neighbor_offsets[cells[cell]]:
+                neighbor = cell + offset
+                if neighbor in came_from:
+                    continue
+                r, c = divmod(neighbor, W)
+                if r0 <= r < r1 and c0 <= c < c1:
+                    came_from[neighbor] = cell
+                    distances[neighbor] = layer
+                    push(neighbor)
+                    if neighbor in targets:
+                        remaining -= 1
+        frontier = next_frontier
+
+    return distances, came_from
+
+
+def _require_uniform(grid: FlatGrid):
+    # As distâncias entre entradas são contadas em passos (BFS)
+    if grid.costs is not None:
+        raise ValueError("HPA* supports only uniform step costs")
+
+
+def _walk_back(came_from: Dict[int, Optional[int]], cell: int) -> List[int]:
+    """Células de cell até a raiz da BFS, seguindo os pais."""
+    path = []
+    while cell is not None:
+        path.append(cell)
+        cell = came_from[cell]
+    return path
+
+
+class AbstractGraph:
+    """
+    Grafo abstrato do HPA* para um labirinto: as células de entrada entre
+    clusters e as distâncias entre elas. Calcule uma vez por mapa (build ou
+    load_or_build_abstract_graph) e reutilize em todas as consultas.
+    """
+
+    def __init__(self, grid: FlatGrid, cluster_size: int, nodes, offsets, targets, costs,
+                 fingerprint: Optional[str] = None):
+        self.H = grid.H
+        self.W = grid.W
+        self.cluster_size = cluster_size
+        self.nodes = nodes
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self.fingerprint = fingerprint or grid.fingerprint()
+
+        self.clusters_per_row = -(-self.W // cluster_size)
+        self._cluster_nodes = None
+
+    @classmethod
+    def build(cls, maze: Maze, cluster_size: int = DEFAULT_CLUSTER_SIZE) -> "AbstractGraph":
+        if cluster_size < 2:
+            raise ValueError("cluster_size must be at least 2")
+
+        grid = as_flat(maze)
+        _require_uniform(grid)
+        cells = grid.cells
+        H, W = grid.H, grid.W
+
+        node_of: Dict[int, int] = {}
+        nodes: List[int] = []
+        adjacency: List[Dict[int, int]] = []
+
+        def node(cell: int) -> int:
+            index = node_of.get(cell)
+            if index is None:
+                index = node_of[cell] = len(nodes)
+                nodes.append(cell)
+                adjacency.append({})
+            return index
+
+        def link(a: int, b: int, cost: int):
+            if cost < adjacency[a].get(b, cost + 1):
+                adjacency[a][b] = cost
+                adjacency[b][a] = cost
+
+        def add_entrances(first: int, count: int, step: int, bit: int, across: int):
+            # Percorre a fronteira pelo lado de dentro; bit indica passagem para o outro lado
+            run_start = None
+            for i in range(count + 1):
+                if i < count and cells[first + i * step] & bit:
+                    if run_start is None:
+                        run_start = i
+                    continue
+                if run_start is not None:
+                    last = i - 1
+                    chosen = (run_start, last) if last - run_start + 1 >= LONG_ENTRANCE else ((run_start + last) // 2,)
+                    for j in chosen:
+                        inside = first + j * step
+                        link(node(inside), node(inside + across), 1)
+                    run_start = None
+
+        # Fronteiras entre clusters lado a lado (coluna c - 1 | coluna c)
+        for c in range(cluster_size, W, cluster_size):
+            for r in range(0, H, cluster_size):
+                add_entrances(r * W + c - 1, min(cluster_size, H - r), W, DIR_L, 1)
+        # Fronteiras entre clusters um sobre o outro (linha r - 1 | linha r)
+        for r in range(cluster_size, H, cluster_size):
+            for c in range(0, W, cluster_size):
+                add_entrances((r - 1) * W + c, min(cluster_size, W - c), 1, DIR_S, W)
+
+        graph = cls(grid, cluster_size, array('I', nodes), None, None, None)
+
+        # Distâncias dentro de cada cluster entre as suas entradas
+        for cluster, members in graph.cluster_nodes().items():
+            bounds = graph.cluster_bounds(cluster)
+            for i, a in enumerate(members[:-1]):
+                others = {nodes[b]: b for b in members[i + 1:]}
+                distances, _ = _cluster_bfs(grid, nodes[a], bounds, others)
+                for cell, b in others.items():
+                    if cell in distances:
+                        link(a, b, distances[cell])
+
+        offsets = array('I', [0])
+        targets = array('I')
+        costs = array('I')
+        for edges in adjacency:
+            targets.extend(edges.keys())
+            costs.extend(edges.values())
+            offsets.append(len(targets))
+        graph.offsets, graph.targets, graph.costs = offsets, targets, costs
+        return graph
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.cluster_size, self.H, self.W,
+                                 bytes.fromhex(self.fingerprint), len(self.nodes), len(self.targets)))
+            for values in (self.nodes, self.offsets, self.targets, self.costs):
+                f.write(values.tobytes() if isinstance(values, array) else values)
+
+    @classmethod
+    def load(cls, path: str, maze: Maze) -> "AbstractGraph":
+        """
+        Carrega o grafo salvo para este labirinto, mapeando o arquivo em
+        memória (os vetores são lidos diretamente dele, sem cópia). Levanta
+        ValueError se o arquivo for de outro mapa ou se o tamanho não bater
+        com o cabeçalho (arquivo truncado).
+        """
+        grid = as_flat(maze)
+        with open(path, 'rb') as f:
+            mapped = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+        if len(mapped) < _HEADER.size:
+            raise ValueError(f"{path} is not an HPA* graph file")
+        magic, version, cluster_size, H, W, fingerprint, node_count, edge_count = _HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an HPA* graph file")
+        if fingerprint.hex() != grid.fingerprint():
+            raise ValueError(f"{path} was computed for a different maze")
+        if len(mapped) != _HEADER.size + 4 * (2 * node_count + 1 + 2 * edge_count):
+            raise ValueError(f"{path} is truncated or corrupted")
+
+        vectors = []
+        offset = _HEADER.size
+        for count in (node_count, node_count + 1, edge_count, edge_count):
+            vectors.append(mapped[offset:offset + 4 * count].cast('I'))
+            offset += 4 * count
+        return cls(grid, cluster_size, *vectors, fingerprint.hex())
+
+    def cluster_of(self, cell: int) -> int:
+        r, c = divmod(cell, self.W)
+        return (r // self.cluster_size) * self.clusters_per_row + c // self.cluster_size
+
+    def cluster_bounds(self, cluster: int) -> Bounds:
+        """Retângulo (r0, r1, c0, c1) do cluster, com fins exclusivos."""
+        row, col = divmod(cluster, self.clusters_per_row)
+        r0 = row * self.cluster_size
+        c0 = col * self.cluster_size
+        return r0, min(r0 + self.cluster_size, self.H), c0, min(c0 + self.cluster_size, self.W)
+
+    def cluster_nodes(self) -> Dict[int, List[int]]:
+        """Nós do grafo agrupados por cluster (calculado uma vez e guardado)."""
+        if self._cluster_nodes is None:
+            groups: Dict[int, List[int]] = {}
+            for index, cell in enumerate(self.nodes):
+                groups.setdefault(self.cluster_of(cell), []).append(index)
+            self._cluster_nodes = groups
+        return self._cluster_nodes
+
+
+def load_or_build_abstract_graph(maze: Maze, path: str, cluster_size: int = DEFAULT_CLUSTER_SIZE) -> AbstractGraph:
+    """
+    Usa o grafo salvo em path se for deste mapa (mesmo fingerprint e tamanho
+    de cluster); caso contrário calcula e salva, para os próximos usos.
+    """
+    if os.path.exists(path):
+        try:
+            graph = AbstractGraph.load(path, maze)
+            if graph.cluster_size == cluster_size:
+                return graph
+        except (ValueError, struct.error):
+            pass
+
+    graph = AbstractGraph.build(maze, cluster_size)
+    graph.save(path)
+    return graph
+
+
+def hpa_star_search(maze: Maze, graph: Optional[AbstractGraph] = None, collect_metrics: MetricsMode = METRICS_FULL):
+    """
+    HPA*: A* no grafo abstrato seguido do refinamento do caminho em células.
+    O grafo é pré-processamento do mapa: calcule uma vez (AbstractGraph.build
+    ou load_or_build_abstract_graph) e reutilize; sem ele, é calculado aqui.
+    Um grafo de outro mapa (ou deste antes de set_passable) levanta
+    ValueError.
+
+    nodes_expanded soma os nós abstratos expandidos (também informados em
+    abstract_nodes_expanded) e as células expandidas pelas BFS dentro dos
+    clusters; max_memory_usage é o maior entre o pico da busca abstrata e a
+    maior BFS de cluster (só no modo "full"; ver src.search.METRICS_MODES).
+    heap_pushes, stale_pops, peak_frontier e peak_visited são os da busca
+    abstrata.
+    """
+    grid = as_flat(maze)
+    mode = metrics_mode(collect_metrics)
+    full = mode == METRICS_FULL
+    if graph is None:
+        graph = AbstractGraph.build(grid)
+    elif graph.fingerprint != grid.fingerprint():
+        raise ValueError("Abstract graph was computed for a different maze")
+    _require_uniform(grid)
+
+    W = grid.W
+    start, goal = grid.start, grid.goal
+    nodes, offsets, targets, costs = graph.nodes, graph.offsets, graph.targets, graph.costs
+    cluster_nodes = graph.cluster_nodes()
+
+    cells_expanded = 0
+    peak_memory = 0
+    peak_frontier = 0
+    stale_pops = 0
+
+    def metrics(abstract_expanded: int) -> dict:
+        # order numera as inserções no heap após o início; came_from só cresce
+        return search_metrics(mode, abstract_expanded + cells_expanded, peak_memory, peak_frontier,
+                              len(came_from), abstract_nodes_expanded=abstract_expanded,
+                              heap_pushes=next(order) - 1, stale_pops=stale_pops)
+
+    # Liga início e objetivo às entradas alcançáveis dentro dos seus clusters
+    start_cluster = graph.cluster_of(start)
+    goal_cluster = graph.cluster_of(goal)
+    start_members = cluster_nodes.get(start_cluster, [])
+    goal_members = cluster_nodes.get(goal_cluster, [])
+
+    start_targets = {nodes[n] for n in start_members}
+    if start_cluster == goal_cluster:
+        start_targets.add(goal)
+    start_distances, start_parents = _cluster_bfs(grid, start, graph.cluster_bounds(start_cluster), start_targets)
+    goal_distances, goal_parents = _cluster_bfs(grid, goal, graph.cluster_bounds(goal_cluster),
+                                                {nodes[n] for n in goal_members})
+    cells_expanded += len(start_distances) + len(goal_distances)
+    peak_memory = max(len(start_distances), len(goal_distances))
+
+    start_links = [(n, start_distances[nodes[n]]) for n in start_members if nodes[n] in start_distances]
+    if goal in start_distances:
+        start_links.append((GOAL, start_distances[goal]))
+    goal_links = {n: goal_distances[nodes[n]] for n in goal_members if nodes[n] in goal_distances}
+
+    def cell_of(n: int) -> int:
+        return start if n == START else goal if n == GOAL else nodes[n]
+
+    # A* no grafo abstrato
+    goal_r, goal_c = divmod(goal, W)
+    start_r, start_c = divmod(start, W)
+    order = itertools.count(1)
+    frontier = [(abs(start_r - goal_r) + abs(start_c - goal_c), 0, 0, START)]
+    g_cost = {START: 0}
+    came_from = {START: None}
+    abstract_expanded = 0
+
+    while frontier:
+        if full:
+            if len(frontier) > peak_frontier:
+                peak_frontier = len(frontier)
+            current_memory = len(frontier) + len(came_from)
+            if current_memory > peak_memory:
+                peak_memory = current_memory
+
+        _, _, current_g, current = heapq.heappop(frontier)
+        if current_g > g_cost[current]:
+            stale_pops += 1  # Entrada desatualizada
+            continue
+        abstract_expanded += 1
+        if current == GOAL:
+            break
+
+        if current == START:
+            successors = start_links
+        else:
+            successors = list(zip(targets[offsets[current]:offsets[current + 1]],
+                                  costs[offsets[current]:offsets[current + 1]]))
+            if current in goal_links:
+                successors.append((GOAL, goal_links[current]))
+
+        for neighbor, cost in successors:
+            tentative = current_g + cost
+            if tentative < g_cost.get(neighbor, tentative + 1):
+                g_cost[neighbor] = tentative
+                came_from[neighbor] = current
+                r, c = divmod(cell_of(neighbor), W)
+                heapq.heappush(frontier, (tentative + abs(r - goal_r) + abs(c - goal_c), next(order), tentative, neighbor))
+    else:
+        return None, metrics(abstract_expanded)
+
+    abstract_path = [cell_of(n) for n in _walk_back(came_from, GOAL)]
+    abstract_path.reverse()
+
+    # Refinamento: cada aresta abstrata vira células
+    path = [start]
+    last = len(abstract_path) - 2
+    for i, (a, b) in enumerate(zip(abstract_path, abstract_path[1:])):
+        if i == 0:
+            segment = _walk_back(start_parents, b)[-2::-1]
+        elif i == last:
+            segment = _walk_back(goal_parents, a)[1:]
+        elif graph.cluster_of(a) != graph.cluster_of(b):
+            segment = [b]  # Os dois lados de uma entrada são vizinhos
+        else:
+            distances, parents = _cluster_bfs(grid, b, graph.cluster_bounds(graph.cluster_of(a)), {a})
+            cells_expanded += len(distances)
+            segment = _walk_back(parents, a)[1:]
+        path.extend(segment)
+
+    return PathHandle.on(grid, path), metrics(abstract_expanded)
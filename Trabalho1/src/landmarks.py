@@ -0,0 +1,194 @@
+#Heurística ALT (A*, Landmarks e desigualdade Triangular)
+#
+# Para cada landmark L guarda-se a distância exata d(L, n) até todas as
+# células. Pela desigualdade triangular, |d(L, objetivo) - d(L, n)| nunca
+# excede a distância real de n ao objetivo, então o maior desses valores
+# (junto com Manhattan) é uma heurística admissível e consistente, bem mais
+# informada que Manhattan em labirintos com corredores longos.
+
+import mmap
+import os
+import struct
+from array import array
+from typing import List, Optional
+
+from src.maze import Maze, Pos, FlatGrid, as_flat
+from src.search import METRICS_FULL, PRIORITY_F, MetricsMode, best_first_search
+
+UNREACHABLE = -1
+DEFAULT_LANDMARKS = 8
+
+# Arquivo de landmarks: cabeçalho (magic, versão, reservado, H, W,
+# fingerprint do mapa, quantidade), ids das landmarks (u32) e, para cada
+# landmark, as H * W distâncias (int32, ordem de bytes nativa)
+MAGIC = b'LMK1'
+VERSION = 1
+_HEADER = struct.Struct('<4sHHII16sI')
+
+
+def bfs_distances(maze: Maze, source: int) -> array:
+    """Distância em passos de source até todas as células (UNREACHABLE se não houver caminho)."""
+    grid = as_flat(maze)
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+
+    distances = array('i', [UNREACHABLE]) * (grid.H * grid.W)
+    distances[source] = 0
+    frontier = [source]
+    layer = 0
+
+    while frontier:
+        layer += 1
+        next_frontier = []
+        push = next_frontier.append
+        for cell in frontier:
+            for offset in neighbor_offsets[cells[cell]]:
+                neighbor = cell + offset
+                if distances[neighbor] < 0:
+                    distances[neighbor] = layer
+                    push(neighbor)
+        frontier = next_frontier
+
+    return distances
+
+
+class LandmarkSet:
+    """
+    Landmarks de um labirinto e as distâncias exatas de cada uma a todas as
+    células. Use heuristic como heurística h(pos, objetivo) do A*.
+    """
+
+    def __init__(self, grid: FlatGrid, landmarks: List[int], distances: list, fingerprint: Optional[str] = None):
+        self.H = grid.H
+        self.W = grid.W
+        self.landmarks = landmarks
+        self.distances = distances
+        self.fingerprint = fingerprint or grid.fingerprint()
+
+        self._goal_pos = None
+        self._goal_terms = ()
+
+    @classmethod
+    def build(cls, maze: Maze, count: int = DEFAULT_LANDMARKS) -> "LandmarkSet":
+        """
+        Escolhe as landmarks por ponto mais distante: a primeira é a célula
+        mais distante do início, e cada seguinte é a célula cuja distância à
+        landmark mais próxima é máxima. Ficam assim espalhadas pelas bordas
+        do componente do início, onde a desigualdade triangular é mais útil.
+        """
+        grid = as_flat(maze)
+        from_start = bfs_distances(grid, grid.start)
+        farthest = max(from_start)
+        if farthest <= 0:
+            return cls(grid, [], [])
+
+        landmarks = [from_start.index(farthest)]
+        distances = [bfs_distances(grid, landmarks[0])]
+        nearest = array('i', distances[0])
+
+        while len(landmarks) < count:
+            farthest = max(nearest)
+            if farthest <= 0:
+                break  # Todas as células do componente já são landmarks
+            landmark = nearest.index(farthest)
+            landmarks.append(landmark)
+            distances.append(bfs_distances(grid, landmark))
+            nearest = array('i', map(min, nearest, distances[-1]))
+
+        return cls(grid, landmarks, distances)
+
+    def save(self, path: str):
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, self.H, self.W,
+                                 bytes.fromhex(self.fingerprint), len(self.landmarks)))
+            f.write(array('I', self.landmarks).tobytes())
+            for distances in self.distances:
+                f.write(distances.tobytes() if isinstance(distances, array) else distances)
+
+    @classmethod
+    def load(cls, path: str, maze: Maze) -> "LandmarkSet":
+        """
+        Carrega as landmarks salvas para este labirinto. O arquivo é mapeado
+        em memória e as distâncias são lidas diretamente dele, sem cópia.
+        Levanta ValueError se o arquivo for de outro mapa ou se o tamanho não
+        bater com o cabeçalho (arquivo truncado).
+        """
+        grid = as_flat(maze)
+        with open(path, 'rb') as f:
+            mapped = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+        if len(mapped) < _HEADER.size:
+            raise ValueError(f"{path} is not a landmark file")
+        magic, version, _, H, W, fingerprint, count = _HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a landmark file")
+        if fingerprint.hex() != grid.fingerprint():
+            raise ValueError(f"{path} was computed for a different maze")
+        if len(mapped) != _HEADER.size + 4 * count + count * 4 * H * W:
+            raise ValueError(f"{path} is truncated or corrupted")
+
+        offset = _HEADER.size
+        landmarks = list(mapped[offset:offset + 4 * count].cast('I'))
+        offset += 4 * count
+        size = 4 * H * W
+        distances = [mapped[offset + i * size:offset + (i + 1) * size].cast('i') for i in range(count)]
+        return cls(grid, landmarks, distances, fingerprint.hex())
+
+    def _set_goal(self, goal_pos: Pos):
+        goal = goal_pos[0] * self.W + goal_pos[1]
+        # Landmarks que não alcançam o objetivo não dão nenhum limite
+        self._goal_terms = tuple(
+            (distances, distances[goal]) for distances in self.distances
+            if distances[goal] != UNREACHABLE
+        )
+        self._goal_pos = goal_pos
+
+    def heuristic(self, pos: Pos, goal_pos: Pos) -> int:
+        """max(Manhattan, |d(L, objetivo) - d(L, pos)|) sobre as landmarks."""
+        if goal_pos != self._goal_pos:
+            self._set_goal(goal_pos)
+
+        cell = pos[0] * self.W + pos[1]
+        best = abs(pos[0] - goal_pos[0]) + abs(pos[1] - goal_pos[1])
+        for distances, goal_distance in self._goal_terms:
+            d = distances[cell]
+            if d != UNREACHABLE:
+                bound = d - goal_distance if d > goal_distance else goal_distance - d
+                if bound > best:
+                    best = bound
+        return best
+
+
+def load_or_build_landmarks(maze: Maze, path: str, count: int = DEFAULT_LANDMARKS) -> LandmarkSet:
+    """
+    Usa as landmarks salvas em path se forem deste mapa (mesmo fingerprint e
+    quantidade); caso contrário calcula e salva, para os próximos usos.
+    """
+    if os.path.exists(path):
+        try:
+            landmarks = LandmarkSet.load(path, maze)
+            if len(landmarks.landmarks) == count:
+                return landmarks
+        except (ValueError, struct.error):
+            pass
+
+    landmarks = LandmarkSet.build(maze, count)
+    landmarks.save(path)
+    return landmarks
+
+
+def a_star_search_alt(maze: Maze, landmarks: Optional[LandmarkSet] = None,
+                      collect_metrics: MetricsMode = METRICS_FULL):
+    """
+    A* Search usando a heurística ALT. As landmarks são pré-processamento do
+    mapa: calcule uma vez (LandmarkSet.build ou load_or_build_landmarks) e
+    reutilize em todas as consultas; sem elas, são calculadas aqui.
+    Landmarks de outro mapa (ou deste antes de set_passable) levantam
+    ValueError: as distâncias guardadas deixariam a heurística inadmissível.
+    """
+    grid = as_flat(maze)
+    if landmarks is None:
+        landmarks = LandmarkSet.build(grid)
+    elif landmarks.fingerprint != grid.fingerprint():
+        raise ValueError("Landmarks were computed for a different maze")
+    return best_first_search(grid, PRIORITY_F, landmarks.heuristic, collect_metrics)
@@ -1,70 +1,347 @@
 #maze_representation.py
-from typing import List, Tuple
+import copy
+import hashlib
+from typing import List, Tuple, Union
 
 Grid = List[List[str]]
 Pos = Tuple[int, int]
 
+# Bits da tabela de direções abertas: cada célula ocupa um byte com um bit por
+# direção (na mesma ordem de Maze.actions) e um bit indicando se é transitável
+DIR_N = 1
+DIR_S = 2
+DIR_O = 4
+DIR_L = 8
+OPEN = 16
+
+# (ação, bit, dr, dc)
+DIRECTIONS = (
+    ('N', DIR_N, -1, 0),
+    ('S', DIR_S, 1, 0),
+    ('O', DIR_O, 0, -1),
+    ('L', DIR_L, 0, 1),
+)
+
+_DELTAS = {a: (dr, dc) for a, _, dr, dc in DIRECTIONS}
+_BITS = {a: bit for a, bit, _, _ in DIRECTIONS}
+
+# Tabela de bytes.translate: '#' -> 0 (parede), qualquer outro caractere -> 1
+_OPEN_TABLE = bytes(0 if b == ord('#') else 1 for b in range(256))
+# Custo de entrar na célula: dígitos '1'..'9' -> 1..9, parede -> 0, demais -> 1
+_COST_TABLE = bytes(
+    0 if b == ord('#') else b - ord('0') if ord('1') <= b <= ord('9') else 1
+    for b in range(256)
+)
+
+
+class FlatGrid:
+    """
+    Representação compacta do labirinto.
+    As células ficam em um vetor plano de bytes, identificadas pelo inteiro
+    id = r * W + c. Cada byte guarda o bit OPEN e os bits das direções
+    transitáveis a partir da célula, de modo que a expansão de um nó não
+    precisa validar limites nem consultar o mapa de caracteres.
+
+    Em mapas com terreno de custo variável, costs é um segundo vetor de
+    bytes com o custo de entrar em cada célula (1 a 9; 0 nas paredes). Em
+    mapas de custo uniforme costs é None e todo passo custa 1.
+    """
+
+    def __init__(self, H: int, W: int, cells, start: int, goal: int, costs=None):
+        # cells (e costs) pode ser qualquer objeto de bytes indexável: bytearray,
+        # ou um memoryview somente leitura sobre um arquivo mapeado (src/binary_maze.py)
+        self.H = H
+        self.W = W
+        self.cells = cells
+        self.costs = costs
+        self.start = start
+        self.goal = goal
+        self._open_cells = None
+        self._min_cost = None
+        # Revisão das células, compartilhada com as visões de with_endpoints:
+        # set_passable a incrementa e invalida o fingerprint guardado
+        self._revision = [0]
+        self._fingerprint = None
+        # Vetores reaproveitados pelas buscas (src.search.workspace_for), numa
+        # caixa compartilhada com as visões, mesmo as criadas antes da primeira busca
+        self._workspace = [None]
+
+        # Deslocamento do id para cada direção (N, S, O, L)
+        self.offsets = (-W, W, -1, 1)
+        # neighbor_offsets[byte da célula] -> deslocamentos dos vizinhos abertos
+        self.neighbor_offsets = tuple(
+            tuple(off for (_, bit, _, _), off in zip(DIRECTIONS, self.offsets) if mask & bit)
+            for mask in range(32)
+        )
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> "FlatGrid":
+        """
+        Monta o FlatGrid em uma única passada sobre os bytes do mapa.
+
+        As linhas (listas de caracteres, str ou bytes) são unidas em um único
+        bytes; início e objetivo saem de bytes.find, o plano de células
+        abertas de bytes.translate, e os bits de direção são calculados de
+        uma vez tratando esse plano como um inteiro grande (um byte por
+        célula): deslocar W bytes alinha cada célula com o vizinho ao norte
+        ou ao sul, deslocar 1 byte com o vizinho a oeste ou a leste.
+
+        Dígitos de 1 a 9 são células transitáveis com esse custo de entrada;
+        se o mapa não tiver nenhum custo acima de 1, costs fica None.
+        """
+        H = len(grid)
+        W = len(grid[0]) if H > 0 else 0
+        size = H * W
+
+        rows = []
+        for r, row in enumerate(grid):
+            if not isinstance(row, (bytes, bytearray)):
+                # Caracteres fora do ASCII viram '?' (transitáveis, como qualquer não-'#')
+                row = ''.join(row).encode('ascii', 'replace')
+            if len(row) < W:
+                raise ValueError(f"Row {r} has {len(row)} cells, expected {W}")
+            rows.append(row[:W])
+        data = b''.join(rows)
+
+        start = data.find(b'S')
+        goal = data.find(b'G')
+        if start < 0:
+            raise ValueError("Character S not found in the grid")
+        if goal < 0:
+            raise ValueError("Character G not found in the grid")
+
+        if b'0' in data:
+            raise ValueError("Cell cost 0 is not allowed (use 1 to 9)")
+        cost_plane = data.translate(_COST_TABLE)
+        # Sem custos acima de 1 o mapa é uniforme e as buscas usam o caminho rápido
+        costs = bytearray(cost_plane) if cost_plane.translate(None, b'\x00\x01') else None
+
+        open_plane = data.translate(_OPEN_TABLE)
+        open_cells = size - open_plane.count(0)
+
+        # Bit 0 de cada byte = célula aberta; os deslocamentos alinham os vizinhos
+        opened = int.from_bytes(open_plane, 'little')
+        row_bits = 8 * W
+        west_mask = int.from_bytes((b'\x00' + b'\x01' * (W - 1)) * H, 'little') if W else 0
+        east_mask = west_mask >> 8
+        mask = (
+            opened * OPEN
+            | ((opened << row_bits) & opened) * DIR_N
+            | ((opened >> row_bits) & opened) * DIR_S
+            | ((opened << 8) & opened & west_mask) * DIR_O
+            | ((opened >> 8) & opened & east_mask) * DIR_L
+        )
+
+        flat = cls(H, W, bytearray(mask.to_bytes(size, 'little')), start, goal, costs)
+        flat._open_cells = open_cells
+        return flat
+
+    def with_endpoints(self, start: Pos, goal: Pos) -> "FlatGrid":
+        """
+        Retorna uma visão do mesmo labirinto com outro início/objetivo.
+        As células e a tabela de vizinhos são compartilhadas, não copiadas.
+        """
+        for ch, pos in (('S', start), ('G', goal)):
+            r, c = pos
+            if not (0 <= r < self.H and 0 <= c < self.W) or not self.cells[r * self.W + c]:
+                raise ValueError(f"Position {pos} for {ch} is not a free cell")
+
+        view = copy.copy(self)
+        view.start = self.cell_id(start)
+        view.goal = self.cell_id(goal)
+        return view
+
+    def wall_stats(self) -> dict:
+        """Número de células, de células livres e de paredes, e a fração de paredes."""
+        cells = self.H * self.W
+        if self._open_cells is None:
+            # Mapas que não vieram de from_grid (ex.: formato binário) contam uma vez
+            self._open_cells = cells - bytes(self.cells).count(0)
+        walls = cells - self._open_cells
+        return {
+            "cells": cells,
+            "open": self._open_cells,
+            "walls": walls,
+            "wall_ratio": walls / cells if cells else 0.0,
+        }
+
+    def fingerprint(self) -> str:
+        """
+        Identificador do conteúdo do mapa (dimensões e células), usado para
+        validar dados pré-calculados salvos em disco. Não depende de início e
+        objetivo, então vale para todas as visões de with_endpoints. É
+        calculado uma vez por revisão das células.
+        """
+        revision = self._revision[0]
+        if self._fingerprint is not None and self._fingerprint[0] == revision:
+            return self._fingerprint[1]
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.H}x{self.W}".encode())
+        digest.update(self.cells)
+        if self.costs is not None:
+            digest.update(self.costs)
+        self._fingerprint = (revision, digest.hexdigest())
+        return self._fingerprint[1]
+
+    @property
+    def revision(self) -> int:
+        """Quantas vezes as células deste mapa (ou de uma visão dele) foram alteradas."""
+        return self._revision[0]
+
+    @property
+    def weighted(self) -> bool:
+        return self.costs is not None
+
+    @property
+    def min_cost(self) -> int:
+        """Menor custo de entrada entre as células abertas (1 em mapas uniformes)."""
+        if self._min_cost is None:
+            self._min_cost = min(bytes(self.costs).translate(None, b'\x00'), default=1) if self.costs is not None else 1
+        return self._min_cost
+
+    def step_cost(self, cell: int) -> int:
+        """Custo de entrar em cell vindo de uma célula vizinha."""
+        return self.costs[cell] if self.costs is not None else 1
+
+    def set_passable(self, cell: int, passable: bool) -> bool:
+        """
+        Abre ou fecha uma célula, atualizando os bits de direção dela e dos
+        vizinhos (uma célula aberta num mapa com terreno custa 1). Células
+        somente leitura (memoryview de um arquivo mapeado) são copiadas para
+        um bytearray na primeira alteração; as visões de with_endpoints
+        criadas antes disso continuam com as células antigas. Retorna False
+        se a célula já estava nesse estado.
+        """
+        if bool(self.cells[cell]) == passable:
+            return False
+        if not passable and cell in (self.start, self.goal):
+            raise ValueError(f"Cannot close the start or goal cell {self.pos_of(cell)}")
+        if not isinstance(self.cells, bytearray):
+            self.cells = bytearray(self.cells)
+        cells = self.cells
+
+        r, c = divmod(cell, self.W)
+        mask = OPEN if passable else 0
+        for (_, bit, dr, dc), opposite in zip(DIRECTIONS, (DIR_S, DIR_N, DIR_L, DIR_O)):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.H and 0 <= nc < self.W and cells[nr * self.W + nc]:
+                neighbor = nr * self.W + nc
+                if passable:
+                    mask |= bit
+                    cells[neighbor] |= opposite
+                else:
+                    cells[neighbor] &= ~opposite
+        cells[cell] = mask
+
+        if self.costs is not None:
+            if not isinstance(self.costs, bytearray):
+                self.costs = bytearray(self.costs)
+            self.costs[cell] = 1 if passable else 0
+            self._min_cost = None
+        if self._open_cells is not None:
+            self._open_cells += 1 if passable else -1
+        self._revision[0] += 1
+        return True
+
+    def cell_id(self, pos: Pos) -> int:
+        r, c = pos
+        return r * self.W + c
+
+    def pos_of(self, cell: int) -> Pos:
+        return divmod(cell, self.W)
+
+    def passable(self, cell: int) -> bool:
+        return self.cells[cell] != 0
+
+    def neighbors(self, cell: int) -> Tuple[int, ...]:
+        return tuple(cell + off for off in self.neighbor_offsets[self.cells[cell]])
+
+
 class Maze:
-   
-    
-    def __init__(self, grid: Grid):
-
-        print("Mapa carregado:")
-        for linha in grid:
-            print("".join(linha))
-    
-        self.grid = grid
-        self.H = len(grid)
-        self.W = len(grid[0]) if self.H > 0 else 0
-        self.start = self._find('S')
-        self.goal = self._find('G')
-        
-    def _find(self, ch:str) -> Pos:
-        for r in range(self.H):
-            for c in range(self.W):
-                if self.grid[r][c] == ch:
-                    return (r, c)
-        raise ValueError(f"Character {ch} not found in the grid")
-    
+    """
+    Visão baseada em tuplas (r, c) sobre um FlatGrid.
+    Mantém a API original (actions/result/step_cost/goal_test) para quem
+    trabalha com posições, enquanto as buscas usam diretamente self.flat.
+    """
+
+    def __init__(self, grid: Grid, verbose: bool = False):
+
+        # Imprimir o mapa é só para depuração: em mapas grandes custa mais que a busca
+        if verbose:
+            print("Mapa carregado:")
+            for linha in grid:
+                print(linha.decode() if isinstance(linha, (bytes, bytearray)) else "".join(linha))
+
+        self._grid = grid
+        self._set_flat(FlatGrid.from_grid(grid))
+
+    @classmethod
+    def from_flat(cls, flat: FlatGrid) -> "Maze":
+        """Cria o Maze direto de um FlatGrid (ex.: carregado do formato binário), sem copiar as células."""
+        maze = cls.__new__(cls)
+        maze._grid = None
+        maze._set_flat(flat)
+        return maze
+
+    def _set_flat(self, flat: FlatGrid):
+        self.flat = flat
+        self.H = flat.H
+        self.W = flat.W
+        self.start = flat.pos_of(flat.start)
+        self.goal = flat.pos_of(flat.goal)
+
+    @property
+    def grid(self) -> Grid:
+        # Mapa de caracteres, reconstruído sob demanda quando o Maze veio de um FlatGrid
+        if self._grid is None:
+            cells = self.flat.cells
+            W = self.W
+            costs = self.flat.costs
+            self._grid = [
+                [('.' if costs is None or costs[r * W + c] == 1 else str(costs[r * W + c])) if cells[r * W + c] else '#'
+                 for c in range(W)]
+                for r in range(self.H)
+            ]
+            self._grid[self.start[0]][self.start[1]] = 'S'
+            self._grid[self.goal[0]][self.goal[1]] = 'G'
+        return self._grid
+
+    def set_passable(self, pos: Pos, passable: bool) -> bool:
+        """Abre ou fecha a célula pos (FlatGrid.set_passable); o mapa de caracteres é refeito sob demanda."""
+        changed = self.flat.set_passable(self.flat.cell_id(pos), passable)
+        if changed:
+            self._grid = None
+        return changed
+
     def in_bounds(self, pos: Pos) -> bool:
         r, c = pos
         return 0 <= r < self.H and 0 <= c < self.W
-    
+
     def passable(self, pos: Pos) -> bool:
         r, c = pos
-        return self.grid[r][c] != '#'
-    
+        return self.flat.cells[r * self.W + c] != 0
+
     def actions(self, p: Pos):
         # Retorna as ações possíveis a partir da posição p
-        acts = []
         r, c = p
-        candidates = {
-            'N': (r-1, c),
-            'S': (r+1, c),
-            'O': (r, c-1),
-            'L': (r, c+1)
-        }
-        for a, q in candidates.items():
-            if self.in_bounds(q) and self.passable(q):
-                acts.append(a)
-        return acts
-    
+        mask = self.flat.cells[r * self.W + c]
+        return [a for a, bit, _, _ in DIRECTIONS if mask & bit]
+
     def result(self, p:Pos, a:str) -> Pos:
         r, c = p
-        delta = {
-            'N': (-1, 0),
-            'S': (1, 0),
-            'O': (0, -1),
-            'L': (0, 1)}
-        dr, dc = delta[a]
-        q = (r + dr, c + dc)
-        if not (self.in_bounds(q) and self.passable(q)):
+        if not self.flat.cells[r * self.W + c] & _BITS[a]:
             raise ValueError(f"Action {a} from position {p} is not valid")
-        return q
-    
+        dr, dc = _DELTAS[a]
+        return (r + dr, c + dc)
+
     def step_cost(self, p:Pos, a:str, q:Pos) -> float:
-        return 1.0  # Custo uniforme para cada passo
-    
+        # Custo de entrar em q: 1 em mapas uniformes, o dígito da célula em terrenos com custo
+        return float(self.flat.step_cost(q[0] * self.W + q[1]))
+
     def goal_test(self, p:Pos) -> bool:
         return p == self.goal
-    
+
+
+def as_flat(maze: Union[Maze, FlatGrid]) -> FlatGrid:
+    """Permite que as buscas recebam tanto um Maze quanto um FlatGrid."""
+    return maze if isinstance(maze, FlatGrid) else maze.flat
@@ -0,0 +1,166 @@
+#Cache de resultados de busca: (mapa, algoritmo, modo de métricas, início, objetivo) -> caminho
+#
+# A chave começa pelo fingerprint do mapa (hash do conteúdo das células),
+# então um mapa alterado (FlatGrid.set_passable) ou outro mapa com as mesmas
+# dimensões nunca reaproveita um caminho antigo: as entradas velhas apenas
+# deixam de ser consultadas e saem pelo LRU. Os caminhos ficam guardados
+# como vetores de ids de célula (u32, o mesmo vetor do PathHandle). O modo de
+# métricas (src.search.METRICS_MODES) entra na chave para que uma consulta
+# "full" nunca receba as métricas vazias de uma busca feita em "off".
+
+import base64
+import json
+import os
+from array import array
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from src.maze import Maze, as_flat
+from src.path_handle import PathHandle
+from src.search import METRICS_FULL, MetricsMode, metrics_mode
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ENTRY_OVERHEAD = 256  # Estimativa dos bytes fixos de uma entrada (chave, métricas, objetos)
+
+# Arquivo do cache: JSON com a versão e as entradas, da menos para a mais
+# recentemente usada; cada caminho é o vetor de ids (u32, ordem de bytes
+# nativa) em base64
+FORMAT_VERSION = 2
+
+CacheKey = Tuple[str, str, str, int, int]  # (fingerprint, algoritmo, modo de métricas, início, objetivo)
+
+
+class PathCache:
+    """
+    Cache LRU de (caminho, métricas) limitado por número de entradas e por
+    bytes (estimados: os ids do caminho mais ENTRY_OVERHEAD por entrada).
+
+        cache = PathCache(path="data/caminhos.json")
+        path, metrics = cache.search(maze, a_star_search)
+        cache.save()
+
+    Com path, o cache é carregado desse arquivo na criação (um arquivo
+    inválido é ignorado) e save() grava de volta. hits, misses e
+    evictions contam acertos, falhas e descartes.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 path: Optional[str] = None):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+
+        self._entries: "OrderedDict[CacheKey, tuple]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path is not None and os.path.exists(path):
+            try:
+                self.load(path)
+            except (ValueError, KeyError, TypeError):
+                self.clear()  # Arquivo inválido ou de outra versão: recomeça vazio
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def search(self, maze: Maze, search_function: Callable, name: Optional[str] = None,
+               collect_metrics: MetricsMode = METRICS_FULL):
+        """
+        Retorna (caminho, métricas) do cache ou executa
+        search_function(maze, collect_metrics=...) e guarda o resultado.
+        name identifica o algoritmo na chave (padrão: o nome da função;
+        obrigatório para lambdas e partials), e o modo de métricas também
+        faz parte dela. Num acerto, as métricas são as da busca original.
+        """
+        if name is None:
+            name = getattr(search_function, '__name__', '<lambda>')
+            if name == '<lambda>':
+                raise ValueError("name is required for anonymous search functions")
+
+        mode = metrics_mode(collect_metrics)
+        grid = as_flat(maze)
+        key = (grid.fingerprint(), name, mode, grid.start, grid.goal)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            cells, metrics, _ = entry
+            return (None if cells is None else PathHandle.on(grid, cells)), dict(metrics)
+
+        self.misses += 1
+        path, metrics = search_function(maze, collect_metrics=mode)
+        if path is None:
+            cells = None
+        elif isinstance(path, PathHandle):
+            cells = path.cells
+        else:
+            W = grid.W
+            cells = array('I', [r * W + c for r, c in path])
+        self._store(key, cells, dict(metrics))
+        return path, metrics
+
+    def _store(self, key: CacheKey, cells: Optional[array], metrics: dict):
+        size = ENTRY_OVERHEAD + (cells.itemsize * len(cells) if cells is not None else 0)
+        if size > self.max_bytes:
+            return  # Maior que o cache inteiro: não é guardado
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[2]
+        self._entries[key] = (cells, metrics, size)
+        self.bytes += size
+
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path: Optional[str] = None):
+        """Grava as entradas em path (padrão: o arquivo do construtor), substituindo o arquivo de uma vez."""
+        path = path or self.path
+        if path is None:
+            raise ValueError("No cache file given")
+
+        entries = [
+            [fingerprint, name, mode, start, goal,
+             None if cells is None else base64.b64encode(cells.tobytes()).decode('ascii'), metrics]
+            for (fingerprint, name, mode, start, goal), (cells, metrics, _) in self._entries.items()
+        ]
+        temporary = path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({"version": FORMAT_VERSION, "entries": entries}, f)
+        os.replace(temporary, path)
+
+    def load(self, path: str):
+        """Acrescenta as entradas salvas em path, respeitando os limites do cache."""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a path cache file")
+
+        for fingerprint, name, mode, start, goal, encoded, metrics in data["entries"]:
+            cells = None
+            if encoded is not None:
+                cells = array('I')
+                cells.frombytes(base64.b64decode(encoded))
+            self._store((fingerprint, name, mode, start, goal), cells, metrics)
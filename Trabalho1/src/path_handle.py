@@ -0,0 +1,134 @@
+#Representação compacta do caminho devolvido pelas buscas
+#
+# Em vez de uma lista de tuplas (r, c), o caminho é um vetor de ids de célula
+# (u32, 4 bytes por passo). O custo é calculado na criação, com os custos do
+# mapa naquele momento, e o comprimento sai direto do vetor; as posições são
+# geradas sob demanda, e o caminho pode ser exportado como uma
+# sequência de movimentos N/S/O/L compactada por repetição ("3L2S1N").
+
+import re
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from src.maze import FlatGrid, Maze, Pos, as_flat
+
+_MOVE_RUN = re.compile(r'(\d+)([NSOL])')
+
+
+class PathHandle:
+    """
+    Caminho do início ao objetivo guardado como ids de célula.
+
+        len(path)          # número de células (passos + 1)
+        path.cost          # custo do caminho no mapa em que foi encontrado, quando foi encontrado
+        path[0], path[-1]  # posições (r, c), calculadas na hora
+        for pos in path:   # percorre as posições sem montar uma lista
+        path.moves()       # "3L2S1N": movimentos compactados
+
+    Comporta-se como uma sequência de posições: compara igual a uma lista
+    com as mesmas tuplas, e fatias devolvem listas. list(path) monta a
+    lista completa quando ela for realmente necessária.
+    """
+
+    __slots__ = ('cells', 'W', 'cost')
+
+    def __init__(self, cells: array, W: int, cost: int):
+        self.cells = cells
+        self.W = W
+        self.cost = cost
+
+    @classmethod
+    def on(cls, grid: FlatGrid, cells: Iterable[int], cost: Optional[int] = None) -> "PathHandle":
+        """
+        Caminho com os ids cells (iterável de inteiros) sobre o mapa grid.
+        cost é o custo já conhecido pela busca (g no objetivo); sem ele, é
+        somado agora: len - 1 em custo uniforme, senão os custos de entrada.
+        Assim o custo não muda se o mapa for alterado depois (set_passable).
+        """
+        if not isinstance(cells, array):
+            cells = array('I', cells)
+        if cost is None:
+            costs = grid.costs
+            if costs is None:
+                cost = len(cells) - 1
+            else:
+                cost = sum(costs[cells[i]] for i in range(1, len(cells)))
+        return cls(cells, grid.W, cost)
+
+    @classmethod
+    def from_moves(cls, maze: Maze, start: Pos, moves: str) -> "PathHandle":
+        """Reconstrói o caminho a partir do início e de uma sequência de moves()."""
+        grid = as_flat(maze)
+        steps = {'N': -grid.W, 'S': grid.W, 'O': -1, 'L': 1}
+        cell = grid.cell_id(start)
+        cells = array('I', [cell])
+        position = 0
+        for match in _MOVE_RUN.finditer(moves):
+            if match.start() != position:
+                break
+            position = match.end()
+            step = steps[match.group(2)]
+            for _ in range(int(match.group(1))):
+                cell += step
+                cells.append(cell)
+        if position != len(moves):
+            raise ValueError(f"Invalid move string: {moves!r}")
+        return cls.on(grid, cells)
+
+    def moves(self) -> str:
+        """Movimentos N/S/O/L do início ao objetivo, cada um precedido do número de repetições."""
+        W = self.W
+        names = {-W: 'N', W: 'S', -1: 'O', 1: 'L'}
+        runs = []
+        cells = self.cells
+        previous_step, count = None, 0
+        for i in range(1, len(cells)):
+            step = cells[i] - cells[i - 1]
+            if step == previous_step:
+                count += 1
+                continue
+            if count:
+                runs.append(f"{count}{names[previous_step]}")
+            previous_step, count = step, 1
+        if count:
+            runs.append(f"{count}{names[previous_step]}")
+        return "".join(runs)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[Pos]:
+        W = self.W
+        for cell in self.cells:
+            yield divmod(cell, W)
+
+    def __reversed__(self) -> Iterator[Pos]:
+        W = self.W
+        for cell in reversed(self.cells):
+            yield divmod(cell, W)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [divmod(cell, self.W) for cell in self.cells[index]]
+        return divmod(self.cells[index], self.W)
+
+    def __contains__(self, pos) -> bool:
+        r, c = pos
+        return 0 <= c < self.W and r * self.W + c in self.cells
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PathHandle):
+            return self.W == other.W and self.cells == other.cells
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self.cells) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (PathHandle, (self.cells, self.W, self.cost))
+
+    def __repr__(self) -> str:
+        if not self.cells:
+            return "PathHandle([])"
+        return f"PathHandle({self[0]} -> {self[-1]}, {len(self)} células, custo {self.cost})"
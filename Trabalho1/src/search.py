@@ -1,322 +1,1202 @@
 #Implementação das buscas (BFS,DFS,A*, Gulosa pelo menor custo)
 
 import heapq
-from typing import Dict , List, Tuple, Optional
+import itertools
+from array import array
+from collections import deque
+from typing import Callable, Dict, List, Tuple, Optional, Union
 
-from src.maze import Maze, Pos
+from src.maze import DIR_L, DIR_N, DIR_O, DIR_S, FlatGrid, Maze, Pos, as_flat
 from src.heuristics import manhattan_distance, euclidean_distance
+from src.path_handle import PathHandle
 
+Heuristic = Callable[[Pos, Pos], float]
 
-# Função para reconstruir o caminho do início ao objetivo
-def reconstruct_path(came_from: Dict[Pos, Optional[Pos]], start: Pos, goal: Pos):
-    
-    path = []
-    current = goal
-    while current is not None:
-        path.append(current)
-        current = came_from.get(current)
-    path.reverse()
-    return path
-
-
-
-def a_star_search(maze: Maze ):
+# Políticas de fronteira aceitas por best_first_search
+FIFO = "fifo"          # Fila: busca em largura
+LIFO = "lifo"          # Pilha: busca em profundidade
+PRIORITY_G = "g"       # Heap ordenado por g(n): custo uniforme
+PRIORITY_H = "h"       # Heap ordenado por h(n): busca gulosa
+PRIORITY_F = "g+h"     # Heap ordenado por g(n) + h(n): A*
 
-    start_node = maze.start
-    goal_node = maze.goal
+POLICIES = (FIFO, LIFO, PRIORITY_G, PRIORITY_H, PRIORITY_F)
 
+# Modos de coleta de métricas (parâmetro collect_metrics das buscas)
+METRICS_OFF = "off"            # Nenhuma métrica devolvida; o laço não mede picos
+METRICS_COUNTERS = "counters"  # Contadores baratos: nós expandidos, inserções no heap, entradas descartadas
+METRICS_FULL = "full"          # Contadores e picos de memória, medidos a cada iteração
 
-    nodes_expanded = 0
-    max_memory_usage = 0
-
+METRICS_MODES = (METRICS_OFF, METRICS_COUNTERS, METRICS_FULL)
 
-    frontier = []
+MetricsMode = Union[bool, str]
 
+NO_PARENT = -1
 
 
-    f_start = manhattan_distance(start_node, goal_node)
-    heapq.heappush(frontier, (f_start, start_node))
-
-
-
-    came_from: Dict[Pos, Pos] = {start_node: None}
-
-
-    g_cost: Dict[Pos, int] = {start_node: 0}
-
-    while frontier:
-
-        current_memory = len(frontier) + len(g_cost)
-        if current_memory > max_memory_usage:
-            max_memory_usage = current_memory
+class SearchWorkspace:
+    """
+    Vetores pré-alocados, um item por célula, reaproveitados entre buscas no
+    mesmo mapa: pai, custo g e dois carimbos de geração (alcançado e
+    expandido). Cada busca começa com begin(), que apenas incrementa a
+    geração: um valor de parent/g só vale se seen[célula] == geração, então
+    não há nada a limpar entre consultas e nenhum objeto Python é criado
+    por nó. Um workspace atende uma busca por vez.
+    """
 
-        
-        _, current_node = heapq.heappop(frontier)
-        nodes_expanded += 1
+    def __init__(self, size: int):
+        self.size = size
+        self.parent = array('i', [NO_PARENT]) * size
+        self.g = array('i', [0]) * size
+        self.seen = array('I', [0]) * size
+        self.closed = array('I', [0]) * size
+        self.generation = 0
+
+    def begin(self) -> int:
+        """Inicia uma nova busca e retorna o carimbo dela."""
+        self.generation += 1
+        if self.generation == 2 ** 32:
+            # Carimbos esgotados: zera os vetores uma vez e recomeça
+            self.seen = array('I', [0]) * self.size
+            self.closed = array('I', [0]) * self.size
+            self.generation = 1
+        return self.generation
+
+    def path_to(self, goal: int, grid: FlatGrid, cost: Optional[int] = None) -> PathHandle:
+        """Caminho do início até goal seguindo os pais da busca atual (cost: g em goal, se conhecido)."""
+        parent = self.parent
+        path = array('I')
+        current = goal
+        while current != NO_PARENT:
+            path.append(current)
+            current = parent[current]
+        path.reverse()
+        return PathHandle.on(grid, path, cost)
+
+
+def metrics_mode(collect_metrics: MetricsMode) -> str:
+    """
+    Normaliza o parâmetro collect_metrics das buscas para um de
+    METRICS_MODES. Os valores booleanos antigos continuam aceitos: True
+    equivale a "full" e False a "counters".
+    """
+    if collect_metrics is True:
+        return METRICS_FULL
+    if collect_metrics is False:
+        return METRICS_COUNTERS
+    if collect_metrics not in METRICS_MODES:
+        raise ValueError(f"Unknown metrics mode: {collect_metrics}")
+    return collect_metrics
 
 
-        if maze.goal_test(current_node):
-            path = reconstruct_path(came_from, start_node, goal_node)
-            metrics = {
-                "nodes_expanded": nodes_expanded,
-                "max_memory_usage": max_memory_usage
-            }
-            return path, metrics
-        
-        for action in maze.actions(current_node):
+def workspace_for(grid: FlatGrid) -> SearchWorkspace:
+    """
+    Workspace padrão do mapa, criado na primeira busca e guardado no
+    FlatGrid; todas as visões de with_endpoints o compartilham.
+    """
+    box = grid._workspace
+    workspace = box[0]
+    if workspace is None or workspace.size != grid.H * grid.W:
+        workspace = box[0] = SearchWorkspace(grid.H * grid.W)
+    return workspace
 
-            neighbor_node = maze.result(current_node, action)
 
-            # Custo do caminho até o nó vizinho
-            step_cost = maze.step_cost(current_node, action, neighbor_node)
-            g_cost_tentative = g_cost[current_node] + step_cost
-            
-            # Se o nó vizinho não foi visitado ou se encontramos um caminho mais barato
-            if neighbor_node not in g_cost or g_cost_tentative < g_cost[neighbor_node]:
+# Função para reconstruir o caminho do início ao objetivo
+def reconstruct_path(came_from: Dict[int, Optional[int]], start: int, goal: int):
 
-                came_from[neighbor_node] = current_node
-                g_cost[neighbor_node] = g_cost_tentative
+    path = []
+    current = goal
+    while current is not None:
+        path.append(current)
+        current = came_from.get(current)
+    path.reverse()
+    return path
 
-                f_cost = g_cost_tentative + manhattan_distance(neighbor_node, goal_node)
-                heapq.heappush(frontier, (f_cost, neighbor_node))
-        
-    metrics = {
-        "nodes_expanded": nodes_expanded,
-        "max_memory_usage": max_memory_usage
-    }
 
-    return None, metrics
+def path_cost(maze: Maze, path: Optional[List[Pos]]):
+    """
+    Custo de um caminho (PathHandle ou lista de posições): a soma dos custos
+    de entrada de cada célula depois da primeira, ou len(path) - 1 em mapas
+    de custo uniforme. Retorna "N/A" se não houver caminho.
+    """
+    if not path:
+        return "N/A"
+    if isinstance(path, PathHandle):
+        return path.cost
+    grid = as_flat(maze)
+    if grid.costs is None:
+        return len(path) - 1
+    costs = grid.costs
+    W = grid.W
+    return sum(costs[r * W + c] for r, c in path[1:])
+
+
+def _scaled_heuristic(heuristic: Optional[Heuristic], grid: FlatGrid) -> Optional[Heuristic]:
+    """
+    As heurísticas medem passos; em terreno com custo, multiplicá-las pelo
+    menor custo de passo do mapa mantém h admissível e consistente.
+    """
+    scale = grid.min_cost
+    if heuristic is None or scale == 1:
+        return heuristic
+    return lambda pos, goal_pos: heuristic(pos, goal_pos) * scale
 
 
+def _require_uniform(grid: FlatGrid, name: str):
+    if grid.costs is not None:
+        raise ValueError(f"{name} supports only uniform step costs")
 
-def dfs( maze: Maze):
 
-    start_node = maze.start
-    goal_node = maze.goal
+def best_first_search(
+    maze: Maze,
+    policy: str = PRIORITY_F,
+    heuristic: Optional[Heuristic] = manhattan_distance,
+    collect_metrics: MetricsMode = METRICS_FULL,
+    workspace: Optional[SearchWorkspace] = None
+):
+    """
+    Motor genérico de busca em grafo sobre o FlatGrid do labirinto.
+
+    A política define a fronteira (FIFO, LIFO ou heap por g, h ou g+h) e a
+    heurística é qualquer função h(pos, objetivo). Nas políticas FIFO, LIFO
+    e h o nó é marcado como visitado ao ser gerado; nas políticas g e g+h
+    o custo do vizinho é relaxado sempre que um caminho mais barato aparece.
+
+    Nas políticas g e g+h cada melhoria empilha uma nova entrada (remoção
+    preguiçosa): ao sair do heap, uma entrada com g maior que o melhor
+    conhecido é descartada sem expandir (stale_pops), e um nó já expandido
+    que volta com custo menor (só com heurística inconsistente) conta como
+    reexpansão (reexpansions). Empates em f são desfeitos pelo menor h (o
+    mais próximo do objetivo, ou seja, maior g) e depois pela ordem de
+    inserção, sem comparar ids de células.
+
+    Em mapas com terreno de custo (FlatGrid.costs), g soma o custo de
+    entrada de cada célula e a heurística é escalada pelo menor custo de
+    passo do mapa; FIFO, LIFO e h ignoram os custos (menor número de passos
+    ou ordem da heurística).
+
+    Pais, custos e marcas de visitado ficam no SearchWorkspace (por padrão o
+    do próprio mapa, workspace_for), sem dicionários por consulta.
+
+    collect_metrics escolhe as métricas (METRICS_MODES, search_metrics):
+    "off" devolve um dicionário vazio; "counters" traz nodes_expanded e, nas
+    políticas de heap, heap_pushes (e stale_pops e reexpansions nas
+    políticas g e g+h); "full" acrescenta os picos medidos a cada iteração:
+    max_memory_usage (fronteira + alcançados), peak_frontier e
+    peak_visited. "off" só deixa de medir os picos: os contadores são somas
+    de inteiros que custam o mesmo que testar o modo, e seguem no laço.
+
+    Retorna (caminho, métricas), com caminho = None se o objetivo não for
+    alcançável.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown frontier policy: {policy}")
+
+    grid = as_flat(maze)
+    mode = metrics_mode(collect_metrics)
+    full = mode == METRICS_FULL
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+    W = grid.W
+    start_node = grid.start
+    goal_node = grid.goal
+    goal_pos = grid.pos_of(goal_node)
+
+    uses_heap = policy in (PRIORITY_G, PRIORITY_H, PRIORITY_F)
+    relax = policy in (PRIORITY_G, PRIORITY_F)
+    h = heuristic if policy in (PRIORITY_H, PRIORITY_F) else None
+    if policy != PRIORITY_G and uses_heap and h is None:
+        raise ValueError(f"Policy {policy} requires a heuristic")
+    if relax:
+        h = _scaled_heuristic(h, grid)
+    step_costs = grid.costs
+
+    if workspace is None:
+        workspace = workspace_for(grid)
+    generation = workspace.begin()
+    parent = workspace.parent
+    g_cost = workspace.g
+    seen = workspace.seen
+    closed = workspace.closed
+
+    heappush = heapq.heappush
+    heappop = heapq.heappop
 
     nodes_expanded = 0
     max_memory_usage = 0
+    peak_frontier = 0
+    stale_pops = 0
+    reexpansions = 0
+
+    if policy == FIFO:
+        frontier = deque([start_node])
+        pop = frontier.popleft
+    elif policy == LIFO:
+        frontier = [start_node]
+        pop = frontier.pop
+    else:
+        h_start = h(grid.pos_of(start_node), goal_pos) if h else 0
+        # Nas políticas g e g+h: (f, h, ordem de inserção, g, nó)
+        frontier = [(h_start, h_start, 0, 0, start_node)] if relax else [(h_start, start_node)]
+    push = frontier.append
+    order = itertools.count(1)
+
+    seen[start_node] = generation
+    parent[start_node] = NO_PARENT
+    g_cost[start_node] = 0
+    reached = 1  # Nós marcados nesta busca (o antigo len(came_from))
+
+    def finish() -> dict:
+        # Alcançados só crescem: o pico de visitados é o total
+        if relax:
+            counters = {"heap_pushes": next(order) - 1,  # order numera as inserções após o início
+                        "stale_pops": stale_pops, "reexpansions": reexpansions}
+        elif uses_heap:
+            counters = {"heap_pushes": reached - 1}  # Cada nó alcançado entra no heap uma única vez
+        else:
+            counters = {}
+        return search_metrics(mode, nodes_expanded, max_memory_usage, peak_frontier, reached, **counters)
 
-    frontier: List[Pos] = [start_node]
+    while frontier:
 
-    came_from: Dict[Pos, Optional[Pos]] = {start_node: None}
+        if full:
+            frontier_size = len(frontier)
+            if frontier_size > peak_frontier:
+                peak_frontier = frontier_size
+            if frontier_size + reached > max_memory_usage:
+                max_memory_usage = frontier_size + reached
+
+        if relax:
+            _, _, _, current_g, current_node = heappop(frontier)
+            if current_g > g_cost[current_node]:
+                stale_pops += 1  # Entrada desatualizada: já existe caminho mais barato
+                continue
+            if closed[current_node] == generation:
+                reexpansions += 1
+            closed[current_node] = generation
+        elif uses_heap:
+            _, current_node = heappop(frontier)
+        else:
+            current_node = pop()
+        nodes_expanded += 1
 
-    while frontier:
+        if current_node == goal_node:
+            return workspace.path_to(goal_node, grid, current_g if relax else None), finish()
+
+        if relax:
+            # Custo uniforme: todos os vizinhos recebem o mesmo g; com terreno,
+            # g soma o custo de entrar no vizinho (Maze.step_cost)
+            g_cost_tentative = current_g + 1
+            for offset in neighbor_offsets[cells[current_node]]:
+                neighbor_node = current_node + offset
+                if step_costs is not None:
+                    g_cost_tentative = current_g + step_costs[neighbor_node]
+                # Se o nó vizinho não foi visitado ou se encontramos um caminho mais barato
+                if seen[neighbor_node] != generation:
+                    seen[neighbor_node] = generation
+                    reached += 1
+                elif g_cost_tentative >= g_cost[neighbor_node]:
+                    continue
+                parent[neighbor_node] = current_node
+                g_cost[neighbor_node] = g_cost_tentative
+                h_cost = h(divmod(neighbor_node, W), goal_pos) if h else 0
+                heappush(frontier, (g_cost_tentative + h_cost, h_cost, next(order), g_cost_tentative, neighbor_node))
+
+        elif uses_heap:
+            for offset in neighbor_offsets[cells[current_node]]:
+                neighbor_node = current_node + offset
+                if seen[neighbor_node] != generation:
+                    seen[neighbor_node] = generation
+                    parent[neighbor_node] = current_node
+                    reached += 1
+                    # Usa apenas a heurística h(n), sem custo acumulado
+                    heappush(frontier, (h(divmod(neighbor_node, W), goal_pos), neighbor_node))
+
+        else:
+            for offset in neighbor_offsets[cells[current_node]]:
+                neighbor_node = current_node + offset
+                if seen[neighbor_node] != generation:
+                    seen[neighbor_node] = generation
+                    parent[neighbor_node] = current_node
+                    reached += 1
+                    push(neighbor_node)
+
+    return None, finish()
+
+
+def _budget_exhausted(metrics: dict) -> dict:
+    """Marca nas métricas (se houver) que a busca desistiu por orçamento, e não por falta de caminho."""
+    if metrics:
+        metrics["budget_exhausted"] = True
+    return metrics
+
+
+def search_metrics(mode: str, nodes_expanded: int, max_memory_usage: int = 0,
+                   peak_frontier: int = 0, peak_visited: int = 0, **counters) -> dict:
+    """
+    Dicionário de métricas de uma busca, no mesmo formato para todas:
+    "off" -> {}; "counters" -> nodes_expanded e os contadores da busca
+    (heap_pushes, stale_pops...); "full" -> também os picos max_memory_usage,
+    peak_frontier e peak_visited.
+    """
+    if mode == METRICS_OFF:
+        return {}
+    metrics = {"nodes_expanded": nodes_expanded}
+    if mode == METRICS_FULL:
+        metrics["max_memory_usage"] = max_memory_usage
+        metrics["peak_frontier"] = peak_frontier
+        metrics["peak_visited"] = peak_visited
+    metrics.update(counters)
+    return metrics
 
-        current_memory = len(frontier) + len(came_from)
-        
-        if current_memory > max_memory_usage:
-            max_memory_usage = current_memory
 
-        current_node = frontier.pop()
-        nodes_expanded += 1
+def a_star_search(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """A* Search usando heurística Manhattan"""
+    return best_first_search(maze, PRIORITY_F, manhattan_distance, collect_metrics)
 
-        if maze.goal_test(current_node):
-            path = reconstruct_path(came_from, start_node, goal_node)
-            metrics = {
-                "nodes_expanded": nodes_expanded,
-                "max_memory_usage": max_memory_usage
-            }
-            return path, metrics
-        
-        for action in maze.actions(current_node):
-            neighbor_node = maze.result(current_node, action)
 
-            if neighbor_node not in came_from:
-                came_from[neighbor_node] = current_node
-                frontier.append(neighbor_node)
-        
-    metrics = {
-        "nodes_expanded": nodes_expanded,
-        "max_memory_usage": max_memory_usage
-    }  
+def dijkstra_search(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """
+    Dijkstra (busca de custo uniforme)
+    Heap ordenado só por g(n), sem heurística: expande as células em ordem
+    de custo acumulado e garante o caminho de menor custo também em
+    terrenos com custo variável.
+    """
+    return best_first_search(maze, PRIORITY_G, None, collect_metrics)
 
-    return None, metrics
+
+def dfs(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """
+    Depth-First Search - Busca em profundidade
+    Usa uma pilha (LIFO): sempre expande o nó gerado mais recentemente.
+    """
+    return best_first_search(maze, LIFO, None, collect_metrics)
 
 
-def bfs(maze: Maze):
+def bfs(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
     """
     Breadth-First Search - Busca em largura
     Explora todos os nós em um nível antes de passar para o próximo nível.
     Garante encontrar o caminho mais curto em termos de número de passos.
     """
-    start_node = maze.start
-    goal_node = maze.goal
+    return best_first_search(maze, FIFO, None, collect_metrics)
 
-    nodes_expanded = 0
-    max_memory_usage = 0
 
-    # BFS usa uma fila (FIFO) ao invés de pilha
-    frontier = [start_node]  # Lista que será tratada como fila
-    came_from: Dict[Pos, Optional[Pos]] = {start_node: None}
+def bfs_level_synchronous(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL,
+                          workspace: Optional[SearchWorkspace] = None):
+    """
+    BFS síncrona por níveis
+    Expande a fronteira inteira de um nível de uma vez, gerando a lista do
+    próximo nível; não há fila, apenas duas listas de ids trocadas a cada
+    camada. O teste de objetivo é feito na geração, então a busca para assim
+    que o objetivo aparece no próximo nível. Os pais ficam no workspace do
+    mapa, como em best_first_search.
+    """
+    grid = as_flat(maze)
+    mode = metrics_mode(collect_metrics)
+    full = mode == METRICS_FULL
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+    W = grid.W
+    start_node = grid.start
+    goal_node = grid.goal
 
-    while frontier:
-        current_memory = len(frontier) + len(came_from)
-        if current_memory > max_memory_usage:
-            max_memory_usage = current_memory
+    nodes_expanded = 0
+    max_memory_usage = 0
+    peak_frontier = 1
+
+    if workspace is None:
+        workspace = workspace_for(grid)
+    generation = workspace.begin()
+    parent = workspace.parent
+    seen = workspace.seen
+
+    seen[start_node] = generation
+    parent[start_node] = NO_PARENT
+    reached = 1
+    level = [start_node]
+
+    if start_node == goal_node:
+        return PathHandle.on(grid, [start_node]), search_metrics(mode, 0, 1, 1, 1)
+
+    while level:
+        next_level = []
+        push = next_level.append
+
+        for current_node in level:
+            nodes_expanded += 1
+            for offset in neighbor_offsets[cells[current_node]]:
+                neighbor_node = current_node + offset
+                if seen[neighbor_node] != generation:
+                    seen[neighbor_node] = generation
+                    parent[neighbor_node] = current_node
+                    reached += 1
+                    if neighbor_node == goal_node:
+                        if full:
+                            max_memory_usage = max(max_memory_usage, len(next_level) + 1 + reached)
+                            peak_frontier = max(peak_frontier, len(next_level) + 1)
+                        return workspace.path_to(goal_node, grid), search_metrics(
+                            mode, nodes_expanded, max_memory_usage, peak_frontier, reached)
+                    push(neighbor_node)
+
+        if full:
+            # O pico ocorre na troca de nível, quando a próxima camada está completa
+            current_memory = len(next_level) + reached
+            if current_memory > max_memory_usage:
+                max_memory_usage = current_memory
+            if len(next_level) > peak_frontier:
+                peak_frontier = len(next_level)
+
+        level = next_level
+
+    return None, search_metrics(mode, nodes_expanded, max_memory_usage, peak_frontier, reached)
+
+
+def _jump_horizontal(cells, cell: int, step: int, bit: int, goal: int) -> Optional[int]:
+    """
+    Avança na linha (step = ±1, bit = DIR_L/DIR_O) até o próximo ponto de
+    salto: o objetivo, ou uma célula com vizinho vertical aberto que estava
+    fechado na célula anterior (vizinho forçado). None se bater numa parede.
+    """
+    mask = cells[cell]
+    while mask & bit:
+        cell += step
+        previous, mask = mask, cells[cell]
+        if cell == goal or mask & ~previous & (DIR_N | DIR_S):
+            return cell
+    return None
 
-        # Remove o primeiro elemento (FIFO)
-        current_node = frontier.pop(0)
-        nodes_expanded += 1
 
-        if maze.goal_test(current_node):
-            path = reconstruct_path(came_from, start_node, goal_node)
-            metrics = {
-                "nodes_expanded": nodes_expanded,
-                "max_memory_usage": max_memory_usage
-            }
-            return path, metrics
-        
-        for action in maze.actions(current_node):
-            neighbor_node = maze.result(current_node, action)
+def _jump_vertical(cells, cell: int, step: int, bit: int, goal: int) -> Optional[int]:
+    """
+    Avança na coluna (step = ±W, bit = DIR_S/DIR_N). Cada célula percorrida
+    dispara varreduras horizontais para os dois lados; ela é ponto de salto
+    se for o objetivo ou se uma dessas varreduras encontrar um.
+    """
+    mask = cells[cell]
+    while mask & bit:
+        cell += step
+        mask = cells[cell]
+        if cell == goal:
+            return cell
+        if (mask & DIR_L and _jump_horizontal(cells, cell, 1, DIR_L, goal) is not None) or \
+                (mask & DIR_O and _jump_horizontal(cells, cell, -1, DIR_O, goal) is not None):
+            return cell
+    return None
+
+
+def jump_point_search(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """
+    Jump Point Search para a grade 4-conectada de custo uniforme.
 
-            if neighbor_node not in came_from:
-                came_from[neighbor_node] = current_node
-                frontier.append(neighbor_node)  # Adiciona no final da fila
-        
-    metrics = {
-        "nodes_expanded": nodes_expanded,
-        "max_memory_usage": max_memory_usage
-    }
+    Entre dois caminhos mínimos equivalentes, prefere o que anda na vertical
+    antes de virar na horizontal, e só vira da horizontal para a vertical
+    onde isso é forçado por uma parede. Assim o A* (heurística Manhattan)
+    só coloca no heap os pontos de salto, e os trechos retos entre eles são
+    percorridos por varreduras sem heap. O custo é o mesmo do A*.
 
-    return None, metrics
+    Sucessores de um ponto de salto: alcançado na horizontal, segue na mesma
+    direção e tenta as duas verticais; alcançado na vertical, segue na mesma
+    direção e tenta as duas horizontais; o início tenta as quatro.
 
+    Em terreno com custo, os custos são ignorados: o caminho é o de menos
+    passos, como na BFS.
 
-def greedy_search(maze: Maze):
+    Métricas como em best_first_search (search_metrics): heap_pushes e
+    stale_pops contam os pontos de salto, e peak_visited os pontos
+    guardados.
     """
-    Greedy Best-First Search - Busca gulosa
-    Usa apenas a heurística h(n) para escolher o próximo nó a expandir.
-    Não considera o custo acumulado, apenas a distância estimada até o objetivo.
-    """
-    start_node = maze.start
-    goal_node = maze.goal
+    grid = as_flat(maze)
+    mode = metrics_mode(collect_metrics)
+    full = mode == METRICS_FULL
+    cells = grid.cells
+    W = grid.W
+    start_node = grid.start
+    goal_node = grid.goal
+    goal_r, goal_c = grid.pos_of(goal_node)
+
+    # (deslocamento, bit, é vertical) por direção, na ordem N, S, O, L
+    moves = ((-W, DIR_N, True), (W, DIR_S, True), (-1, DIR_O, False), (1, DIR_L, False))
+    after_vertical = {0: (0, 2, 3), 1: (1, 2, 3)}
+    after_horizontal = {2: (2, 0, 1), 3: (3, 0, 1)}
+    successors_of = {**after_vertical, **after_horizontal, None: (0, 1, 2, 3)}
+
+    heappush = heapq.heappush
+    heappop = heapq.heappop
 
     nodes_expanded = 0
     max_memory_usage = 0
+    peak_frontier = 0
+    heap_pushes = 0
+    stale_pops = 0
 
-    # Usa heap para manter nós ordenados por heurística
-    frontier = []
-    h_start = manhattan_distance(start_node, goal_node)
-    heapq.heappush(frontier, (h_start, start_node))
-
+    came_from: Dict[int, Optional[int]] = {start_node: None}
+    arrival: Dict[int, Optional[int]] = {start_node: None}
+    g_cost: Dict[int, int] = {start_node: 0}
+    frontier = [(0, start_node)]
 
-    came_from: Dict[Pos, Optional[Pos]] = {start_node: None}
+    def finish() -> dict:
+        return search_metrics(mode, nodes_expanded, max_memory_usage, peak_frontier, len(came_from),
+                              heap_pushes=heap_pushes, stale_pops=stale_pops)
 
     while frontier:
-        current_memory = len(frontier) + len(came_from)
-        if current_memory > max_memory_usage:
-            max_memory_usage = current_memory
 
-        _, current_node = heapq.heappop(frontier)
+        if full:
+            frontier_size = len(frontier)
+            if frontier_size > peak_frontier:
+                peak_frontier = frontier_size
+            if frontier_size + len(came_from) > max_memory_usage:
+                max_memory_usage = frontier_size + len(came_from)
+
+        f_cost, current_node = heappop(frontier)
+        current_g = g_cost[current_node]
+        r, c = divmod(current_node, W)
+        if f_cost > current_g + abs(r - goal_r) + abs(c - goal_c):
+            stale_pops += 1  # Entrada desatualizada: o nó já saiu do heap com custo menor
+            continue
         nodes_expanded += 1
 
-        if maze.goal_test(current_node):
-            path = reconstruct_path(came_from, start_node, goal_node)
-            metrics = {
-                "nodes_expanded": nodes_expanded,
-                "max_memory_usage": max_memory_usage
-            }
-            return path, metrics
-        
-        for action in maze.actions(current_node):
-            neighbor_node = maze.result(current_node, action)
-
-            if neighbor_node not in came_from:
-                came_from[neighbor_node] = current_node
-                # Usa apenas a heurística h(n), sem custo acumulado
-                h_cost = manhattan_distance(neighbor_node, goal_node)
-                heapq.heappush(frontier, (h_cost, neighbor_node))
-        
-    metrics = {
-        "nodes_expanded": nodes_expanded,
-        "max_memory_usage": max_memory_usage
-    }
-
-    return None, metrics
+        if current_node == goal_node:
+            return _expand_jumps(came_from, start_node, goal_node, grid), finish()
+
+        for direction in successors_of[arrival[current_node]]:
+            step, bit, vertical = moves[direction]
+            if vertical:
+                jump_node = _jump_vertical(cells, current_node, step, bit, goal_node)
+            else:
+                jump_node = _jump_horizontal(cells, current_node, step, bit, goal_node)
+            if jump_node is None:
+                continue
+
+            jr, jc = divmod(jump_node, W)
+            g_cost_tentative = current_g + abs(jr - r) + abs(jc - c)
+            known_cost = g_cost.get(jump_node)
+            if known_cost is None or g_cost_tentative < known_cost:
+                came_from[jump_node] = current_node
+                arrival[jump_node] = direction
+                g_cost[jump_node] = g_cost_tentative
+                heappush(frontier, (g_cost_tentative + abs(jr - goal_r) + abs(jc - goal_c), jump_node))
+                heap_pushes += 1
+
+    return None, finish()
+
+
+def _expand_jumps(came_from: Dict[int, Optional[int]], start: int, goal: int, grid: FlatGrid) -> PathHandle:
+    """Reconstrói o caminho célula a célula, preenchendo os trechos retos entre pontos de salto."""
+    W = grid.W
+    jumps = reconstruct_path(came_from, start, goal)
+    cells = array('I', [jumps[0]])
+    for previous, current in zip(jumps, jumps[1:]):
+        if current // W == previous // W:
+            step = 1 if current > previous else -1
+        else:
+            step = W if current > previous else -W
+        cells.extend(range(previous + step, current + step, step))
+    return PathHandle.on(grid, cells)
+
+
+def _splice(came_forward: Dict[int, Optional[int]], came_backward: Dict[int, Optional[int]],
+            start: int, goal: int, forward_node: int, backward_node: int, grid: FlatGrid,
+            cost: Optional[int] = None) -> PathHandle:
+    """
+    Une as duas metades de uma busca bidirecional: início -> forward_node pela
+    árvore direta e backward_node -> objetivo pela árvore reversa (forward_node
+    e backward_node são o mesmo nó ou vizinhos).
+    """
+    path = reconstruct_path(came_forward, start, forward_node)
+    backward = reconstruct_path(came_backward, goal, backward_node)
+    backward.reverse()
+    if backward[0] == path[-1]:
+        backward = backward[1:]
+    return PathHandle.on(grid, path + backward, cost)
 
 
-# Versões com heurística euclidiana para comparação
-def a_star_search_euclidean(maze: Maze):
-    """A* Search usando heurística euclidiana"""
-    start_node = maze.start
-    goal_node = maze.goal
+def bidirectional_bfs(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """
+    BFS bidirecional
+    Cresce uma fronteira a partir do início e outra a partir do objetivo,
+    expandindo a cada vez uma camada inteira da menor delas. Quando a camada
+    toca a árvore do outro lado, o menor caminho passando pelas arestas de
+    contato dessa camada é o ótimo. Em vez de um círculo de raio d, as duas
+    buscas cobrem dois círculos de raio d/2. Como a BFS, conta passos e
+    ignora custos de terreno.
+
+    Sem heap, as métricas são as da BFS (search_metrics): peak_frontier
+    soma as fronteiras dos dois lados e peak_visited as duas árvores,
+    medidos a cada camada.
+    """
+    grid = as_flat(maze)
+    mode = metrics_mode(collect_metrics)
+    full = mode == METRICS_FULL
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+    W = grid.W
+    start_node = grid.start
+    goal_node = grid.goal
+
+    if start_node == goal_node:
+        return PathHandle.on(grid, [start_node]), search_metrics(mode, 0, 1, 1, 1)
+
     nodes_expanded = 0
     max_memory_usage = 0
-    frontier = []
-    f_start = euclidean_distance(start_node, goal_node)
-    heapq.heappush(frontier, (f_start, start_node))
-    came_from: Dict[Pos, Pos] = {start_node: None}
-    g_cost: Dict[Pos, int] = {start_node: 0}
+    peak_frontier = 0
+    peak_visited = 0
+
+    # Índice 0: busca a partir do início; índice 1: a partir do objetivo
+    came_from = ({start_node: None}, {goal_node: None})
+    depth = ({start_node: 0}, {goal_node: 0})
+    frontiers = [[start_node], [goal_node]]
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        came_this, came_other = came_from[side], came_from[1 - side]
+        depth_this, depth_other = depth[side], depth[1 - side]
+
+        next_frontier = []
+        push = next_frontier.append
+        best = None
+
+        for current_node in frontiers[side]:
+            nodes_expanded += 1
+            next_depth = depth_this[current_node] + 1
+            for offset in neighbor_offsets[cells[current_node]]:
+                neighbor_node = current_node + offset
+                if neighbor_node in came_other:
+                    length = next_depth + depth_other[neighbor_node]
+                    if best is None or length < best[0]:
+                        best = (length, current_node, neighbor_node)
+                if neighbor_node not in came_this:
+                    came_this[neighbor_node] = current_node
+                    depth_this[neighbor_node] = next_depth
+                    push(neighbor_node)
+
+        if full:
+            # As árvores só crescem: o pico de visitados é o da última camada
+            frontier_size = len(next_frontier) + len(frontiers[1 - side])
+            peak_visited = len(came_from[0]) + len(came_from[1])
+            if frontier_size > peak_frontier:
+                peak_frontier = frontier_size
+            if frontier_size + peak_visited > max_memory_usage:
+                max_memory_usage = frontier_size + peak_visited
+
+        if best is not None:
+            _, this_node, other_node = best
+            forward_node, backward_node = (this_node, other_node) if side == 0 else (other_node, this_node)
+            path = _splice(came_from[0], came_from[1], start_node, goal_node, forward_node, backward_node, grid)
+            return path, search_metrics(mode, nodes_expanded, max_memory_usage, peak_frontier, peak_visited)
+
+        frontiers[side] = next_frontier
+
+    return None, search_metrics(mode, nodes_expanded, max_memory_usage, peak_frontier, peak_visited)
+
+
+def bidirectional_a_star(maze: Maze, heuristic: Heuristic = manhattan_distance, collect_metrics: MetricsMode = METRICS_FULL):
+    """
+    A* bidirecional
+    Um A* parte do início (h até o objetivo) e outro do objetivo (h até o
+    início); expande-se sempre o lado com menos nós na fronteira. mu guarda
+    o custo do melhor caminho já encontrado através de um nó alcançado pelos
+    dois lados. Com heurística consistente, a busca pode parar quando
+    mu <= max(min f da fronteira direta, min f da fronteira reversa): todo
+    caminho ainda não visto passa por um nó de cada fronteira, e portanto
+    custa pelo menos esse máximo.
+
+    Um nó já expandido pelo outro lado não é expandido de novo ("nipping",
+    como no BS*): com heurística consistente os custos dos dois lados até
+    ele já são ótimos, e o caminho através dele já entrou em mu.
+
+    Em terreno com custo, o passo u -> v custa a entrada em v: na busca
+    reversa, chegar a v a partir de u custa a entrada em u.
+
+    Métricas (search_metrics) somam os dois lados: heap_pushes, stale_pops
+    (entradas desatualizadas), peak_frontier (as duas fronteiras) e
+    peak_visited (as duas árvores).
+    """
+    grid = as_flat(maze)
+    mode = metrics_mode(collect_metrics)
+    full = mode == METRICS_FULL
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+    W = grid.W
+    start_node = grid.start
+    goal_node = grid.goal
+    targets = (grid.pos_of(goal_node), grid.pos_of(start_node))
+    h = _scaled_heuristic(heuristic, grid)
+    step_costs = grid.costs
+
+    heappush = heapq.heappush
+    heappop = heapq.heappop
 
-    while frontier:
-        current_memory = len(frontier) + len(g_cost)
-        if current_memory > max_memory_usage:
-            max_memory_usage = current_memory
-        _, current_node = heapq.heappop(frontier)
+    nodes_expanded = 0
+    max_memory_usage = 0
+    peak_frontier = 0
+    heap_pushes = 0
+    stale_pops = 0
+
+    came_from = ({start_node: None}, {goal_node: None})
+    g_cost = ({start_node: 0}, {goal_node: 0})
+    closed = (set(), set())
+    frontiers = (
+        [(h(targets[1], targets[0]), start_node)],
+        [(h(targets[0], targets[1]), goal_node)],
+    )
+
+    mu = 0 if start_node == goal_node else float('inf')
+    meeting_node = start_node if start_node == goal_node else None
+
+    while frontiers[0] and frontiers[1]:
+
+        if full:
+            frontier_size = len(frontiers[0]) + len(frontiers[1])
+            if frontier_size > peak_frontier:
+                peak_frontier = frontier_size
+            current_memory = frontier_size + len(came_from[0]) + len(came_from[1])
+            if current_memory > max_memory_usage:
+                max_memory_usage = current_memory
+
+        if mu <= max(frontiers[0][0][0], frontiers[1][0][0]):
+            break
+
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        frontier, target = frontiers[side], targets[side]
+        came_this, g_this, g_other = came_from[side], g_cost[side], g_cost[1 - side]
+
+        f_cost, current_node = heappop(frontier)
+        current_g = g_this[current_node]
+        if f_cost > current_g + h(divmod(current_node, W), target):
+            stale_pops += 1  # Entrada desatualizada
+            continue
+        if f_cost >= mu:
+            continue  # Não pode melhorar mu
+        closed[side].add(current_node)
+        if current_node in closed[1 - side]:
+            continue
         nodes_expanded += 1
 
-        if maze.goal_test(current_node):
-            path = reconstruct_path(came_from, start_node, goal_node)
-            metrics = {
-                "nodes_expanded": nodes_expanded,
-                "max_memory_usage": max_memory_usage
-            }
-            return path, metrics
-        
-        for action in maze.actions(current_node):
-            neighbor_node = maze.result(current_node, action)
-            step_cost = maze.step_cost(current_node, action, neighbor_node)
-            g_cost_tentative = g_cost[current_node] + step_cost
-            
-            if neighbor_node not in g_cost or g_cost_tentative < g_cost[neighbor_node]:
-                came_from[neighbor_node] = current_node
-                g_cost[neighbor_node] = g_cost_tentative
-                f_cost = g_cost_tentative + euclidean_distance(neighbor_node, goal_node)
-                heapq.heappush(frontier, (f_cost, neighbor_node))
-        
-    metrics = {
-        "nodes_expanded": nodes_expanded,
-        "max_memory_usage": max_memory_usage
-    }
-    return None, metrics
-
+        g_cost_tentative = current_g + 1
+        if step_costs is not None and side == 1:
+            g_cost_tentative = current_g + step_costs[current_node]
+        for offset in neighbor_offsets[cells[current_node]]:
+            neighbor_node = current_node + offset
+            if step_costs is not None and side == 0:
+                g_cost_tentative = current_g + step_costs[neighbor_node]
+            known_cost = g_this.get(neighbor_node)
+            if known_cost is None or g_cost_tentative < known_cost:
+                came_this[neighbor_node] = current_node
+                g_this[neighbor_node] = g_cost_tentative
+                heappush(frontier, (g_cost_tentative + h(divmod(neighbor_node, W), target), neighbor_node))
+                heap_pushes += 1
+
+                other_cost = g_other.get(neighbor_node)
+                if other_cost is not None and g_cost_tentative + other_cost < mu:
+                    mu = g_cost_tentative + other_cost
+                    meeting_node = neighbor_node
+
+    # Alcançados só crescem: o pico de visitados é o total dos dois lados
+    metrics = search_metrics(mode, nodes_expanded, max_memory_usage, peak_frontier,
+                             len(came_from[0]) + len(came_from[1]),
+                             heap_pushes=heap_pushes, stale_pops=stale_pops)
+    if meeting_node is None:
+        return None, metrics
+
+    path = _splice(came_from[0], came_from[1], start_node, goal_node, meeting_node, meeting_node, grid, mu)
+    return path, metrics
+
+
+DEFAULT_NODE_BUDGET = 10_000
+DEFAULT_EXPANSION_BUDGET = 1_000_000  # Expansões antes de IDA* e SMA* desistirem (None)
+
+
+def _goal_reachable(grid: FlatGrid) -> bool:
+    """Busca em profundidade sem métricas, marcando as células com os carimbos do workspace do mapa."""
+    workspace = workspace_for(grid)
+    generation = workspace.begin()
+    seen = workspace.seen
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+    goal_node = grid.goal
+    seen[grid.start] = generation
+    stack = [grid.start]
+    while stack:
+        node = stack.pop()
+        if node == goal_node:
+            return True
+        for offset in neighbor_offsets[cells[node]]:
+            if seen[node + offset] != generation:
+                seen[node + offset] = generation
+                stack.append(node + offset)
+    return False
+
+
+def ida_star_search(maze: Maze, heuristic: Heuristic = manhattan_distance, collect_metrics: MetricsMode = METRICS_FULL,
+                    max_expansions: Optional[int] = DEFAULT_EXPANSION_BUDGET):
+    """
+    IDA* (A* por aprofundamento iterativo)
+    Repete buscas em profundidade limitadas por f = g + h, começando com o
+    limite h(início) e subindo, a cada rodada, para o menor f que passou do
+    limite anterior. Guarda apenas o caminho atual, numa pilha explícita (sem
+    recursão) com os sucessores ainda não tentados de cada nó, e não visita
+    de novo um nó do próprio caminho: a memória é proporcional à
+    profundidade da solução, e não ao número de células.
+
+    O preço é refazer trabalho: cada rodada repete a anterior e, sem tabela
+    de visitados, uma célula é reexpandida por cada caminho simples que
+    chega a ela dentro do limite. Vai bem em grades abertas e labirintos
+    perfeitos, mas em mapas com muitos ciclos as expansões crescem
+    exponencialmente. max_memory_usage é o pico de nós no caminho mais
+    sucessores pendentes na pilha (peak_visited e peak_frontier, medidos
+    separadamente; sem heap, não há heap_pushes). Só aceita mapas de custo
+    uniforme.
+
+    Sem caminho, os limites subiriam sem fim: cada rodada marca (com os
+    carimbos do SearchWorkspace do mapa, sem alocar nada) as células que
+    alcançou e as que cortou pelo limite, e se nenhuma célula cortada ficou
+    fora das alcançadas a componente do início foi toda explorada e o
+    objetivo é inalcançável. Além disso, passadas max_expansions expansões
+    (None desliga) a busca desiste e retorna None, com budget_exhausted
+    nas métricas.
+    """
+    grid = as_flat(maze)
+    mode = metrics_mode(collect_metrics)
+    full = mode == METRICS_FULL
+    _require_uniform(grid, "IDA*")
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+    W = grid.W
+    start_node = grid.start
+    goal_node = grid.goal
+    goal_pos = grid.pos_of(goal_node)
+    h = heuristic
 
-def greedy_search_euclidean(maze: Maze):
-    """Greedy Search usando heurística euclidiana"""
-    start_node = maze.start
-    goal_node = maze.goal
     nodes_expanded = 0
     max_memory_usage = 0
-    frontier = []
-    h_start = euclidean_distance(start_node, goal_node)
-    heapq.heappush(frontier, (h_start, start_node))
-    came_from: Dict[Pos, Optional[Pos]] = {start_node: None}
+    peak_frontier = 0
+    peak_visited = 1
+
+    if start_node == goal_node:
+        return PathHandle.on(grid, [start_node]), search_metrics(mode, 0, 1, 0, 1)
+
+    def finish() -> dict:
+        return search_metrics(mode, nodes_expanded, max_memory_usage, peak_frontier, peak_visited)
+
+    workspace = workspace_for(grid)
+    reached = workspace.seen     # Células colocadas no caminho nesta rodada
+    cut = workspace.closed       # Células cortadas pelo limite nesta rodada
+    path = [start_node]
+    on_path = {start_node}
+
+    def successors(node: int, g: int) -> List[Tuple[float, int]]:
+        # Ordenados por f decrescente: o próximo a tentar fica no fim da lista
+        result = [(g + h(divmod(node + offset, W), goal_pos), node + offset)
+                  for offset in neighbor_offsets[cells[node]] if node + offset not in on_path]
+        result.sort(reverse=True)
+        return result
+
+    threshold = h(grid.pos_of(start_node), goal_pos)
+
+    while True:
+        next_threshold = float('inf')
+        generation = workspace.begin()
+        reached[start_node] = generation
+        unreached_cuts = 0  # Células cortadas que ainda não foram alcançadas nesta rodada
+        nodes_expanded += 1
+        stack = [successors(start_node, 1)]
+        pending = len(stack[0])
+
+        while stack:
+            frame = stack[-1]
+            if not frame:
+                stack.pop()
+                on_path.discard(path.pop())
+                continue
+
+            f_cost, node = frame.pop()
+            pending -= 1
+            if f_cost > threshold:
+                # Os demais sucessores deste nó têm f maior ou igual
+                if f_cost < next_threshold:
+                    next_threshold = f_cost
+                for _, cut_node in frame + [(f_cost, node)]:
+                    if cut[cut_node] != generation:
+                        cut[cut_node] = generation
+                        if reached[cut_node] != generation:
+                            unreached_cuts += 1
+                pending -= len(frame)
+                frame.clear()
+                continue
+
+            path.append(node)
+            if node == goal_node:
+                return PathHandle.on(grid, path), finish()
+
+            if reached[node] != generation:
+                reached[node] = generation
+                if cut[node] == generation:
+                    unreached_cuts -= 1
+            on_path.add(node)
+            nodes_expanded += 1
+            if max_expansions is not None and nodes_expanded > max_expansions:
+                return None, _budget_exhausted(finish())
+            frame = successors(node, len(path))
+            stack.append(frame)
+            pending += len(frame)
+
+            if full:
+                if pending > peak_frontier:
+                    peak_frontier = pending
+                if len(path) > peak_visited:
+                    peak_visited = len(path)
+                if len(path) + pending > max_memory_usage:
+                    max_memory_usage = len(path) + pending
+
+        if next_threshold == float('inf') or not unreached_cuts:
+            # Todo corte levou a uma célula já alcançada: a componente acabou
+            return None, finish()
+        threshold = next_threshold
+        path = [start_node]
+        on_path = {start_node}
+
+
+def sma_star_search(maze: Maze, max_nodes: int = DEFAULT_NODE_BUDGET,
+                    heuristic: Heuristic = manhattan_distance, collect_metrics: MetricsMode = METRICS_FULL,
+                    max_expansions: Optional[int] = DEFAULT_EXPANSION_BUDGET):
+    """
+    SMA* simplificado (A* limitado em memória)
+    Mantém a árvore de busca com no máximo max_nodes nós (mais os até 4
+    sucessores de uma expansão, descartados logo em seguida). Expande a
+    folha de menor f (a mais profunda, no empate); quando a memória estoura,
+    descarta a folha de maior f (a mais rasa, no empate) e guarda no pai o
+    f que ela tinha. O pai volta à fronteira com o menor f entre os filhos
+    esquecidos e, ao ser expandido de novo, regenera só esses filhos, cada
+    um com o f guardado como limite inferior.
+
+    Um nó cujo caminho já ocupa a memória toda recebe f infinito; quando a
+    melhor folha tem f infinito, nenhuma solução cabe em max_nodes nós e a
+    busca falha. Com orçamento de pelo menos (custo ótimo + 1) nós o custo é
+    o mesmo do A*, e com memória de sobra ele se comporta como o A*.
+
+    Cada célula aparece no máximo uma vez na árvore: um caminho mais barato
+    até uma célula já guardada descarta a subárvore antiga dela. Cada nó
+    marca as direções que não precisa mais explorar (células já guardadas
+    com custo menor ou igual, e filhos sem saída); um nó sem nenhuma
+    direção a explorar é liberado na hora. Como no A*, max_memory_usage
+    conta os nós guardados e as entradas da fronteira. Só aceita mapas de
+    custo uniforme (o limite de profundidade usa g como número de passos).
+
+    Para não girar em falso quando não há solução que caiba, a busca falha
+    logo se h(início) + 1 já passa de max_nodes (nenhum caminho cabe) ou se
+    o objetivo não é alcançável (uma varredura prévia com os carimbos do
+    SearchWorkspace do mapa, fora do orçamento de nós da árvore), e desiste
+    depois de max_expansions expansões (None desliga; budget_exhausted nas
+    métricas), o que cobre orçamentos menores que o caminho ótimo.
+
+    Métricas (search_metrics): heap_pushes e stale_pops contam as entradas
+    da fronteira (incluindo as refeitas ao reconstruir os heaps),
+    peak_frontier o tamanho dela e peak_visited os nós guardados.
+    """
+    if max_nodes < 1:
+        raise ValueError("max_nodes must be at least 1")
+    _require_uniform(as_flat(maze), "SMA*")
+
+    grid = as_flat(maze)
+    mode = metrics_mode(collect_metrics)
+    full = mode == METRICS_FULL
+    cells = grid.cells
+    neighbor_offsets = grid.neighbor_offsets
+    W = grid.W
+    start_node = grid.start
+    goal_node = grid.goal
+    goal_pos = grid.pos_of(goal_node)
+    h = heuristic
+    inf = float('inf')
+
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    order = itertools.count()
 
-    while frontier:
-        current_memory = len(frontier) + len(came_from)
-        if current_memory > max_memory_usage:
-            max_memory_usage = current_memory
-        _, current_node = heapq.heappop(frontier)
+    nodes_expanded = 0
+    max_memory_usage = 0
+    peak_frontier = 0
+    peak_visited = 0
+    stale_pops = 0
+
+    g_cost: Dict[int, int] = {start_node: 0}
+    f_cost: Dict[int, float] = {start_node: h(grid.pos_of(start_node), goal_pos)}
+    parent: Dict[int, Optional[int]] = {start_node: None}
+    children: Dict[int, set] = {start_node: set()}
+    done: Dict[int, int] = {start_node: 0}     # Bits das direções encerradas (índice em neighbor_offsets)
+    forgotten: Dict[int, Dict[int, float]] = {}  # Filhos descartados -> f que tinham ao sair da memória
+
+    # best: (f, -g, -ordem, nó) das folhas e dos nós com filhos esquecidos
+    # worst: (-f, g, ordem, nó) das folhas, candidatas ao descarte
+    best: List[tuple] = []
+    worst: List[tuple] = []
+
+    def push_leaf(node: int):
+        count = next(order)
+        heappush(best, (f_cost[node], -g_cost[node], -count, node))
+        heappush(worst, (-f_cost[node], g_cost[node], count, node))
+
+    def detach(node: int) -> int:
+        """Tira node da memória e da lista de filhos do pai; retorna o pai."""
+        above = parent.pop(node)
+        del g_cost[node], f_cost[node], children[node], done[node]
+        forgotten.pop(node, None)
+        children[above].discard(node)
+        return above
+
+    def close_direction(node: int, neighbor_node: int):
+        done[node] |= 1 << neighbor_offsets[cells[node]].index(neighbor_node - node)
+
+    def release(node: int):
+        """node ficou sem filhos: volta a ser folha com o f dos filhos esquecidos, ou não tem mais saída."""
+        while not children[node]:
+            if node in forgotten:
+                f_cost[node] = max(f_cost[node], min(forgotten[node].values()))
+                push_leaf(node)
+                return
+            if node == start_node:
+                return  # Nada mais a explorar: a fronteira vai se esgotar
+            above = detach(node)
+            close_direction(above, node)
+            node = above
+
+    def drop_subtree(node: int):
+        """Descarta os descendentes de node, que recomeça como folha."""
+        stack = list(children[node])
+        while stack:
+            descendant = stack.pop()
+            stack.extend(children[descendant])
+            del g_cost[descendant], f_cost[descendant], parent[descendant], children[descendant], done[descendant]
+            forgotten.pop(descendant, None)
+        children[node] = set()
+        done[node] = 0
+        forgotten.pop(node, None)
+
+    def rebuild_heaps():
+        # As entradas desatualizadas se acumulam: refaz os heaps só com as válidas
+        best.clear()
+        worst.clear()
+        for node in g_cost:
+            if not children[node]:
+                push_leaf(node)
+            elif node in forgotten:
+                heappush(best, (min(forgotten[node].values()), -g_cost[node], -next(order), node))
+
+    def finish() -> dict:
+        # order numera as inserções na fronteira; a primeira é a do início
+        return search_metrics(mode, nodes_expanded, max_memory_usage, peak_frontier, peak_visited,
+                              heap_pushes=next(order) - 1, stale_pops=stale_pops)
+
+    if f_cost[start_node] + 1 > max_nodes or not _goal_reachable(grid):
+        # Nem o caminho mais curto possível cabe, ou não há caminho
+        return None, search_metrics(mode, 0, 1, 0, 1, heap_pushes=0, stale_pops=0)
+
+    push_leaf(start_node)
+
+    while best:
+
+        if full:
+            if len(best) > peak_frontier:
+                peak_frontier = len(best)
+            if len(g_cost) > peak_visited:
+                peak_visited = len(g_cost)
+            if len(g_cost) + len(best) > max_memory_usage:
+                max_memory_usage = len(g_cost) + len(best)
+
+        key, negative_g, _, current_node = heappop(best)
+        if g_cost.get(current_node) != -negative_g:
+            stale_pops += 1
+            continue
+        if children[current_node]:
+            if current_node not in forgotten or min(forgotten[current_node].values()) != key:
+                stale_pops += 1  # Entrada desatualizada
+                continue
+        elif key != f_cost[current_node]:
+            stale_pops += 1
+            continue
+
+        if key == inf:
+            break  # Nenhuma solução cabe no orçamento de memória
+
+        if current_node == goal_node:
+            path = PathHandle.on(grid, reconstruct_path(parent, start_node, goal_node), g_cost[goal_node])
+            return path, finish()
         nodes_expanded += 1
+        if max_expansions is not None and nodes_expanded > max_expansions:
+            return None, _budget_exhausted(finish())
+
+        current_children = children[current_node]
+        current_done = done[current_node]
+        current_f = f_cost[current_node]
+        remembered = forgotten.pop(current_node, {})
+        g_cost_tentative = g_cost[current_node] + 1
+        for index, offset in enumerate(neighbor_offsets[cells[current_node]]):
+            neighbor_node = current_node + offset
+            if current_done & (1 << index) or neighbor_node in current_children:
+                continue
+            known_cost = g_cost.get(neighbor_node)
+            if known_cost is not None:
+                if known_cost <= g_cost_tentative:
+                    current_done |= 1 << index  # Já guardada por um caminho tão bom quanto
+                    continue
+                # Caminho mais barato até uma célula já guardada: ela recomeça como folha aqui
+                drop_subtree(neighbor_node)
+                old_parent = parent[neighbor_node]
+                children[old_parent].discard(neighbor_node)
+                close_direction(old_parent, neighbor_node)
+                current_children.add(neighbor_node)
+                release(old_parent)
+            else:
+                children[neighbor_node] = set()
+                done[neighbor_node] = 0
+                current_children.add(neighbor_node)
+
+            parent[neighbor_node] = current_node
+            g_cost[neighbor_node] = g_cost_tentative
+            # O caminho até o vizinho (e até um filho dele, se não for o objetivo) precisa caber na memória
+            if g_cost_tentative + (1 if neighbor_node == goal_node else 2) <= max_nodes:
+                f_cost[neighbor_node] = max(current_f, g_cost_tentative + h(divmod(neighbor_node, W), goal_pos),
+                                            remembered.get(neighbor_node, current_f))
+            else:
+                f_cost[neighbor_node] = inf
+            push_leaf(neighbor_node)
+        done[current_node] |= current_done
+
+        if not current_children:
+            release(current_node)
+
+        while len(g_cost) > max_nodes and worst:
+            negative_f, g, _, leaf = heappop(worst)
+            if g_cost.get(leaf) != g or children[leaf] or f_cost[leaf] != -negative_f:
+                continue
+            above = detach(leaf)
+            forgotten.setdefault(above, {})[leaf] = -negative_f
+            if children[above]:
+                heappush(best, (min(forgotten[above].values()), -g_cost[above], -next(order), above))
+            else:
+                release(above)
+
+        if len(best) > max_nodes + 16 or len(worst) > 2 * max_nodes + 16:
+            rebuild_heaps()
+
+    return None, finish()
+
+
+def greedy_search(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """
+    Greedy Best-First Search - Busca gulosa
+    Usa apenas a heurística h(n) para escolher o próximo nó a expandir.
+    Não considera o custo acumulado, apenas a distância estimada até o objetivo.
+    """
+    return best_first_search(maze, PRIORITY_H, manhattan_distance, collect_metrics)
+
+
+# Versões com heurística euclidiana para comparação
+def a_star_search_euclidean(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """A* Search usando heurística euclidiana"""
+    return best_first_search(maze, PRIORITY_F, euclidean_distance, collect_metrics)
 
-        if maze.goal_test(current_node):
-            path = reconstruct_path(came_from, start_node, goal_node)
-            metrics = {
-                "nodes_expanded": nodes_expanded,
-                "max_memory_usage": max_memory_usage
-            }
-            return path, metrics
-        
-        for action in maze.actions(current_node):
-            neighbor_node = maze.result(current_node, action)
-            if neighbor_node not in came_from:
-                came_from[neighbor_node] = current_node
-                h_cost = euclidean_distance(neighbor_node, goal_node)
-                heapq.heappush(frontier, (h_cost, neighbor_node))
-        
-    metrics = {
-        "nodes_expanded": nodes_expanded,
-        "max_memory_usage": max_memory_usage
-    }
-    return None, metrics
 
+def greedy_search_euclidean(maze: Maze, collect_metrics: MetricsMode = METRICS_FULL):
+    """Greedy Search usando heurística euclidiana"""
+    return best_first_search(maze, PRIORITY_H, euclidean_distance, collect_metrics)
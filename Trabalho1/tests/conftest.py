@@ -0,0 +1,6 @@
+# Os testes importam src.* como os scripts de Trabalho1: o pytest pode ser
+# chamado de qualquer diretório
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,178 @@
+#Testes de paridade das buscas em mapas aleatórios pequenos
+#
+# Cada busca ótima é comparada com a referência (BFS em passos, Dijkstra em
+# custo) em grades geradas com sementes fixas, incluindo objetivos
+# inalcançáveis e terreno com custo. Execute a partir de Trabalho1:
+#
+#   python -m unittest discover tests
+#   python -m pytest tests
+
+import os
+import random
+import tempfile
+import unittest
+
+from src.binary_maze import iter_binary_mazes, load_binary_maze, write_binary_mazes
+from src.dstar_lite import DStarLite, d_star_lite_search
+from src.maze import FlatGrid
+from src.search import (
+    a_star_search, bfs, bidirectional_a_star, bidirectional_bfs, dijkstra_search,
+    ida_star_search, jump_point_search, sma_star_search,
+)
+
+SEEDS = range(120)
+
+
+def random_grid(rng: random.Random, weighted: bool = False):
+    """Grade de até 9x9 com paredes aleatórias e, com weighted, custos de 1 a 9."""
+    H, W = rng.randint(1, 9), rng.randint(2, 9)
+    wall_ratio = rng.choice((0.0, 0.15, 0.3, 0.45))
+    grid = [['#' if rng.random() < wall_ratio else '.' for _ in range(W)] for _ in range(H)]
+    if weighted:
+        for row in grid:
+            for c, ch in enumerate(row):
+                if ch == '.' and rng.random() < 0.4:
+                    row[c] = str(rng.randint(2, 9))
+    cells = rng.sample(range(H * W), 2)
+    grid[cells[0] // W][cells[0] % W] = 'S'
+    grid[cells[1] // W][cells[1] % W] = 'G'
+    return grid
+
+
+def random_grids(weighted: bool = False):
+    rng = random.Random(2025 + weighted)
+    for _ in SEEDS:
+        yield FlatGrid.from_grid(random_grid(rng, weighted))
+
+
+def walled_off():
+    """Objetivo cercado por paredes: nenhuma busca pode alcançá-lo."""
+    return FlatGrid.from_grid([list(row) for row in ("S...#", ".##.#", "...#G")])
+
+
+class SearchParityTest(unittest.TestCase):
+
+    def assertValidPath(self, grid: FlatGrid, path):
+        cells = path.cells
+        self.assertEqual(cells[0], grid.start)
+        self.assertEqual(cells[-1], grid.goal)
+        for previous, current in zip(cells, cells[1:]):
+            self.assertIn(current - previous, grid.neighbor_offsets[grid.cells[previous]])
+        expected = len(cells) - 1 if grid.costs is None else sum(grid.costs[c] for c in cells[1:])
+        self.assertEqual(path.cost, expected)
+
+    def test_uniform_searches_match_bfs(self):
+        searches = (
+            dijkstra_search, a_star_search, jump_point_search, bidirectional_bfs, bidirectional_a_star,
+            ida_star_search, d_star_lite_search,
+            lambda grid: sma_star_search(grid, max_nodes=grid.H * grid.W + 1),
+        )
+        for grid in random_grids():
+            reference, _ = bfs(grid)
+            for search in searches:
+                with self.subTest(search=getattr(search, '__name__', 'sma_star_search'), grid=grid.fingerprint()):
+                    path, _ = search(grid)
+                    if reference is None:
+                        self.assertIsNone(path)
+                    else:
+                        self.assertIsNotNone(path)
+                        self.assertValidPath(grid, path)
+                        self.assertEqual(path.cost, reference.cost)
+
+    def test_weighted_searches_match_dijkstra(self):
+        for grid in random_grids(weighted=True):
+            reference, _ = dijkstra_search(grid)
+            steps, _ = bfs(grid)
+            for search in (a_star_search, bidirectional_a_star, d_star_lite_search):
+                with self.subTest(search=search.__name__, grid=grid.fingerprint()):
+                    path, _ = search(grid)
+                    if reference is None:
+                        self.assertIsNone(path)
+                    else:
+                        self.assertValidPath(grid, path)
+                        self.assertEqual(path.cost, reference.cost)
+            # JPS e BFS bidirecional ignoram os custos: o caminho tem o menor número de passos
+            for search in (jump_point_search, bidirectional_bfs):
+                with self.subTest(search=search.__name__, grid=grid.fingerprint()):
+                    path, _ = search(grid)
+                    if steps is None:
+                        self.assertIsNone(path)
+                    else:
+                        self.assertValidPath(grid, path)
+                        self.assertEqual(len(path), len(steps))
+
+    def test_unreachable_goal(self):
+        grid = walled_off()
+        searches = (
+            bfs, dijkstra_search, a_star_search, jump_point_search, bidirectional_bfs, bidirectional_a_star,
+            ida_star_search, sma_star_search, d_star_lite_search,
+        )
+        for search in searches:
+            with self.subTest(search=search.__name__):
+                path, metrics = search(grid)
+                self.assertIsNone(path)
+                self.assertNotIn("budget_exhausted", metrics)
+
+    def test_memory_bounded_searches_give_up(self):
+        # Nenhum caminho cabe em 10 nós: o SMA* falha sem girar em falso
+        grid = FlatGrid.from_grid([list("S" + "." * 30), list("." * 30 + "G")])
+        path, _ = sma_star_search(grid, max_nodes=10)
+        self.assertIsNone(path)
+        # Sala aberta com objetivo isolado: o IDA* esbarra no orçamento de expansões
+        grid = FlatGrid.from_grid([list(row) for row in ("S.......", "........", "......##", "......#G")])
+        path, metrics = ida_star_search(grid, max_expansions=50)
+        self.assertIsNone(path)
+        self.assertTrue(metrics["budget_exhausted"])
+
+    def test_d_star_lite_replanning_matches_dijkstra(self):
+        rng = random.Random(7)
+        for grid in random_grids(weighted=True):
+            planner = DStarLite(grid)
+            planner.plan()
+            free = [cell for cell in range(grid.H * grid.W)
+                    if grid.cells[cell] and cell not in (grid.start, grid.goal)]
+            changes = [(grid.pos_of(cell), False) for cell in rng.sample(free, min(2, len(free)))]
+            planner.update_cells(changes)
+            path, _ = planner.plan()
+            reference, _ = dijkstra_search(grid)
+            with self.subTest(grid=grid.fingerprint()):
+                if reference is None:
+                    self.assertIsNone(path)
+                else:
+                    self.assertValidPath(grid, path)
+                    self.assertEqual(path.cost, reference.cost)
+
+
+class BinaryMazeRoundTripTest(unittest.TestCase):
+
+    def test_lab_round_trip(self):
+        rng = random.Random(11)
+        mazes = [random_grid(rng), None, random_grid(rng, weighted=True), random_grid(rng)]
+        # No Windows o arquivo ainda mapeado não pode ser apagado: a limpeza é tolerante
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directory:
+            path = os.path.join(directory, "labirintos.lab")
+            self.assertEqual(write_binary_mazes(path, mazes), 3)
+
+            records = list(iter_binary_mazes(path, include_skipped=True))
+            self.assertEqual(len(records), len(mazes))
+            self.assertEqual(len(list(iter_binary_mazes(path))), 3)
+            for maze, (offset, loaded) in zip(mazes, records):
+                if maze is None:
+                    self.assertIsNone(loaded)
+                    with self.assertRaises(ValueError):
+                        load_binary_maze(path, offset)
+                    continue
+                original = FlatGrid.from_grid(maze)
+                for grid in (loaded, load_binary_maze(path, offset)):
+                    self.assertEqual((grid.H, grid.W, grid.start, grid.goal),
+                                     (original.H, original.W, original.start, original.goal))
+                    self.assertEqual(bytes(grid.cells), bytes(original.cells))
+                    self.assertEqual(grid.costs is None, original.costs is None)
+                    if original.costs is not None:
+                        self.assertEqual(bytes(grid.costs), bytes(original.costs))
+                    self.assertEqual(grid.fingerprint(), original.fingerprint())
+                    self.assertEqual(dijkstra_search(grid)[0], dijkstra_search(original)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
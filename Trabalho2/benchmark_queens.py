@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark do Min-Conflicts para N rainhas: tempo até a solução conforme N cresce.
+
+Uso:
+    python benchmark_queens.py            # N de 8 até 1.000.000
+    python benchmark_queens.py 100000     # limita o maior N testado
+    python benchmark_queens.py --seed 7   # outra semente base (padrão: 42)
+"""
+
+import argparse
+import random
+import time
+
+from src.eight_queens import conflicts
+from src.hill_climbing import derive_seeds
+from src.min_conflicts import greedy_initial_board, min_conflicts
+
+SIZES = [8, 100, 1_000, 10_000, 100_000, 1_000_000]
+MAX_STEPS = 10_000_000
+BASE_SEED = 42  # Origem das sementes de cada N, como em run_search.py
+
+
+def main(max_n: int = SIZES[-1], base_seed: int = BASE_SEED):
+    # Cada N usa a sua semente derivada: o tabuleiro inicial e o reparo são reproduzíveis
+    seeds = derive_seeds(base_seed, len(SIZES))
+
+    print("=" * 86)
+    print(f"MIN-CONFLICTS: TEMPO ATÉ A SOLUÇÃO (semente base {base_seed})")
+    print("=" * 86)
+    print(f"{'N':<12} {'Início (s)':<12} {'Conflitos Iniciais':<20} {'Reparo (s)':<12} {'Passos':<10} {'Custo Final':<12}")
+    print("-" * 86)
+
+    for n, seed in zip(SIZES, seeds):
+        if n > max_n:
+            break
+
+        start_time = time.perf_counter()
+        board = greedy_initial_board(n, rng=random.Random(seed))
+        init_time = time.perf_counter() - start_time
+        initial_conflicts = conflicts(board)
+
+        start_time = time.perf_counter()
+        result = min_conflicts(n, max_steps=MAX_STEPS, initial=board, seed=seed)
+        repair_time = time.perf_counter() - start_time
+
+        print(f"{n:<12} {init_time:<12.3f} {initial_conflicts:<20} {repair_time:<12.3f} {result.total_steps:<10} {result.final_cost:<12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do Min-Conflicts para N rainhas")
+    parser.add_argument("max_n", nargs="?", type=int, default=SIZES[-1],
+                        help=f"maior N testado (padrão: {SIZES[-1]})")
+    parser.add_argument("--seed", type=int, default=BASE_SEED,
+                        help=f"semente base das execuções (padrão: {BASE_SEED})")
+    args = parser.parse_args()
+    main(args.max_n, args.seed)
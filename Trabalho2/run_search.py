@@ -10,8 +10,14 @@ Ele roda cada algoritmo N vezes para coletar estatísticas,
 reporta as métricas de desempenho (taxa de sucesso, tempo, etc.),
 salva um log detalhado de cada execução em arquivos .txt
 e GERA GRÁFICOS comparativos.
+
+Cada execução usa uma semente própria, derivada de BASE_SEED e registrada
+no relatório. Para repetir exatamente uma execução (ex.: para profiling):
+    python run_search.py --replay lateral <semente>
+    python run_search.py --replay restart <semente>
 """
 
+import argparse
 import time
 import statistics
 from typing import List
@@ -31,6 +37,7 @@ except ImportError:
 
 from src.eight_queens import initial_board, Board 
 from src.hill_climbing import (
+    derive_seeds,
     hill_climbing, 
     hill_climbing_random_restart, 
     HillClimbingResult
@@ -38,6 +45,7 @@ from src.hill_climbing import (
 
 # --- Constantes do Experimento ---
 N_EXECUTIONS = 100
+BASE_SEED = 42  # Origem das sementes de todas as execuções
 
 MAX_ITERATIONS_LATERAL = 1000
 LATERAL_MOVES_LIMITS = 10  # Parâmetro ajustado para um experimento mais interessante
@@ -59,16 +67,16 @@ SEPARATOR = "-" * 60 + "\n"
 def format_board_as_grid(board: Board) -> str:
     """
     Converte um tabuleiro em formato de vetor (ex: [1, 5, ...])
-    em uma grade 8x8 visual com 'x' marcando as rainhas.
+    em uma grade N x N visual com 'x' marcando as rainhas.
     """
-    N = 8
     if not board:
         return "    (Tabuleiro não disponível)"
         
+    n = len(board)
     grid_lines = []
-    for r in range(N): 
+    for r in range(n): 
         line_str = ""
-        for c in range(N):
+        for c in range(n):
             if board[c] == r:
                 line_str += " x "
             else:
@@ -78,6 +86,53 @@ def format_board_as_grid(board: Board) -> str:
 
 
 
+def run_lateral(seed: int) -> HillClimbingResult:
+    """Uma execução do Experimento 1 (movimentos laterais)."""
+    return hill_climbing(
+        board_factory=initial_board,
+        max_iterations=MAX_ITERATIONS_LATERAL,
+        lateral_moves_limits=LATERAL_MOVES_LIMITS,
+        seed=seed
+    )
+
+
+def run_restart(seed: int) -> HillClimbingResult:
+    """Uma execução do Experimento 2 (random-restart)."""
+    return hill_climbing_random_restart(
+        max_restarts=MAX_RESTARTS,
+        max_iterations_per_restart=MAX_ITERATIONS_PER_RESTART,
+        lateral_moves_limits=LATERAL_MOVES_PER_RESTART,
+        seed=seed
+    )
+
+
+EXPERIMENTS = {
+    "lateral": run_lateral,
+    "restart": run_restart,
+}
+
+
+def replay(experiment: str, seed: int) -> HillClimbingResult:
+    """
+    Repete uma única execução a partir da semente registrada no relatório.
+    """
+    start_time_run = time.perf_counter()
+    result = EXPERIMENTS[experiment](seed)
+    run_time_ms = (time.perf_counter() - start_time_run) * 1000
+
+    solucao_str = "Sim" if result.final_cost == 0 else f"Não (Conflitos: {result.final_cost})"
+    print(f"Replay: experimento '{experiment}', semente {seed}")
+    print(f"Estado inicial do tabuleiro:\n{format_board_as_grid(result.initial_board)}\n")
+    print(f"Estado final do tabuleiro:\n{format_board_as_grid(result.final_board)}\n")
+    print(f"Solução encontrada? {solucao_str}")
+    print(f"Tempo de execução: {run_time_ms:.4f} ms")
+    print(f"Passos totais: {result.total_steps}")
+    print(f"Número de movimentos laterais: {result.total_lateral_moves}")
+    print(f"Número de reinícios feitos: {result.restarts_done}")
+    return result
+
+
+
 def print_results(title: str, results_list: List[HillClimbingResult], total_time: float):
     
     total_runs = len(results_list)
@@ -195,13 +250,19 @@ def gerar_graficos(
 
 
 
-def main():
+def main(base_seed: int = BASE_SEED):
     """
     Roda os dois experimentos e compara os resultados.
     """
     
     
     os.makedirs(OUTPUT_DIR_LOGS, exist_ok=True)
+
+    # Uma semente por execução, derivada da semente base de cada experimento
+    seeds_lateral, seeds_restart = (
+        derive_seeds(experiment_seed, N_EXECUTIONS)
+        for experiment_seed in derive_seeds(base_seed, 2)
+    )
     
     
     times_lateral_success = []
@@ -218,17 +279,13 @@ def main():
     
     with open(LOG_FILE_LATERAL, "w", encoding="utf-8") as f_log:
         f_log.write(f"RELATÓRIO DE DESEMPENHO: Hill Climbing com Movimentos Laterais\n")
-        f_log.write(f"Parâmetros: max_iter={MAX_ITERATIONS_LATERAL}, lateral_moves={LATERAL_MOVES_LIMITS}\n")
+        f_log.write(f"Parâmetros: max_iter={MAX_ITERATIONS_LATERAL}, lateral_moves={LATERAL_MOVES_LIMITS}, semente base={base_seed}\n")
         f_log.write(SEPARATOR)
 
         for i in range(N_EXECUTIONS):
             start_time_run = time.perf_counter()
             
-            result = hill_climbing(
-                board_factory=initial_board,
-                max_iterations=MAX_ITERATIONS_LATERAL,
-                lateral_moves_limits=LATERAL_MOVES_LIMITS
-            )
+            result = run_lateral(seeds_lateral[i])
             
             end_time_run = time.perf_counter()
             run_time_ms = (end_time_run - start_time_run) * 1000
@@ -247,6 +304,7 @@ def main():
             solucao_str = "Sim" if result.final_cost == 0 else f"Não (Conflitos: {result.final_cost})"
             log_entry = (
                 f"Execução {i + 1}:\n"
+                f"    Semente: {result.seed} (replay: python run_search.py --replay lateral {result.seed})\n"
                 f"    Estado inicial do tabuleiro:\n{initial_board_str}\n\n"
                 f"    Estado final do tabuleiro:\n{final_board_str}\n"
                 f"    Solução encontrada? {solucao_str}\n"
@@ -274,17 +332,13 @@ def main():
 
     with open(LOG_FILE_RESTART, "w", encoding="utf-8") as f_log:
         f_log.write(f"RELATÓRIO DE DESEMPENHO: Hill Climbing com Random-Restart\n")
-        f_log.write(f"Parâmetros: max_restarts={MAX_RESTARTS}, iter/restart={MAX_ITERATIONS_PER_RESTART}, lateral_moves/restart={LATERAL_MOVES_PER_RESTART}\n")
+        f_log.write(f"Parâmetros: max_restarts={MAX_RESTARTS}, iter/restart={MAX_ITERATIONS_PER_RESTART}, lateral_moves/restart={LATERAL_MOVES_PER_RESTART}, semente base={base_seed}\n")
         f_log.write(SEPARATOR)
 
         for i in range(N_EXECUTIONS):
             start_time_run = time.perf_counter()
             
-            result = hill_climbing_random_restart(
-                max_restarts=MAX_RESTARTS,
-                max_iterations_per_restart=MAX_ITERATIONS_PER_RESTART,
-                lateral_moves_limits=LATERAL_MOVES_PER_RESTART
-            )
+            result = run_restart(seeds_restart[i])
             
             end_time_run = time.perf_counter()
             run_time_ms = (end_time_run - start_time_run) * 1000
@@ -303,6 +357,7 @@ def main():
             solucao_str = "Sim" if result.final_cost == 0 else f"Não (Conflitos: {result.final_cost})"
             log_entry = (
                 f"Execução {i + 1}:\n"
+                f"    Semente: {result.seed} (replay: python run_search.py --replay restart {result.seed})\n"
                 f"    Estado inicial do tabuleiro:\n{initial_board_str}\n\n"
                 f"    Estado final do tabuleiro:\n{final_board_str}\n"
                 f"    Solução encontrada? {solucao_str}\n"
@@ -343,4 +398,19 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Experimentos de Hill Climbing para as 8 Rainhas")
+    parser.add_argument("--seed", type=int, default=BASE_SEED,
+                        help=f"semente base das execuções (padrão: {BASE_SEED})")
+    parser.add_argument("--replay", nargs=2, metavar=("EXPERIMENTO", "SEMENTE"),
+                        help="repete uma única execução: EXPERIMENTO é 'lateral' ou 'restart'")
+    args = parser.parse_args()
+
+    if args.replay:
+        experiment, seed = args.replay
+        if experiment not in EXPERIMENTS:
+            parser.error(f"experimento inválido: {experiment} (use {' ou '.join(EXPERIMENTS)})")
+        if not seed.isdigit():
+            parser.error(f"semente inválida: {seed} (use um inteiro não negativo)")
+        replay(experiment, int(seed))
+    else:
+        main(args.seed)
\ No newline at end of file
@@ -1,8 +1,6 @@
 import random
 
-from typing import List, Tuple, Iterable
-
-random.seed(42)
+from typing import List, Optional, Tuple, Iterable
 
 N: int = 8
 
@@ -11,39 +9,28 @@ Board = list[int]
 Move = Tuple[int, int] 
 
 
-def initial_board() -> Board: 
+def initial_board(n: int = N, rng: Optional[random.Random] = None) -> Board: 
 
-    return [random.randint(0, N - 1) for _ in range(N)]
+    # Sem gerador explícito usa o módulo random global
+    randint = (rng or random).randint
+    return [randint(0, n - 1) for _ in range(n)]
 
 
 
 #Função para calcular o número de conflitos no tabuleiro
 def conflicts(board: Board) -> int: 
 
-    total_conflicts: int = 0
-
-    for collumn1 in range(N): 
-
-        r1: int = board[collumn1]
-
-        for collumn2 in range(collumn1 + 1, N):
-            r2: int = board[collumn2]
-
-            if r1 == r2:
-                total_conflicts += 1
-            elif abs(r1 - r2) == abs(collumn1 - collumn2):
-                total_conflicts += 1
-
-
-    return total_conflicts
+    # Conta os pares por linha/diagonal em O(N) em vez de comparar todos os pares
+    return ConflictCounter(board).total
 
 
 def neighbors(board: Board) -> Iterable[Move]: 
 
-    for collumn in range(N):
+    n = len(board)
+    for collumn in range(n):
 
         current_row: int = board[collumn]
-        for row in range(N):
+        for row in range(n):
             
             # Movimento é apenas válido se a rainha se mover para uma linha diferente
             if row != current_row:
@@ -61,3 +48,81 @@ def apply_move(board: Board, move: Move) -> Board:
     
     return new_board
 
+
+
+class ConflictCounter:
+    """
+    Avaliação incremental de conflitos.
+
+    Mantém quantas rainhas ocupam cada linha e cada diagonal, de modo que o
+    custo de mover uma rainha (a variação no número de pares em conflito) é
+    calculado em O(1), sem copiar o tabuleiro nem refazer a varredura O(N²)
+    de conflicts().
+    """
+
+    def __init__(self, board: Board):
+
+        n = len(board)
+        self.n = n
+        self.board: Board = list(board)
+
+        self.rows = [0] * n
+        self.diagonals = [0] * (2 * n - 1)       # índice: linha - coluna + n - 1
+        self.anti_diagonals = [0] * (2 * n - 1)  # índice: linha + coluna
+
+        for collumn, row in enumerate(self.board):
+            self.rows[row] += 1
+            self.diagonals[row - collumn + n - 1] += 1
+            self.anti_diagonals[row + collumn] += 1
+
+        # Cada linha/diagonal com k rainhas contribui com k*(k-1)/2 pares
+        self.total = sum(
+            k * (k - 1) // 2
+            for counts in (self.rows, self.diagonals, self.anti_diagonals)
+            for k in counts
+        )
+
+    def move_delta(self, move: Move) -> int:
+        """Variação de conflitos se a rainha da coluna for para a linha indicada."""
+
+        collumn, row = move
+        current_row = self.board[collumn]
+        if row == current_row:
+            return 0
+
+        n1 = self.n - 1
+        # Pares desfeitos ao retirar a rainha da posição atual
+        removed = (
+            self.rows[current_row]
+            + self.diagonals[current_row - collumn + n1]
+            + self.anti_diagonals[current_row + collumn]
+            - 3
+        )
+        # Pares criados na nova posição (nenhuma das linhas coincide com as antigas)
+        added = (
+            self.rows[row]
+            + self.diagonals[row - collumn + n1]
+            + self.anti_diagonals[row + collumn]
+        )
+        return added - removed
+
+    def apply(self, move: Move) -> None:
+        """Aplica o movimento no tabuleiro mantido pelo contador."""
+
+        collumn, row = move
+        current_row = self.board[collumn]
+        if row == current_row:
+            return
+
+        self.total += self.move_delta(move)
+
+        n1 = self.n - 1
+        self.rows[current_row] -= 1
+        self.diagonals[current_row - collumn + n1] -= 1
+        self.anti_diagonals[current_row + collumn] -= 1
+
+        self.rows[row] += 1
+        self.diagonals[row - collumn + n1] += 1
+        self.anti_diagonals[row + collumn] += 1
+
+        self.board[collumn] = row
@@ -1,10 +1,14 @@
+import inspect
+import multiprocessing
+import os
 import random
 
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional
 
 
-from src.eight_queens import Board, apply_move, conflicts, neighbors, initial_board
+from src.eight_queens import N, Board, ConflictCounter, neighbors, initial_board
 
 @dataclass
 class HillClimbingResult:
@@ -15,19 +19,64 @@ class HillClimbingResult:
     restarts_done: int = 0
     initial_board: Optional[Board] = None # Armazena o tabuleiro inicial
     total_lateral_moves: int = 0         # Armazena o total de movimentos laterais
+    seed: Optional[int] = None           # Semente que reproduz exatamente esta execução
+
+
+def _build_board(board_factory: Callable[..., Board], rng: random.Random) -> Board:
+    """Chama board_factory(rng=rng), ou board_factory() se ela não aceitar rng."""
+    try:
+        parameters = inspect.signature(board_factory).parameters.values()
+    except (TypeError, ValueError):
+        return board_factory(rng=rng)
+    if any(p.name == 'rng' or p.kind == p.VAR_KEYWORD for p in parameters):
+        return board_factory(rng=rng)
+    return board_factory()
+
+
+def new_seed() -> int:
+    """Sorteia uma semente para uma execução que não recebeu nenhuma."""
+    return random.randrange(2 ** 32)
+
+
+def derive_seeds(seed: int, count: int) -> List[int]:
+    """Sementes independentes derivadas de `seed` (uma por reinício ou execução)."""
+    seed_generator = random.Random(seed)
+    return [seed_generator.randrange(2 ** 32) for _ in range(count)]
 
 
 # Hill Climbing Simples (movimentos laterais)
 def hill_climbing(  
-    board_factory: Callable[[], Board], 
+    board_factory: Optional[Callable[..., Board]] = None, 
     max_iterations: int = 1000,
-    lateral_moves_limits: int = 0
+    lateral_moves_limits: int = 0,
+    n: int = N,
+    seed: Optional[int] = None,
+    should_stop: Optional[Callable[[], bool]] = None
 ) -> HillClimbingResult:
-    
-    initial_board_log = board_factory()
-    current_board = initial_board_log
-    
-    current_cost = conflicts(current_board)
+    """
+    Toda a aleatoriedade (tabuleiro inicial e desempates) vem de um
+    random.Random(seed) próprio, passado a board_factory como rng=. A mesma
+    semente reproduz a mesma execução; sem semente uma é sorteada e fica
+    registrada no resultado. Fábricas sem argumentos (board_factory())
+    continuam aceitas, mas como usam o random global o tabuleiro inicial
+    delas não é reproduzido pela semente. Sem board_factory o tabuleiro inicial é
+    initial_board(n). should_stop, se dado, é consultada uma vez por
+    iteração; quando retorna True a busca para e devolve o estado atual.
+    """
+    if seed is None:
+        seed = new_seed()
+    rng = random.Random(seed)
+    if board_factory is None:
+        board_factory = lambda rng: initial_board(n, rng)
+    choice = rng.choice
+
+    initial_board_log = _build_board(board_factory, rng)
+
+    # O contador trabalha sobre uma cópia: o tabuleiro inicial fica preservado no log
+    counter = ConflictCounter(initial_board_log)
+    current_board = counter.board
+
+    current_cost = counter.total
     total_steps = 0
     lateral_moves_done = 0 # Contador de movimentos laterais *consecutivos*
     
@@ -36,6 +85,9 @@ def hill_climbing(
 
     for _ in range(max_iterations):
         
+        if should_stop is not None and should_stop():
+            break
+
         if current_cost == 0:
             # --- MUDANÇA: Retorna os novos campos de log ---
             return HillClimbingResult(
@@ -43,36 +95,37 @@ def hill_climbing(
                 final_cost=current_cost,
                 total_steps=total_steps,
                 initial_board=initial_board_log,
-                total_lateral_moves=total_lateral_moves_accumulated
+                total_lateral_moves=total_lateral_moves_accumulated,
+                seed=seed
             )
         
         better_moves = []
         lateral_moves = []
         best_better_cost = current_cost
 
-        # Passso 1: Avaliar os vizinhos
+        # Passso 1: Avaliar os vizinhos (custo incremental, sem copiar o tabuleiro)
+        move_delta = counter.move_delta
         for move in neighbors(current_board): 
-            neighbor_board = apply_move(current_board, move)
-            neighbor_cost = conflicts(neighbor_board)
+            neighbor_cost = current_cost + move_delta(move)
 
             if neighbor_cost < current_cost:
                 if neighbor_cost < best_better_cost:
                     best_better_cost = neighbor_cost
-                    better_moves = [neighbor_board]
+                    better_moves = [move]
                 elif neighbor_cost == best_better_cost:
-                    better_moves.append(neighbor_board)
+                    better_moves.append(move)
             elif neighbor_cost == current_cost:
-                lateral_moves.append(neighbor_board)
+                lateral_moves.append(move)
 
-        # Passo 2: Escolher o movimento a fazer
+        # Passo 2: Escolher o movimento a fazer (só o escolhido é aplicado)
         if better_moves:
-            current_board = random.choice(better_moves)
+            counter.apply(choice(better_moves))
             current_cost = best_better_cost
             total_steps += 1
             lateral_moves_done = 0
 
         elif lateral_moves and lateral_moves_done < lateral_moves_limits:
-            current_board = random.choice(lateral_moves)
+            counter.apply(choice(lateral_moves))
             total_steps += 1
             lateral_moves_done += 1
             total_lateral_moves_accumulated += 1
@@ -84,7 +137,8 @@ def hill_climbing(
         final_cost=current_cost,
         total_steps=total_steps,
         initial_board=initial_board_log,
-        total_lateral_moves=total_lateral_moves_accumulated
+        total_lateral_moves=total_lateral_moves_accumulated,
+        seed=seed
     )
 
 
@@ -92,9 +146,16 @@ def hill_climbing(
 def hill_climbing_random_restart(
         max_restarts: int,
         max_iterations_per_restart: int,
-        lateral_moves_limits: int = 0
+        lateral_moves_limits: int = 0,
+        n: int = N,
+        seed: Optional[int] = None
     ) -> HillClimbingResult:
 
+    # O reinício i usa a i-ésima semente derivada de `seed`, como na versão paralela
+    if seed is None:
+        seed = new_seed()
+    restart_seeds = derive_seeds(seed, max_restarts + 1)
+
     best_overall_board =  None
     best_overall_cost = float('inf')
     total_steps_accumulated = 0
@@ -104,9 +165,10 @@ def hill_climbing_random_restart(
 
     for i in range(max_restarts + 1): 
         run_result = hill_climbing(
-            board_factory=initial_board,
             max_iterations=max_iterations_per_restart,
-            lateral_moves_limits=lateral_moves_limits
+            lateral_moves_limits=lateral_moves_limits,
+            n=n,
+            seed=restart_seeds[i]
         )
         
         if i == 0:
@@ -125,7 +187,8 @@ def hill_climbing_random_restart(
                 final_cost=best_overall_cost,
                 total_steps=total_steps_accumulated,
                 restarts_done=i,
-                initial_board=first_initial_board
+                initial_board=first_initial_board,
+                seed=seed
             )
 
     return HillClimbingResult(
@@ -133,5 +196,111 @@ def hill_climbing_random_restart(
         final_cost=best_overall_cost,
         total_steps=total_steps_accumulated,
         restarts_done=max_restarts,
-        initial_board=first_initial_board
-    )
\ No newline at end of file
+        initial_board=first_initial_board,
+        seed=seed
+    )
+
+# Sinal compartilhado pelos processos do pool: interrompe os reinícios em andamento
+_stop_event = None
+
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _restart_worker(restart_seed: int, max_iterations: int, lateral_moves_limits: int, n: int) -> HillClimbingResult:
+    # Cada reinício roda com a própria semente, independente do processo que o executa
+    return hill_climbing(
+        max_iterations=max_iterations,
+        lateral_moves_limits=lateral_moves_limits,
+        n=n,
+        seed=restart_seed,
+        should_stop=_stop_event.is_set
+    )
+
+
+# Hill Climbing com Reinícios Aleatórios em paralelo
+def hill_climbing_random_restart_parallel(
+        max_restarts: int,
+        max_iterations_per_restart: int,
+        lateral_moves_limits: int = 0,
+        n: int = N,
+        workers: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> HillClimbingResult:
+    """
+    Distribui os reinícios entre um pool de processos.
+
+    O reinício i usa a i-ésima semente derivada de `seed`, então o resultado
+    não depende de quantos processos existem nem da ordem em que terminam:
+    vale o reinício de menor índice que encontrar custo 0, e total_steps e
+    restarts_done são acumulados até ele, exatamente como na versão
+    sequencial. Assim que um reinício encontra a solução e os de índice
+    menor terminaram, os de índice maior são descartados: os que ainda não
+    começaram são cancelados e os que estão rodando param na iteração
+    seguinte. A função só retorna depois que todos os processos pararam.
+    Com a mesma semente o resultado é idêntico ao de
+    hill_climbing_random_restart.
+    """
+    if seed is None:
+        seed = new_seed()
+    restart_seeds = derive_seeds(seed, max_restarts + 1)
+
+    workers = workers or os.cpu_count() or 1
+    results: Dict[int, HillClimbingResult] = {}
+    winner: Optional[int] = None
+
+    stop_event = multiprocessing.Event()
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stop_event,))
+    try:
+        pending: Dict[Future, int] = {}
+        next_restart = 0
+
+        while True:
+            # Mantém no máximo 2 reinícios por processo em andamento
+            while next_restart <= max_restarts and len(pending) < 2 * workers and (winner is None or next_restart < winner):
+                future = executor.submit(
+                    _restart_worker, restart_seeds[next_restart],
+                    max_iterations_per_restart, lateral_moves_limits, n
+                )
+                pending[future] = next_restart
+                next_restart += 1
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                results[i] = future.result()
+                if results[i].final_cost == 0 and (winner is None or i < winner):
+                    winner = i
+
+            if winner is not None:
+                # Reinícios posteriores ao vencedor não alteram o resultado
+                for future, i in list(pending.items()):
+                    if i > winner and future.cancel():
+                        del pending[future]
+                if all(i > winner for i in pending.values()):
+                    break
+    finally:
+        # Nenhum resultado pendente interessa mais: para os reinícios em andamento
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    last = winner if winner is not None else max_restarts
+
+    best_index = 0
+    for i in range(1, last + 1):
+        if results[i].final_cost < results[best_index].final_cost:
+            best_index = i
+
+    return HillClimbingResult(
+        final_board=results[best_index].final_board,
+        final_cost=results[best_index].final_cost,
+        total_steps=sum(results[i].total_steps for i in range(last + 1)),
+        restarts_done=last,
+        initial_board=results[0].initial_board,
+        seed=seed
+    )
@@ -0,0 +1,204 @@
+import random
+
+from array import array
+from typing import List, Optional
+
+from src.eight_queens import N, Board, ConflictCounter
+from src.hill_climbing import HillClimbingResult, new_seed
+
+
+def greedy_initial_board(n: int = N, samples: int = 8, rng: Optional[random.Random] = None) -> Board:
+    """
+    Tabuleiro inicial guloso, sem rainhas na mesma linha.
+
+    Cada coluna sorteia até `samples` linhas ainda livres e fica com a
+    primeira cujas diagonais também estejam livres; as colunas em que isso
+    falha recebem, ao final, as linhas que sobraram. Para N grande quase
+    todas as rainhas ficam sem conflito e a busca local só precisa reparar
+    poucas colunas.
+    """
+    rng = rng or random
+    n1 = n - 1
+    diagonals = [0] * (2 * n - 1)
+    anti_diagonals = [0] * (2 * n - 1)
+    free_rows = list(range(n))
+    rng.shuffle(free_rows)
+    board: Board = [0] * n
+    deferred: List[int] = []
+    randrange = rng.randrange
+
+    for collumn in range(n):
+        for _ in range(min(samples, len(free_rows))):
+            i = randrange(len(free_rows))
+            row = free_rows[i]
+            if diagonals[row - collumn + n1] == 0 and anti_diagonals[row + collumn] == 0:
+                free_rows[i] = free_rows[-1]
+                free_rows.pop()
+                board[collumn] = row
+                diagonals[row - collumn + n1] += 1
+                anti_diagonals[row + collumn] += 1
+                break
+        else:
+            deferred.append(collumn)
+
+    for collumn in deferred:
+        board[collumn] = free_rows.pop()
+
+    return board
+
+
+# Min-Conflicts: escolhe uma coluna em conflito e move a rainha para a linha de menor conflito
+def min_conflicts(
+    n: int = N,
+    max_steps: int = 100_000,
+    candidate_rows: Optional[int] = 64,
+    initial: Optional[Board] = None,
+    seed: Optional[int] = None
+) -> HillClimbingResult:
+    """
+    Busca local Min-Conflicts para N rainhas, com memória O(N).
+
+    Os conflitos são mantidos pelos contadores de linha/diagonal do
+    ConflictCounter. A cada passo sorteia-se uma coluna em conflito e a
+    rainha vai para a linha de menor conflito, diferente da atual (empates
+    sorteados). São avaliadas candidate_rows linhas sorteadas e até
+    candidate_rows linhas vazias, o que torna cada passo O(1) mesmo para N
+    grande; com candidate_rows=None todas as N linhas são avaliadas.
+
+    Os sorteios usam um random.Random(seed) próprio; a semente (sorteada se
+    não for dada) fica registrada no resultado.
+    """
+    if seed is None:
+        seed = new_seed()
+    rng = random.Random(seed)
+
+    initial_board_log = initial if initial is not None else greedy_initial_board(n, rng=rng)
+    counter = ConflictCounter(initial_board_log)
+    board = counter.board
+    n = counter.n
+    n1 = n - 1
+
+    rows = counter.rows
+    diagonals = counter.diagonals
+    anti_diagonals = counter.anti_diagonals
+    randrange = rng.randrange
+
+    def queen_conflicts(collumn: int) -> int:
+        row = board[collumn]
+        return rows[row] + diagonals[row - collumn + n1] + anti_diagonals[row + collumn] - 3
+
+    # Linhas vazias (lista preguiçosa: entradas que voltaram a ser ocupadas são
+    # descartadas ao serem sorteadas)
+    empty_rows: List[int] = [row for row in range(n) if rows[row] == 0]
+
+    # Diagonal e antidiagonal de cada coluna, para achar com list.index (em C)
+    # as rainhas que passam a dividir uma linha com a rainha movida
+    diagonal_of = [row - collumn for collumn, row in enumerate(board)]
+    anti_diagonal_of = [row + collumn for collumn, row in enumerate(board)]
+
+    # Última rainha a entrar em cada linha/diagonal: quando a linha passa a ter
+    # duas rainhas, a outra costuma ser ela, dispensando a busca com list.index
+    row_owner = array('i', bytes(4 * n))
+    diagonal_owner = array('i', bytes(4 * (2 * n - 1)))
+    anti_diagonal_owner = array('i', bytes(4 * (2 * n - 1)))
+    for collumn, row in enumerate(board):
+        row_owner[row] = collumn
+        diagonal_owner[row - collumn + n1] = collumn
+        anti_diagonal_owner[row + collumn] = collumn
+
+    # Invariante: toda coluna em conflito está na lista (entradas já
+    # resolvidas são descartadas quando sorteadas)
+    conflicted: List[int] = [
+        c for c, row in enumerate(board)
+        if rows[row] + diagonals[row - c + n1] + anti_diagonals[row + c] > 3
+    ]
+    total_steps = 0
+
+    while counter.total > 0 and total_steps < max_steps:
+
+        if not conflicted:
+            # Não deveria ocorrer pelo invariante; por segurança refaz a varredura
+            conflicted = [c for c in range(n) if queen_conflicts(c) > 0]
+
+        # Retira uma coluna sorteada da lista (troca com a última e remove)
+        index = randrange(len(conflicted))
+        collumn = conflicted[index]
+        conflicted[index] = conflicted[-1]
+        conflicted.pop()
+
+        if queen_conflicts(collumn) == 0:
+            continue
+
+        current_row = board[collumn]
+        if candidate_rows is None:
+            rows_to_try = range(n)
+        else:
+            rows_to_try = [randrange(n) for _ in range(candidate_rows)]
+            for _ in range(min(candidate_rows, len(empty_rows))):
+                i = randrange(len(empty_rows))
+                row = empty_rows[i]
+                if rows[row] == 0:
+                    rows_to_try.append(row)
+                else:
+                    empty_rows[i] = empty_rows[-1]
+                    empty_rows.pop()
+                    if not empty_rows:
+                        break
+
+        # A rainha sempre sai da linha atual: permanecer nela prenderia a busca em platôs
+        best_rows: List[int] = []
+        best_cost = 3 * n
+        for row in rows_to_try:
+            if row == current_row:
+                continue
+            cost = rows[row] + diagonals[row - collumn + n1] + anti_diagonals[row + collumn]
+            if cost < best_cost:
+                best_cost = cost
+                best_rows = [row]
+            elif cost == best_cost:
+                best_rows.append(row)
+
+        if best_rows:
+            new_row = rng.choice(best_rows)
+            counter.apply((collumn, new_row))
+            diagonal_of[collumn] = new_row - collumn
+            anti_diagonal_of[collumn] = new_row + collumn
+            if rows[current_row] == 0:
+                empty_rows.append(current_row)
+
+            lines = (
+                (board, row_owner, new_row, new_row, rows),
+                (diagonal_of, diagonal_owner, new_row - collumn, new_row - collumn + n1, diagonals),
+                (anti_diagonal_of, anti_diagonal_owner, new_row + collumn, new_row + collumn, anti_diagonals),
+            )
+
+            if best_cost > 0:
+                # A rainha movida e as que dividem linha/diagonal com ela estão em conflito
+                conflicted.append(collumn)
+                for values, owners, value, line, counts in lines:
+                    count = counts[line]
+                    if count == 1:
+                        continue
+                    owner = owners[line]
+                    if count == 2 and owner != collumn and values[owner] == value:
+                        conflicted.append(owner)
+                        continue
+                    start = 0
+                    for _ in range(count - 1):
+                        start = values.index(value, start)
+                        if start == collumn:
+                            start = values.index(value, start + 1)
+                        conflicted.append(start)
+                        start += 1
+
+            for _, owners, _, line, _ in lines:
+                owners[line] = collumn
+        total_steps += 1
+
+    return HillClimbingResult(
+        final_board=board,
+        final_cost=counter.total,
+        total_steps=total_steps,
+        initial_board=initial_board_log,
+        seed=seed
+    )